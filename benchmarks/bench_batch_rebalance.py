@@ -0,0 +1,86 @@
+"""Time sizing one wide rebalance signal by signal versus in one batch.
+
+Builds a book of held names, then sizes a rebalance of ``target_weight``
+signals under exposure, gross, single-name and sector caps with
+``Portfolio.on_signal`` per signal and with ``Portfolio.on_rebalance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from microalpha.events import FillEvent, SignalEvent
+from microalpha.portfolio import Portfolio
+
+
+class _Prices:
+    def __init__(self, prices: Dict[str, float]):
+        self.prices = prices
+
+    def get_latest_price(self, symbol: str, timestamp: int) -> float | None:
+        return self.prices.get(symbol)
+
+
+def _portfolio(prices: Dict[str, float], sectors: Dict[str, str]) -> Portfolio:
+    portfolio = Portfolio(
+        _Prices(prices),
+        initial_cash=10_000_000.0,
+        max_exposure=0.3,
+        max_gross_leverage=1.5,
+        max_single_name_weight=0.02,
+        sectors=sectors,
+        max_positions_per_sector=40,
+    )
+    for idx, symbol in enumerate(list(prices)[::2]):
+        qty = 100 if idx % 2 else -100
+        portfolio.on_fill(FillEvent(1, symbol, qty, prices[symbol], 0.0, 0.0))
+    portfolio.refresh_equity_after_fills(1)
+    return portfolio
+
+
+def run_benchmark(num_symbols: int = 500, repeats: int = 20) -> Dict[str, Any]:
+    rng = np.random.default_rng(2026)
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    prices = dict(zip(symbols, rng.uniform(10.0, 200.0, num_symbols).tolist()))
+    sectors = {sym: f"SEC{idx % 10}" for idx, sym in enumerate(symbols)}
+    weights = rng.normal(0.0, 0.01, num_symbols).tolist()
+    signals: List[SignalEvent] = [
+        SignalEvent(2, sym, "LONG" if w > 0 else "SHORT", {"target_weight": w})
+        for sym, w in zip(symbols, weights)
+    ]
+    timings: Dict[str, float] = {}
+    orders: Dict[str, int] = {}
+    for mode in ("sequential", "batch"):
+        best = float("inf")
+        for _ in range(repeats):
+            portfolio = _portfolio(prices, sectors)
+            t0 = time.perf_counter()
+            if mode == "batch":
+                batch = portfolio.on_rebalance(signals)
+            else:
+                batch = [o for s in signals for o in portfolio.on_signal(s)]
+            best = min(best, time.perf_counter() - t0)
+        timings[mode] = best
+        orders[mode] = len(batch)
+    results = {
+        "symbols": num_symbols,
+        "sequential_ms": round(timings["sequential"] * 1e3, 2),
+        "batch_ms": round(timings["batch"] * 1e3, 2),
+        "speedup": round(timings["sequential"] / timings["batch"], 2),
+        "sequential_orders": orders["sequential"],
+        "batch_orders": orders["batch"],
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.repeats)
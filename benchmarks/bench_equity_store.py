@@ -0,0 +1,71 @@
+"""Compare equity-curve stores on a long intraday-sized curve.
+
+Feeds the same equity points, each timestamp recorded twice the way
+``Portfolio`` overwrites the last point after fills, into the ``"records"``,
+``"columnar"`` and ``"online"`` stores, then times ``compute_metrics`` on the
+result and measures the memory each store holds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Dict
+
+import numpy as np
+
+from microalpha.metrics import compute_metrics
+from microalpha.portfolio import Portfolio
+
+
+def _feed(store: str, equity: list, trace_memory: bool = False) -> tuple:
+    portfolio = Portfolio(None, equity_store=store)
+    record = portfolio._record_equity
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    for ts, value in enumerate(equity):
+        # Two marks per timestamp; the second overwrites the first.
+        for _ in range(2):
+            portfolio.cash = value
+            record(ts, apply_borrow_costs=False, overwrite_last=True)
+    seconds = time.perf_counter() - t0
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak, portfolio.equity_curve
+
+
+def run_benchmark(points: int = 1_000_000, repeats: int = 3) -> Dict[str, Any]:
+    rng = np.random.default_rng(2026)
+    equity = (1e6 * np.exp(rng.normal(0, 1e-4, size=points).cumsum())).tolist()
+    results: Dict[str, Any] = {"points": points}
+    sharpe = {}
+    for store in ("records", "columnar", "online"):
+        record_s = metrics_s = float("inf")
+        for _ in range(repeats):
+            seconds, _, curve = _feed(store, equity)
+            record_s = min(record_s, seconds)
+            t0 = time.perf_counter()
+            metrics = compute_metrics(curve, 0.0)
+            metrics_s = min(metrics_s, time.perf_counter() - t0)
+        sharpe[store] = metrics["sharpe_ratio"]
+        del curve, metrics
+        _, peak, _ = _feed(store, equity, trace_memory=True)
+        results[f"{store}_record_seconds"] = round(record_s, 3)
+        results[f"{store}_metrics_seconds"] = round(metrics_s, 3)
+        results[f"{store}_peak_mb"] = round(peak / 2**20, 1)
+    assert sharpe["columnar"] == sharpe["records"]
+    assert np.isclose(sharpe["online"], sharpe["records"], rtol=1e-9)
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.points, args.repeats)
@@ -0,0 +1,114 @@
+"""Benchmark event construction and attribute access.
+
+Compares the slotted event classes in ``microalpha.events`` with the plain
+frozen dataclasses they replaced (reproduced below as the baseline).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from microalpha.events import FillEvent, MarketEvent, OrderEvent
+
+
+@dataclass(frozen=True)
+class DictMarketEvent:
+    timestamp: int
+    symbol: str
+    price: float
+    volume: float
+
+
+@dataclass(frozen=True)
+class DictOrderEvent:
+    timestamp: int
+    symbol: str
+    qty: int
+    side: str
+    order_type: str = "MARKET"
+    price: float | None = None
+    order_id: str | None = None
+
+
+@dataclass(frozen=True)
+class DictFillEvent:
+    timestamp: int
+    symbol: str
+    qty: int
+    price: float
+    commission: float
+    slippage: float
+    latency_ack: float = 0.0
+    latency_fill: float = 0.0
+
+
+def _best_of(fn: Callable[[int], Any], n: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(n)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _construct(market_cls: type, order_cls: type, fill_cls: type) -> Callable:
+    def run(n: int) -> None:
+        for i in range(n):
+            market_cls(i, "SYN", 100.0, 1.0)
+            order_cls(i, "SYN", 10, "BUY")
+            fill_cls(i, "SYN", 10, 100.0, 0.1, 0.01)
+
+    return run
+
+
+def _access(event: Any) -> Callable:
+    def run(n: int) -> None:
+        for _ in range(n):
+            event.timestamp
+            event.symbol
+            event.price
+            event.volume
+
+    return run
+
+
+def run_benchmark(num_events: int = 1_000_000, repeats: int = 3) -> Dict[str, Any]:
+    before_new = _best_of(
+        _construct(DictMarketEvent, DictOrderEvent, DictFillEvent), num_events, repeats
+    )
+    after_new = _best_of(
+        _construct(MarketEvent, OrderEvent, FillEvent), num_events, repeats
+    )
+    old_event = DictMarketEvent(1, "SYN", 100.0, 1.0)
+    new_event = MarketEvent(1, "SYN", 100.0, 1.0)
+    before_get = _best_of(_access(old_event), num_events, repeats)
+    after_get = _best_of(_access(new_event), num_events, repeats)
+
+    def _ns(seconds: float, per_iteration: int = 1) -> float:
+        return round(seconds / (num_events * per_iteration) * 1e9, 1)
+
+    results: Dict[str, Any] = {
+        "events": num_events,
+        "construct_ns_before": _ns(before_new, 3),
+        "construct_ns_after": _ns(after_new, 3),
+        "construct_speedup": round(before_new / after_new, 2) if after_new else 0.0,
+        "access_ns_before": _ns(before_get, 4),
+        "access_ns_after": _ns(after_get, 4),
+        "market_event_bytes_before": sys.getsizeof(old_event)
+        + sys.getsizeof(old_event.__dict__),
+        "market_event_bytes_after": sys.getsizeof(new_event),
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.events, args.repeats)
@@ -0,0 +1,120 @@
+"""Benchmark fan-out grid runs against one engine run per combination.
+
+Each grid combination is a ``CrossSectionalMomentum`` strategy with its own
+portfolio and broker on a synthetic universe. The script times K separate
+``Engine`` runs against one ``FanOutEngine`` pass and checks the equity
+curves are identical.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine, FanOutEngine
+from microalpha.execution import Executor
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+
+
+def _write_panel(csv_dir: Path, symbols: List[str], num_days: int) -> None:
+    rng = np.random.default_rng(2026)
+    dates = pd.bdate_range("2015-01-01", periods=num_days)
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        mask = rng.random(num_days) > 0.05  # drop ~5% to create gaps
+        idx = dates[mask]
+        prices = 50.0 * np.exp(rng.normal(0, 0.015, size=idx.size).cumsum())
+        volume = rng.integers(50_000, 500_000, size=idx.size)
+        pd.DataFrame({"close": prices, "volume": volume}, index=idx).to_csv(
+            csv_dir / f"{symbol}.csv"
+        )
+
+
+def _grid(combos: int) -> List[Dict[str, Any]]:
+    lookbacks = [3, 6, 9, 12]
+    fracs = [0.2, 0.3, 0.4]
+    grid = [
+        {"lookback_months": lb, "top_frac": frac} for lb in lookbacks for frac in fracs
+    ]
+    return grid[:combos]
+
+
+def _engines(
+    handler, symbols: List[str], grid: List[Dict[str, Any]], bar_mode: bool
+) -> List[Engine]:
+    engines = []
+    for seed, params in enumerate(grid):
+        strategy = CrossSectionalMomentum(symbols, skip_months=1, **params)
+        portfolio = Portfolio(handler, initial_cash=10_000_000.0)
+        executor = Executor(handler, commission=0.001, price_impact=0.0001)
+        engines.append(
+            Engine(
+                handler,
+                strategy,
+                portfolio,
+                SimulatedBroker(executor),
+                rng=np.random.default_rng(seed),
+                bar_mode=bar_mode,
+            )
+        )
+    return engines
+
+
+def run_benchmark(
+    num_symbols: int = 20,
+    num_days: int = 750,
+    combos: int = 8,
+    bar_mode: bool = False,
+) -> Dict[str, Any]:
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    grid = _grid(combos)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = Path(tmp)
+        _write_panel(csv_dir, symbols, num_days)
+        handler = MultiCsvDataHandler(csv_dir, symbols)
+
+        separate = _engines(handler, symbols, grid, bar_mode)
+        t0 = time.perf_counter()
+        for engine in separate:
+            engine.run()
+        separate_seconds = time.perf_counter() - t0
+
+        fanned = _engines(handler, symbols, grid, bar_mode)
+        t0 = time.perf_counter()
+        FanOutEngine(fanned).run()
+        fanout_seconds = time.perf_counter() - t0
+
+    results: Dict[str, Any] = {
+        "symbols": num_symbols,
+        "combinations": len(grid),
+        "events": fanned[0].timing.events,
+        "bar_mode": bar_mode,
+        "separate_seconds": round(separate_seconds, 4),
+        "fanout_seconds": round(fanout_seconds, 4),
+        "speedup": round(separate_seconds / fanout_seconds, 2),
+        "equity_match": all(
+            a.portfolio.equity_curve == b.portfolio.equity_curve
+            for a, b in zip(separate, fanned)
+        ),
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--combos", type=int, default=8)
+    parser.add_argument("--bar-mode", action="store_true")
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.combos, args.bar_mode)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import argparse
 import time
 from pathlib import Path
-from typing import Iterable, Iterator, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -68,11 +69,18 @@ def _collect(events: Iterable[MarketEvent]) -> List[MarketEvent]:
     return list(events)
 
 
+def _timed(events: Iterable[MarketEvent]) -> Tuple[List[MarketEvent], float]:
+    t0 = time.perf_counter()
+    collected = _collect(events)
+    return collected, time.perf_counter() - t0
+
+
 def run_benchmark(
-    num_symbols: int = 50,
-    num_days: int = 50_000,
+    num_symbols: int = 500,
+    num_days: int = 2_000,
     mode: str = "ffill",
-) -> Tuple[int, float, float]:
+    include_baseline: bool = False,
+) -> Dict[str, Any]:
     tmp_dir = Path("benchmarks/_tmp_multi")
     if tmp_dir.exists():
         for item in tmp_dir.iterdir():
@@ -81,37 +89,54 @@ def run_benchmark(
     base_dates = pd.date_range("2015-01-01", periods=num_days, freq="D")
     _write_panel(tmp_dir, symbols, base_dates)
 
-    handler_fast = MultiCsvDataHandler(tmp_dir, symbols, mode=mode)
-    handler_fast.set_date_range(base_dates[0], base_dates[-1])
-    handler_slow = MultiCsvDataHandler(tmp_dir, symbols, mode=mode)
-    handler_slow.set_date_range(base_dates[0], base_dates[-1])
-
-    t0 = time.perf_counter()
-    fast_events = _collect(handler_fast.stream())
-    dt_fast = time.perf_counter() - t0
-
-    t1 = time.perf_counter()
-    slow_events = _collect(_baseline_stream(handler_slow))
-    dt_slow = time.perf_counter() - t1
+    handler_merge = MultiCsvDataHandler(tmp_dir, symbols, mode=mode)
+    handler_merge.set_date_range(base_dates[0], base_dates[-1])
+    handler_dense = MultiCsvDataHandler(
+        tmp_dir, symbols, mode=mode, stream_mode="dense"
+    )
+    handler_dense.set_date_range(base_dates[0], base_dates[-1])
 
-    assert fast_events == slow_events
+    merge_events, dt_merge = _timed(handler_merge.stream())
+    # First dense pass includes building the panel; the second reuses it.
+    dense_events, dt_dense_cold = _timed(handler_dense.stream())
+    _, dt_dense_warm = _timed(handler_dense.stream())
+    assert dense_events == merge_events
 
-    evps_fast = int(len(fast_events) / dt_fast) if dt_fast else 0
-    evps_slow = int(len(slow_events) / dt_slow) if dt_slow else 0
+    def _evps(count: int, seconds: float) -> int:
+        return int(count / seconds) if seconds else 0
 
-    results = {
+    results: Dict[str, Any] = {
         "mode": mode,
         "symbols": num_symbols,
         "rows": num_days,
-        "events": len(fast_events),
-        "fast_sec": round(dt_fast, 3),
-        "fast_evps": evps_fast,
-        "slow_sec": round(dt_slow, 3),
-        "slow_evps": evps_slow,
+        "events": len(merge_events),
+        "merge_sec": round(dt_merge, 3),
+        "merge_evps": _evps(len(merge_events), dt_merge),
+        "dense_cold_sec": round(dt_dense_cold, 3),
+        "dense_warm_sec": round(dt_dense_warm, 3),
+        "dense_warm_evps": _evps(len(dense_events), dt_dense_warm),
+        "dense_speedup": round(dt_merge / dt_dense_cold, 2) if dt_dense_cold else 0.0,
     }
+    if include_baseline:
+        handler_slow = MultiCsvDataHandler(tmp_dir, symbols, mode=mode)
+        handler_slow.set_date_range(base_dates[0], base_dates[-1])
+        slow_events, dt_slow = _timed(_baseline_stream(handler_slow))
+        assert slow_events == merge_events
+        results["slow_sec"] = round(dt_slow, 3)
+        results["slow_evps"] = _evps(len(slow_events), dt_slow)
     print(results)
-    return len(fast_events), dt_fast, dt_slow
+    return results
 
 
 if __name__ == "__main__":
-    run_benchmark()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2_000)
+    parser.add_argument("--mode", choices=["ffill", "exact"], default="ffill")
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Also time the pandas reference stream (slow at 500+ symbols).",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.mode, args.baseline)
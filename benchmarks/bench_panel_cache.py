@@ -0,0 +1,93 @@
+"""Benchmark MultiCsvDataHandler load time: parallel parsing and the panel cache."""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from microalpha.data import MultiCsvDataHandler
+
+
+def _write_panel(csv_dir: Path, symbols: List[str], num_days: int) -> None:
+    rng = np.random.default_rng(2025)
+    dates = pd.date_range("2005-01-03", periods=num_days, freq="B", name="timestamp")
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        prices = 100.0 + rng.normal(0, 0.5, size=num_days).cumsum()
+        volume = rng.integers(100_000, 5_000_000, size=num_days).astype(float)
+        df = pd.DataFrame({"close": prices, "volume": volume}, index=dates)
+        df.to_csv(csv_dir / f"{symbol}.csv")
+
+
+def _timed_load(
+    csv_dir: Path,
+    symbols: List[str],
+    cache_dir: str,
+    load_workers: int = 1,
+    csv_engine: str = "c",
+) -> float:
+    t0 = time.perf_counter()
+    MultiCsvDataHandler(
+        csv_dir,
+        symbols,
+        cache_dir=cache_dir,
+        load_workers=load_workers,
+        csv_engine=csv_engine,
+    )
+    return time.perf_counter() - t0
+
+
+def run_benchmark(
+    num_symbols: int = 500, num_days: int = 5_000, workers: int = 8
+) -> Dict[str, float]:
+    symbols = [f"S{idx:04d}" for idx in range(num_symbols)]
+    with tempfile.TemporaryDirectory(prefix="microalpha-cache-bench-") as tmp:
+        csv_dir = Path(tmp) / "panel"
+        cache_dir = Path(tmp) / "cache"
+        _write_panel(csv_dir, symbols, num_days)
+
+        csv_sec = _timed_load(csv_dir, symbols, cache_dir="")
+        parallel_sec = _timed_load(csv_dir, symbols, cache_dir="", load_workers=workers)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            arrow_sec = float("nan")
+        else:
+            arrow_sec = _timed_load(
+                csv_dir,
+                symbols,
+                cache_dir="",
+                load_workers=workers,
+                csv_engine="pyarrow",
+            )
+        cold_sec = _timed_load(csv_dir, symbols, cache_dir=str(cache_dir))
+        warm_sec = _timed_load(csv_dir, symbols, cache_dir=str(cache_dir))
+
+    results = {
+        "symbols": num_symbols,
+        "rows": num_days,
+        "csv_sec": round(csv_sec, 3),
+        "workers": workers,
+        "csv_parallel_sec": round(parallel_sec, 3),
+        "pyarrow_parallel_sec": round(arrow_sec, 3),
+        "cold_cache_sec": round(cold_sec, 3),
+        "warm_cache_sec": round(warm_sec, 3),
+        "warm_speedup": round(csv_sec / warm_sec, 2) if warm_sec else 0.0,
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.workers)
@@ -0,0 +1,121 @@
+"""Compare portfolio books and mark reuse on a wide universe.
+
+Runs the same ``CrossSectionalMomentum`` backtest with ``Portfolio(book=...)``
+set to ``"dict"`` and ``"array"``, with and without ``incremental_marks``, in
+event and bar mode, and times marking a fully invested book on its own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.execution import Executor
+from microalpha.portfolio import Portfolio, PortfolioPosition
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+
+
+def _write_panel(csv_dir: Path, symbols: List[str], num_days: int) -> None:
+    rng = np.random.default_rng(2026)
+    dates = pd.bdate_range("2015-01-01", periods=num_days)
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        prices = 50.0 * np.exp(rng.normal(0, 0.015, size=num_days).cumsum())
+        volume = rng.integers(50_000, 500_000, size=num_days)
+        pd.DataFrame({"close": prices, "volume": volume}, index=dates).to_csv(
+            csv_dir / f"{symbol}.csv"
+        )
+
+
+VARIANTS = {
+    "dict_full": ("dict", False),
+    "array_full": ("array", False),
+    "dict": ("dict", True),
+    "array": ("array", True),
+}
+
+
+def _run(handler, symbols: List[str], variant: str, bar_mode: bool) -> tuple:
+    book, incremental = VARIANTS[variant]
+    portfolio = Portfolio(
+        handler,
+        initial_cash=10_000_000.0,
+        borrow_cfg={"annual_fee_bps": 50.0},
+        book=book,
+        incremental_marks=incremental,
+    )
+    engine = Engine(
+        handler,
+        CrossSectionalMomentum(
+            symbols, lookback_months=3, skip_months=1, top_frac=0.4, bottom_frac=0.4
+        ),
+        portfolio,
+        SimulatedBroker(Executor(handler, commission=0.001)),
+        rng=np.random.default_rng(0),
+        bar_mode=bar_mode,
+    )
+    t0 = time.perf_counter()
+    engine.run()
+    return time.perf_counter() - t0, portfolio
+
+
+def _mark_ns(handler, symbols: List[str], book: str, repeats: int) -> float:
+    portfolio = Portfolio(handler, initial_cash=10_000_000.0, book=book)
+    for idx, symbol in enumerate(symbols):
+        portfolio.positions[symbol] = PortfolioPosition(qty=100 if idx % 2 else -100)
+    timestamps = handler.union_timestamps().tolist()
+    t0 = time.perf_counter_ns()
+    for _ in range(repeats):
+        for ts in timestamps:
+            portfolio.refresh_equity_after_fills(ts)
+    return (time.perf_counter_ns() - t0) / (repeats * len(timestamps))
+
+
+def run_benchmark(
+    num_symbols: int = 150, num_days: int = 500, repeats: int = 3
+) -> Dict[str, Any]:
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    results: Dict[str, Any] = {"symbols": num_symbols, "days": num_days}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_panel(root / "prices", symbols, num_days)
+        handler = MultiCsvDataHandler(root / "prices", symbols)
+        for bar_mode in (False, True):
+            mode = "bar" if bar_mode else "event"
+            timings: Dict[str, float] = {}
+            curves = {}
+            for _ in range(repeats):
+                for variant in VARIANTS:
+                    seconds, portfolio = _run(handler, symbols, variant, bar_mode)
+                    timings[variant] = min(timings.get(variant, seconds), seconds)
+                    curves[variant] = portfolio.equity_curve
+            assert all(curve == curves["dict_full"] for curve in curves.values())
+            for variant, seconds in timings.items():
+                results[f"{mode}_{variant}_seconds"] = round(seconds, 4)
+            results[f"{mode}_speedup"] = round(
+                timings["dict_full"] / timings["array"], 2
+            )
+        for book in ("dict", "array"):
+            results[f"mark_{book}_us"] = round(
+                _mark_ns(handler, symbols, book, repeats) / 1e3, 1
+            )
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=150)
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.repeats)
@@ -0,0 +1,150 @@
+"""Measure the overhead of event tracing on an event-mode backtest.
+
+Runs the same ``CrossSectionalMomentum`` backtest on a synthetic universe
+without a trace, with a full binary trace, with a sampled binary trace and
+with a JSON Lines trace written through ``JsonlWriter`` for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.execution import Executor
+from microalpha.logging import JsonlWriter
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.trace import TraceRecorder, read_trace
+
+
+class _JsonlTrace:
+    """Naive tracer writing one JSON line per event."""
+
+    def __init__(self, path: Path):
+        self.writer = JsonlWriter(str(path))
+
+    def market(self, event) -> None:
+        self.writer.write(
+            {
+                "kind": "market",
+                "timestamp": event.timestamp,
+                "symbol": event.symbol,
+                "price": event.price,
+                "volume": event.volume,
+            }
+        )
+
+    def record(self, event) -> None:
+        self.writer.write(
+            {
+                "kind": type(event).__name__,
+                "timestamp": event.timestamp,
+                "symbol": event.symbol,
+            }
+        )
+
+    def state(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _write_panel(csv_dir: Path, symbols: List[str], num_days: int) -> None:
+    rng = np.random.default_rng(2026)
+    dates = pd.bdate_range("2015-01-01", periods=num_days)
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        prices = 50.0 * np.exp(rng.normal(0, 0.015, size=num_days).cumsum())
+        volume = rng.integers(50_000, 500_000, size=num_days)
+        pd.DataFrame({"close": prices, "volume": volume}, index=dates).to_csv(
+            csv_dir / f"{symbol}.csv"
+        )
+
+
+def _run(handler, symbols: List[str], trace) -> float:
+    engine = Engine(
+        handler,
+        CrossSectionalMomentum(symbols, lookback_months=3, skip_months=1),
+        Portfolio(handler, initial_cash=10_000_000.0),
+        SimulatedBroker(Executor(handler, commission=0.001)),
+        rng=np.random.default_rng(0),
+        trace=trace,
+    )
+    t0 = time.perf_counter()
+    engine.run()
+    if trace is not None:
+        trace.close()
+    return time.perf_counter() - t0
+
+
+def run_benchmark(
+    num_symbols: int = 20, num_days: int = 750, repeats: int = 3
+) -> Dict[str, Any]:
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_panel(root / "prices", symbols, num_days)
+        handler = MultiCsvDataHandler(root / "prices", symbols)
+        variants = {
+            "none": lambda: None,
+            "binary": lambda: TraceRecorder(root / "full.bin"),
+            "binary_sampled": lambda: TraceRecorder(
+                root / "sampled.bin", sample_rate=0.1
+            ),
+            "jsonl": lambda: _JsonlTrace(root / "trace.jsonl"),
+        }
+        # Interleave variants so warm-up and drift do not favour one of them.
+        _run(handler, symbols, None)
+        for _ in range(repeats):
+            for name, factory in variants.items():
+                seconds = _run(handler, symbols, factory())
+                timings[name] = min(timings.get(name, seconds), seconds)
+        records = len(read_trace(root / "full.bin"))
+
+        # Recorder cost alone: push every market event straight through it.
+        events = list(handler.stream())
+        per_event: Dict[str, float] = {}
+        for name, factory in variants.items():
+            trace = factory()
+            if trace is None:
+                continue
+            t0 = time.perf_counter_ns()
+            for event in events:
+                trace.market(event)
+            trace.close()
+            per_event[name] = (time.perf_counter_ns() - t0) / len(events)
+
+    base = timings["none"]
+    results: Dict[str, Any] = {
+        "symbols": num_symbols,
+        "records": records,
+        **{f"{name}_seconds": round(value, 4) for name, value in timings.items()},
+        **{
+            f"{name}_overhead_pct": round(100.0 * (value / base - 1.0), 1)
+            for name, value in timings.items()
+            if name != "none"
+        },
+        **{f"{name}_ns_per_event": round(value) for name, value in per_event.items()},
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.repeats)
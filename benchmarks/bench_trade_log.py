@@ -0,0 +1,72 @@
+"""Time writing a trade log one record at a time versus in background batches.
+
+Writes ``records`` trade-shaped dicts through :class:`JsonlWriter` with the
+default per-record flush, with ``batch_size`` batching, and with batches
+encoded and written by the background thread. ``write_ms`` is the time spent
+in ``write`` calls (what the engine loop pays); ``total_ms`` includes close.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from microalpha.logging import JsonlWriter, write_columnar
+
+MODES = {
+    "unbuffered": {"batch_size": 1, "background": False},
+    "batched": {"batch_size": 256, "background": False},
+    "background": {"batch_size": 256, "background": True},
+}
+
+
+def _record(idx: int) -> Dict[str, Any]:
+    return {
+        "timestamp": 1_600_000_000_000_000_000 + idx,
+        "order_id": None,
+        "symbol": f"S{idx % 500:04d}",
+        "side": "BUY" if idx % 2 else "SELL",
+        "qty": float(idx % 1000 + 1),
+        "price": 100.0 + (idx % 97) * 0.01,
+        "commission": 0.5,
+        "slippage": 0.01,
+        "inventory": float(idx % 300),
+        "cash": 1_000_000.0 - idx,
+    }
+
+
+def run_benchmark(records: int = 200_000, repeats: int = 3) -> Dict[str, Any]:
+    payload = [_record(idx) for idx in range(records)]
+    results: Dict[str, Any] = {"records": records}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "trades.jsonl")
+        for mode, options in MODES.items():
+            best_write = best_total = float("inf")
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                writer = JsonlWriter(path, **options)
+                for record in payload:
+                    writer.write(record)
+                t1 = time.perf_counter()
+                writer.close()
+                t2 = time.perf_counter()
+                best_write = min(best_write, t1 - t0)
+                best_total = min(best_total, t2 - t0)
+            results[f"{mode}_write_ms"] = round(best_write * 1e3, 1)
+            results[f"{mode}_total_ms"] = round(best_total * 1e3, 1)
+        t0 = time.perf_counter()
+        write_columnar(path, "auto")
+        results["columnar_ms"] = round((time.perf_counter() - t0) * 1e3, 1)
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.records, args.repeats)
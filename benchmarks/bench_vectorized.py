@@ -0,0 +1,137 @@
+"""Benchmark the vectorized target-weight engine against the event engine.
+
+Both engines simulate the same monthly long/short weights panel on a
+synthetic universe with gaps; the script reports run times and the largest
+relative equity difference.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.events import SignalEvent
+from microalpha.execution import Executor
+from microalpha.portfolio import Portfolio
+from microalpha.slippage import LinearPlusSqrtImpact
+from microalpha.vectorized import PricePanel, VectorizedEngine
+
+
+def _write_panel(csv_dir: Path, symbols: List[str], num_days: int) -> None:
+    rng = np.random.default_rng(2026)
+    dates = pd.bdate_range("2015-01-01", periods=num_days)
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        mask = rng.random(num_days) > 0.05  # drop ~5% to create gaps
+        idx = dates[mask]
+        prices = 50.0 * np.exp(rng.normal(0, 0.015, size=idx.size).cumsum())
+        pd.DataFrame({"close": prices}, index=idx).to_csv(csv_dir / f"{symbol}.csv")
+
+
+def _monthly_weights(panel: PricePanel, gross: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    weights = np.full(panel.shape, np.nan)
+    months = panel.timestamps.astype("datetime64[ns]").astype("datetime64[M]")
+    first_rows = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    num_cols = panel.shape[1]
+    for row in first_rows.tolist():
+        scores = rng.normal(size=num_cols)
+        k = max(1, num_cols // 5)
+        order = np.argsort(scores)
+        target = np.zeros(num_cols)
+        target[order[-k:]] = gross / (2 * k)
+        target[order[:k]] = -gross / (2 * k)
+        weights[row] = target
+    return weights
+
+
+class _ReplayWeights:
+    """Emit the rows of a weights panel as target-weight signals."""
+
+    def __init__(self, panel: PricePanel, weights: np.ndarray):
+        self.rows = {ts: row for row, ts in enumerate(panel.timestamps.tolist())}
+        self.symbols = panel.symbols
+        self.weights = weights
+
+    def on_bar(self, timestamp, symbols, prices, volumes):
+        row = self.weights[self.rows[timestamp]]
+        present = set(symbols)
+        return [
+            SignalEvent(timestamp, sym, "LONG", meta={"target_weight": float(w)})
+            for sym, w in zip(self.symbols, row.tolist())
+            if not np.isnan(w) and sym in present
+        ]
+
+
+def _build(csv_dir: Path, symbols: List[str]):
+    handler = MultiCsvDataHandler(csv_dir, symbols)
+    portfolio = Portfolio(
+        handler,
+        initial_cash=10_000_000.0,
+        max_gross_leverage=1.5,
+        borrow_cfg={"annual_fee_bps": 50.0},
+    )
+    executor = Executor(
+        handler, commission=0.001, slippage_model=LinearPlusSqrtImpact()
+    )
+    return handler, portfolio, executor
+
+
+def run_benchmark(
+    num_symbols: int = 200, num_days: int = 2_500, repeats: int = 3
+) -> Dict[str, Any]:
+    symbols = [f"S{i:04d}" for i in range(num_symbols)]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = Path(tmp)
+        _write_panel(csv_dir, symbols, num_days)
+
+        handler, portfolio, executor = _build(csv_dir, symbols)
+        panel = PricePanel.from_handler(handler)
+        weights = _monthly_weights(panel)
+        strategy = _ReplayWeights(panel, weights)
+        t0 = time.perf_counter()
+        Engine(
+            handler, strategy, portfolio, SimulatedBroker(executor), bar_mode=True
+        ).run()
+        event_seconds = time.perf_counter() - t0
+
+        vector_seconds = float("inf")
+        for _ in range(repeats):
+            _, fresh, fresh_executor = _build(csv_dir, symbols)
+            t0 = time.perf_counter()
+            result = VectorizedEngine(fresh, fresh_executor).run(panel, weights)
+            vector_seconds = min(vector_seconds, time.perf_counter() - t0)
+
+    event_equity = np.array([rec["equity"] for rec in portfolio.equity_curve])
+    results: Dict[str, Any] = {
+        "symbols": num_symbols,
+        "bars": int(result.equity.shape[0]),
+        "trades": result.num_trades,
+        "event_seconds": round(event_seconds, 4),
+        "vectorized_seconds": round(vector_seconds, 4),
+        "speedup": round(event_seconds / vector_seconds, 1) if vector_seconds else 0.0,
+        "max_rel_equity_diff": float(
+            np.max(np.abs(result.equity - event_equity) / np.abs(event_equity))
+        ),
+        "trades_match": result.num_trades == len(portfolio.trades),
+    }
+    print(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--days", type=int, default=2_500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.symbols, args.days, args.repeats)
@@ -0,0 +1,533 @@
+"""Engine benchmark suite with JSON baselines and regression gates.
+
+Every scenario writes a synthetic price panel (plus symbol metadata and a
+flagship universe file) to a temporary directory, runs it through the regular
+config pipeline (``run_from_config`` / ``run_walk_forward``) in a fresh
+subprocess and reports engine events, events/sec, wall time and peak RSS.
+Panels are generated offline from fixed seeds, so event counts are stable
+across machines.
+
+    python benchmarks/suite.py --list
+    python benchmarks/suite.py --profile quick --output results.json
+    python benchmarks/suite.py --baseline benchmarks/baseline_quick.json
+    python benchmarks/suite.py --baseline benchmarks/baseline_quick.json \\
+        --update-baseline
+
+With ``--baseline`` the run fails (exit status 1) when a scenario's
+events/sec drops, or its wall time or peak RSS grows, by more than the
+configured threshold relative to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+import yaml
+
+PROFILES: Dict[str, Dict[str, int]] = {
+    # A few seconds per scenario; used by the tests.
+    "smoke": {"single_days": 300, "multi_days": 80, "wfv_days": 420},
+    "quick": {"single_days": 2_500, "multi_days": 252, "wfv_days": 756},
+    "full": {"single_days": 10_000, "multi_days": 1_260, "wfv_days": 2_520},
+}
+EXECUTORS = ("instant", "twap", "vwap", "is", "sqrt", "kyle")
+SECTORS = ("TECH", "FIN", "HLTH", "INDU", "ENGY")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    # Writes the scenario's data under the directory and returns its config.
+    prepare: Callable[[Path, Dict[str, int]], Dict[str, Any]]
+    walkforward: bool = False
+
+
+def _write_panel(root: Path, num_symbols: int, num_days: int) -> List[str]:
+    """Write prices, metadata and a monthly universe for a synthetic panel."""
+
+    rng = np.random.default_rng(num_symbols * 7_919 + num_days)
+    symbols = [f"S{idx:04d}" for idx in range(num_symbols)]
+    dates = pd.bdate_range("1990-01-02", periods=num_days)
+    prices_dir = root / "prices"
+    prices_dir.mkdir(parents=True, exist_ok=True)
+    meta_rows = []
+    universe = []
+    month_end = dates.to_series().groupby(dates.to_period("M")).max()
+    for idx, symbol in enumerate(symbols):
+        # Multi-symbol panels drop ~3% of prints to exercise ragged calendars.
+        mask = rng.random(num_days) > (0.03 if num_symbols > 1 else 0.0)
+        index = dates[mask]
+        drift = rng.normal(0.0002, 0.0004)
+        close = 20.0 * np.exp((drift + rng.normal(0, 0.015, index.size)).cumsum())
+        volume = rng.integers(100_000, 2_000_000, index.size)
+        frame = pd.DataFrame({"close": close, "volume": volume}, index=index)
+        frame.index.name = "date"
+        frame.to_csv(prices_dir / f"{symbol}.csv")
+        adv = float(np.mean(close * volume))
+        meta_rows.append(
+            {
+                "symbol": symbol,
+                "adv": adv,
+                "borrow_fee_annual_bps": float(rng.uniform(20, 150)),
+                "spread_bps": float(rng.uniform(5, 25)),
+            }
+        )
+        closes = frame["close"].reindex(month_end.values, method="ffill")
+        for date, price in closes.dropna().items():
+            universe.append(
+                {
+                    "symbol": symbol,
+                    "date": date.date().isoformat(),
+                    "sector": SECTORS[idx % len(SECTORS)],
+                    "adv_20": adv,
+                    "adv_63": adv,
+                    "adv_126": adv,
+                    "market_cap_proxy": adv * 250.0,
+                    "close": float(price),
+                }
+            )
+    pd.DataFrame(meta_rows).to_csv(root / "meta.csv", index=False)
+    pd.DataFrame(universe).to_csv(root / "universe.csv", index=False)
+    return symbols
+
+
+def _base_config(root: Path, symbol: str) -> Dict[str, Any]:
+    return {
+        "data_path": str(root / "prices"),
+        "meta_path": str(root / "meta.csv"),
+        "symbol": symbol,
+        "cash": 10_000_000.0,
+        "seed": 7,
+        "run_mode": "dev",
+    }
+
+
+def _single(exec_type: str) -> Callable[[Path, Dict[str, int]], Dict[str, Any]]:
+    def prepare(root: Path, profile: Dict[str, int]) -> Dict[str, Any]:
+        (symbol,) = _write_panel(root, 1, profile["single_days"])
+        config = _base_config(root, symbol)
+        config.update(
+            {
+                "max_exposure": 0.8,
+                "exec": {
+                    "type": exec_type,
+                    "commission": 0.001,
+                    "price_impact": 0.00005,
+                    "slices": 4,
+                },
+                "strategy": {
+                    "name": "MeanReversionStrategy",
+                    "params": {"lookback": 10, "z_threshold": 0.8},
+                },
+                "capital_policy": {
+                    "type": "volatility_scaled",
+                    "lookback": 20,
+                    "target_dollar_vol": 50_000.0,
+                },
+            }
+        )
+        return config
+
+    return prepare
+
+
+def _lob(root: Path, profile: Dict[str, int]) -> Dict[str, Any]:
+    (symbol,) = _write_panel(root, 1, profile["single_days"])
+    config = _base_config(root, symbol)
+    # The LOB executor takes no symbol metadata.
+    config.pop("meta_path")
+    config.update(
+        {
+            "exec": {
+                "type": "lob",
+                "book_levels": 3,
+                "level_size": 300,
+                "tick_size": 0.05,
+                "lob_tplus1": True,
+            },
+            "strategy": {
+                "name": "NaiveMarketMakingStrategy",
+                "params": {"spread": 0.1, "inventory_limit": 200},
+            },
+        }
+    )
+    return config
+
+
+def _cross_sectional(
+    num_symbols: int, bar_mode: bool
+) -> Callable[[Path, Dict[str, int]], Dict[str, Any]]:
+    def prepare(root: Path, profile: Dict[str, int]) -> Dict[str, Any]:
+        symbols = _write_panel(root, num_symbols, profile["multi_days"])
+        config = _base_config(root, symbols[0])
+        config.update(
+            {
+                "bar_mode": bar_mode,
+                "max_single_name_weight": 0.1,
+                "max_gross_leverage": 1.5,
+                "borrow": {"annual_fee_bps": 50.0},
+                "exec": {
+                    "type": "instant",
+                    "commission": 0.0005,
+                    "slippage": {"type": "linear_sqrt"},
+                },
+                "strategy": {
+                    "name": "CrossSectionalMomentum",
+                    "params": {
+                        "symbols": symbols,
+                        "lookback_months": 3,
+                        "skip_months": 1,
+                        "top_frac": 0.2,
+                        "target_gross": 1.0,
+                    },
+                },
+            }
+        )
+        return config
+
+    return prepare
+
+
+def _flagship(root: Path, profile: Dict[str, int]) -> Dict[str, Any]:
+    symbols = _write_panel(root, 100, profile["multi_days"])
+    config = _base_config(root, symbols[0])
+    config.update(
+        {
+            "max_exposure": 1.25,
+            "max_portfolio_heat": 2.5,
+            "max_positions_per_sector": 6,
+            "exec": {
+                "type": "twap",
+                "commission": 0.0005,
+                "slices": 3,
+                "slippage": {"type": "linear_sqrt"},
+            },
+            "strategy": {
+                "name": "FlagshipMomentumStrategy",
+                "params": {
+                    "universe_path": str(root / "universe.csv"),
+                    "lookback_months": 3,
+                    "skip_months": 1,
+                    "min_adv": 1_000_000.0,
+                    "min_price": 1.0,
+                },
+            },
+            "capital_policy": {
+                "type": "volatility_scaled",
+                "lookback": 21,
+                "target_dollar_vol": 20_000.0,
+            },
+        }
+    )
+    return config
+
+
+def _walkforward(root: Path, profile: Dict[str, int]) -> Dict[str, Any]:
+    symbols = _write_panel(root, 30, profile["wfv_days"])
+    dates = pd.read_csv(root / "prices" / f"{symbols[0]}.csv")["date"]
+    template = _base_config(root, symbols[0])
+    template.update(
+        {
+            "bar_mode": True,
+            "max_single_name_weight": 0.2,
+            "exec": {"type": "instant", "commission": 0.0005},
+            "strategy": {
+                "name": "CrossSectionalMomentum",
+                "params": {"symbols": symbols, "lookback_months": 3},
+            },
+        }
+    )
+    return {
+        "template": template,
+        "walkforward": {
+            "start": dates.iloc[0],
+            "end": dates.iloc[-1],
+            "training_days": 252,
+            "testing_days": 63,
+        },
+        "grid": {"lookback_months": [3, 6], "top_frac": [0.2, 0.3]},
+        "reality_check": {"samples": 50},
+    }
+
+
+def _execute(cfg_path: Path, artifacts_root: Path, walkforward: bool) -> Dict[str, Any]:
+    """Run a prepared config and return engine events and seconds."""
+
+    if not walkforward:
+        from microalpha.runner import run_from_config
+
+        result = run_from_config(
+            str(cfg_path), override_artifacts_dir=str(artifacts_root)
+        )
+        timing = json.loads(Path(result["engine_timing_path"]).read_text())
+        return {"events": timing["events"], "engine_seconds": timing["wall_seconds"]}
+
+    from microalpha.walkforward import run_walk_forward
+
+    result = run_walk_forward(str(cfg_path), override_artifacts_dir=str(artifacts_root))
+    timing_path = Path(result["artifacts_dir"]) / "engine_timing.json"
+    timing = json.loads(timing_path.read_text())
+    # Out-of-sample folds plus every in-sample grid run.
+    grid = [entry for fold in timing["folds"] for entry in fold["grid"]]
+    return {
+        "events": timing["total"]["events"] + sum(e["events"] for e in grid),
+        "engine_seconds": timing["total"]["wall_seconds"]
+        + sum(e["wall_seconds"] for e in grid),
+    }
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        *(
+            Scenario(
+                f"single_{exec_type}",
+                f"one symbol, mean reversion, {exec_type} executor",
+                _single(exec_type),
+            )
+            for exec_type in EXECUTORS
+        ),
+        Scenario("single_lob", "one symbol, market making, LOB t+1", _lob),
+        Scenario(
+            "multi_10_event",
+            "10 symbols, cross-sectional momentum, event mode",
+            _cross_sectional(10, False),
+        ),
+        *(
+            Scenario(
+                f"multi_{count}_bar",
+                f"{count} symbols, cross-sectional momentum, bar mode",
+                _cross_sectional(count, True),
+            )
+            for count in (10, 100, 1000)
+        ),
+        Scenario(
+            "flagship_100",
+            "100 symbols, flagship momentum with TWAP and sizing policy",
+            _flagship,
+        ),
+        Scenario(
+            "wfv_grid_30",
+            "30 symbols, walk-forward with a 2x2 in-sample grid",
+            _walkforward,
+            walkforward=True,
+        ),
+    ]
+}
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return round(peak / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(name: str, profile: str, repeats: int = 1) -> Dict[str, Any]:
+    """Run one scenario in this process and return its best measurements.
+
+    The panel is generated once; each repeat runs the config afresh and the
+    fastest engine time and wall time are kept.
+    """
+
+    scenario = SCENARIOS[name]
+    with tempfile.TemporaryDirectory(prefix=f"microalpha-bench-{name}-") as tmp:
+        root = Path(tmp)
+        cfg_path = root / "config.yaml"
+        config = scenario.prepare(root, PROFILES[profile])
+        cfg_path.write_text(yaml.safe_dump(config))
+        events = 0
+        engine_seconds = wall = float("inf")
+        for repeat in range(max(1, repeats)):
+            started = time.perf_counter()
+            stats = _execute(cfg_path, root / f"run{repeat}", scenario.walkforward)
+            wall = min(wall, time.perf_counter() - started)
+            engine_seconds = min(engine_seconds, stats["engine_seconds"])
+            events = int(stats["events"])
+    return {
+        "events": events,
+        "events_per_sec": round(events / engine_seconds, 1) if engine_seconds else 0.0,
+        "engine_seconds": round(engine_seconds, 4),
+        "wall_seconds": round(wall, 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _run_isolated(name: str, profile: str, repeats: int = 1) -> Dict[str, Any]:
+    # A fresh interpreter per scenario keeps peak RSS attributable to it.
+    command = [sys.executable, __file__, "--worker", name, "--profile", profile]
+    proc = subprocess.run(
+        [*command, "--repeats", str(repeats)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"scenario {name} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def select(patterns: Sequence[str] | None) -> List[str]:
+    if not patterns:
+        return list(SCENARIOS)
+    names = [
+        name
+        for name in SCENARIOS
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    if not names:
+        raise SystemExit(f"no scenarios match {list(patterns)}")
+    return names
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    rss_threshold: float,
+) -> List[str]:
+    """Return a message for every scenario that regressed past the thresholds."""
+
+    if results["profile"] != baseline.get("profile"):
+        return [
+            f"baseline profile {baseline.get('profile')!r} does not match "
+            f"{results['profile']!r}"
+        ]
+    failures = []
+    reference = baseline.get("scenarios", {})
+    for name, current in results["scenarios"].items():
+        base = reference.get(name)
+        if base is None:
+            continue
+        if current["events"] != base["events"]:
+            failures.append(
+                f"{name}: events changed from {base['events']} to "
+                f"{current['events']}; refresh the baseline"
+            )
+            continue
+        if current["events_per_sec"] < base["events_per_sec"] * (1 - threshold):
+            failures.append(
+                f"{name}: events/sec {current['events_per_sec']:.0f} < "
+                f"baseline {base['events_per_sec']:.0f} - {threshold:.0%}"
+            )
+        if current["wall_seconds"] > base["wall_seconds"] * (1 + threshold):
+            failures.append(
+                f"{name}: wall {current['wall_seconds']:.2f}s > "
+                f"baseline {base['wall_seconds']:.2f}s + {threshold:.0%}"
+            )
+        if (
+            current["peak_rss_mb"] is not None
+            and base.get("peak_rss_mb") is not None
+            and current["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_threshold)
+        ):
+            failures.append(
+                f"{name}: peak RSS {current['peak_rss_mb']:.0f} MB > "
+                f"baseline {base['peak_rss_mb']:.0f} MB + {rss_threshold:.0%}"
+            )
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument(
+        "--scenarios", nargs="+", metavar="PATTERN", help="glob(s) of scenarios"
+    )
+    parser.add_argument("--list", action="store_true", help="list scenarios")
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="runs per scenario; the fastest is kept",
+    )
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to gate on")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to --baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative drop in events/sec or growth in wall time",
+    )
+    parser.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative growth in peak RSS",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="run scenarios in this process (peak RSS is then cumulative)",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, args.profile, args.repeats)))
+        return 0
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:18s} {scenario.description}")
+        return 0
+    if args.update_baseline and args.baseline is None:
+        parser.error("--update-baseline requires --baseline")
+
+    runner = run_scenario if args.in_process else _run_isolated
+    results: Dict[str, Any] = {
+        "profile": args.profile,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for name in select(args.scenarios):
+        results["scenarios"][name] = runner(name, args.profile, args.repeats)
+        print(json.dumps({name: results["scenarios"][name]}), flush=True)
+
+    payload = json.dumps(results, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload)
+    if args.baseline is None:
+        return 0
+    if args.update_baseline:
+        if args.baseline.exists():
+            # Keep entries for scenarios that were not re-run.
+            previous = json.loads(args.baseline.read_text())
+            if previous.get("profile") == args.profile:
+                merged = {**previous.get("scenarios", {}), **results["scenarios"]}
+                results["scenarios"] = merged
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+    failures = compare(
+        results,
+        json.loads(args.baseline.read_text()),
+        args.threshold,
+        args.rss_threshold,
+    )
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
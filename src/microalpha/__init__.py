@@ -1,14 +1,17 @@
 from .broker import SimulatedBroker
 from .data import CsvDataHandler, MultiCsvDataHandler
-from .engine import Engine
+from .engine import Engine, FanOutEngine
 from .execution import TWAP, Executor, KyleLambda, LOBExecution, SquareRootImpact
 from .manifest import Manifest
 from .metrics import compute_metrics
 from .portfolio import Portfolio
 from .risk_stats import block_bootstrap, sharpe_stats
+from .vectorized import VectorizedEngine
 
 __all__ = [
     "Engine",
+    "FanOutEngine",
+    "VectorizedEngine",
     "CsvDataHandler",
     "MultiCsvDataHandler",
     "Portfolio",
@@ -0,0 +1,238 @@
+"""Array-backed position book for :class:`~microalpha.portfolio.Portfolio`.
+
+``Portfolio(book="array")`` keeps quantities, average costs, last marks and
+borrow accrual days in dense arrays indexed by a per-run symbol id, so
+marking the book is a handful of vector operations instead of a Python loop
+over positions. ``positions`` and ``avg_cost`` stay available as live
+mapping views over the arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, List, MutableMapping
+
+import numpy as np
+
+
+class ArrayBook:
+    """Dense per-symbol arrays; ids are assigned in first-seen order.
+
+    ``avg_cost`` and ``borrow_bps`` hold NaN where the symbol has no average
+    cost or borrows for free, and ``borrow_day`` is ``-1`` until a short
+    position first accrues borrow. ``priced`` marks the symbols whose last
+    mark had a price (which may itself be NaN), and ``listed`` the symbols
+    shown in the ``positions`` view.
+    """
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(int(capacity), 1)
+        self.ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.qty = np.zeros(capacity, dtype=np.int64)
+        self.avg_cost = np.full(capacity, np.nan)
+        self.last_price = np.full(capacity, np.nan)
+        self.priced = np.zeros(capacity, dtype=bool)
+        self.borrow_bps = np.full(capacity, np.nan)
+        self.borrow_day = np.full(capacity, -1, dtype=np.int64)
+        self.listed = np.zeros(capacity, dtype=bool)
+        self._rated = 0
+        self._panel_symbols: List[str] | None = None
+        self._cols = np.empty(0, dtype=np.intp)
+        self._unpriced: np.ndarray | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.symbols)
+
+    def slot(self, symbol: str) -> int:
+        """Return the id of ``symbol``, adding it to the book if needed."""
+        idx = self.ids.get(symbol)
+        if idx is None:
+            idx = self.ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if idx == self.qty.shape[0]:
+                self._grow()
+        return idx
+
+    def _grow(self) -> None:
+        def extend(values: np.ndarray, fill) -> np.ndarray:
+            grown = np.full(values.shape[0] * 2, fill, dtype=values.dtype)
+            grown[: values.shape[0]] = values
+            return grown
+
+        self.qty = extend(self.qty, 0)
+        self.avg_cost = extend(self.avg_cost, np.nan)
+        self.last_price = extend(self.last_price, np.nan)
+        self.priced = extend(self.priced, False)
+        self.borrow_bps = extend(self.borrow_bps, np.nan)
+        self.borrow_day = extend(self.borrow_day, -1)
+        self.listed = extend(self.listed, False)
+
+    def borrow_rates(self, rate_of: Callable[[str], float | None]) -> np.ndarray:
+        """Annual borrow fee (bps) per id, resolved once per symbol."""
+        size = self.size
+        for idx in range(self._rated, size):
+            rate = rate_of(self.symbols[idx])
+            self.borrow_bps[idx] = np.nan if rate is None else rate
+        self._rated = size
+        return self.borrow_bps[:size]
+
+    def marks(self, data_handler, timestamp: int) -> tuple[np.ndarray, np.ndarray]:
+        """Store and return each symbol's latest price and whether it had one.
+
+        Unpriced symbols are marked NaN with ``priced`` False; a NaN price
+        stays priced, as it would in the dict book. Handlers whose
+        ``price_row`` has a panel row ready answer at once; others are asked
+        per symbol through ``get_latest_price``.
+        """
+        size = self.size
+        marks = self.last_price[:size]
+        priced = self.priced[:size]
+        price_row = getattr(data_handler, "price_row", None)
+        snapshot = price_row(timestamp) if price_row is not None else None
+        if snapshot is None:
+            lookup = data_handler.get_latest_price
+            for idx, symbol in enumerate(self.symbols):
+                price = lookup(symbol, timestamp)
+                priced[idx] = price is not None
+                marks[idx] = np.nan if price is None else price
+        else:
+            panel_symbols, row, row_priced = snapshot
+            if panel_symbols is not self._panel_symbols or self._cols.size != size:
+                self._map_columns(panel_symbols)
+            np.take(row, self._cols, out=marks)
+            np.take(row_priced, self._cols, out=priced)
+            if self._unpriced is not None:
+                marks[self._unpriced] = np.nan
+                priced[self._unpriced] = False
+        return marks, priced
+
+    def _map_columns(self, panel_symbols: List[str]) -> None:
+        columns = {symbol: col for col, symbol in enumerate(panel_symbols)}
+        cols = np.array(
+            [columns.get(symbol, -1) for symbol in self.symbols], dtype=np.intp
+        )
+        unpriced = cols < 0
+        self._unpriced = np.flatnonzero(unpriced) if unpriced.any() else None
+        cols[unpriced] = 0
+        self._cols = cols
+        self._panel_symbols = panel_symbols
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = self.__dict__.copy()
+        # Column maps refer to a data handler's panel; rebuild after a restore.
+        state["_panel_symbols"] = None
+        state["_cols"] = np.empty(0, dtype=np.intp)
+        state["_unpriced"] = None
+        return state
+
+
+class BookPosition:
+    """Live view of one symbol's quantity in an :class:`ArrayBook`."""
+
+    __slots__ = ("_book", "_idx")
+
+    def __init__(self, book: ArrayBook, idx: int):
+        self._book = book
+        self._idx = idx
+
+    @property
+    def qty(self) -> int:
+        return int(self._book.qty[self._idx])
+
+    @qty.setter
+    def qty(self, value: int) -> None:
+        self._book.qty[self._idx] = value
+
+    def __repr__(self) -> str:
+        return f"BookPosition(qty={self.qty})"
+
+
+class PositionsView(MutableMapping):
+    """``symbol -> position`` mapping over an :class:`ArrayBook`."""
+
+    def __init__(self, book: ArrayBook):
+        self._book = book
+
+    def __getitem__(self, symbol: str) -> BookPosition:
+        idx = self._book.ids.get(symbol)
+        if idx is None or not self._book.listed[idx]:
+            raise KeyError(symbol)
+        return BookPosition(self._book, idx)
+
+    def __setitem__(self, symbol: str, position) -> None:
+        book = self._book
+        idx = book.slot(symbol)
+        book.qty[idx] = position.qty
+        book.listed[idx] = True
+
+    def setdefault(self, symbol: str, default=None) -> BookPosition:
+        # The base class would hand back ``default`` rather than the live view.
+        if symbol not in self:
+            book = self._book
+            idx = book.slot(symbol)
+            book.qty[idx] = default.qty if default is not None else 0
+            book.listed[idx] = True
+        return self[symbol]
+
+    def __delitem__(self, symbol: str) -> None:
+        book = self._book
+        idx = book.ids.get(symbol)
+        if idx is None or not book.listed[idx]:
+            raise KeyError(symbol)
+        book.listed[idx] = False
+        book.qty[idx] = 0
+
+    def __iter__(self) -> Iterator[str]:
+        listed = self._book.listed
+        return (sym for idx, sym in enumerate(self._book.symbols) if listed[idx])
+
+    def __len__(self) -> int:
+        return int(self._book.listed[: self._book.size].sum())
+
+    def __repr__(self) -> str:
+        return f"PositionsView({dict(self.items())!r})"
+
+
+class AvgCostView(MutableMapping):
+    """``symbol -> average cost`` mapping over an :class:`ArrayBook`."""
+
+    def __init__(self, book: ArrayBook):
+        self._book = book
+
+    def __getitem__(self, symbol: str) -> float:
+        idx = self._book.ids.get(symbol)
+        if idx is None:
+            raise KeyError(symbol)
+        value = self._book.avg_cost.item(idx)
+        if value != value:
+            raise KeyError(symbol)
+        return value
+
+    def __setitem__(self, symbol: str, value: float) -> None:
+        self._book.avg_cost[self._book.slot(symbol)] = value
+
+    def __delitem__(self, symbol: str) -> None:
+        self[symbol]
+        self._book.avg_cost[self._book.ids[symbol]] = np.nan
+
+    def __iter__(self) -> Iterator[str]:
+        costs = self._book.avg_cost
+        symbols = self._book.symbols
+        return (sym for idx, sym in enumerate(symbols) if costs[idx] == costs[idx])
+
+    def __len__(self) -> int:
+        return int((~np.isnan(self._book.avg_cost[: self._book.size])).sum())
+
+    def __repr__(self) -> str:
+        return f"AvgCostView({dict(self.items())!r})"
+
+
+def running_sum(values: np.ndarray) -> float:
+    """Left-to-right float sum, bit-identical to accumulating in a loop."""
+    if not values.size:
+        return 0.0
+    return float(np.cumsum(values)[-1]) + 0.0
+
+
+__all__ = ["ArrayBook", "AvgCostView", "BookPosition", "PositionsView", "running_sum"]
@@ -10,6 +10,8 @@ from typing import Protocol
 
 import numpy as np
 
+from .data import estimate_volatility
+
 
 class DataHandlerLike(Protocol):
     def get_recent_prices(
@@ -61,16 +63,12 @@ class VolatilityScaledPolicy:
         if timestamp is None:
             return base_qty
 
-        prices = portfolio.data_handler.get_recent_prices(
-            symbol, timestamp, self.lookback
-        )
-        if len(prices) < 2 or price <= 0:
+        if price <= 0:
             return base_qty
-
-        arr = np.asarray(prices, dtype=float)
-        ret = np.diff(arr) / arr[:-1]
-        vol = float(np.std(ret, ddof=0))
-        if vol <= 0:
+        vol = estimate_volatility(
+            portfolio.data_handler, symbol, timestamp, self.lookback
+        )
+        if vol is None or vol <= 0:
             return base_qty
 
         # Dollar vol of base trade; scale to target_dollar_vol
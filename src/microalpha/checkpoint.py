@@ -0,0 +1,102 @@
+"""Crash-safe snapshots of in-flight backtest state.
+
+Checkpoints are pickles written atomically (temporary file plus
+``os.replace``) so a preempted run never leaves a truncated snapshot behind.
+Objects that are rebuilt from the run configuration rather than restored --
+the data handler and the open trade log -- are stored as named references
+and rebound to the live objects supplied on load.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_FILENAME = "checkpoint.pkl"
+# End-of-run state kept by incremental backtests for ``--extend``.
+ENGINE_STATE_FILENAME = "engine_state.pkl"
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint cannot be restored into the current run."""
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, handle, externals: Mapping[str, Any]):
+        super().__init__(handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self._external_ids = {
+            id(obj): name for name, obj in externals.items() if obj is not None
+        }
+
+    def persistent_id(self, obj: Any) -> str | None:
+        return self._external_ids.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, handle, externals: Mapping[str, Any]):
+        super().__init__(handle)
+        self._externals = externals
+
+    def persistent_load(self, pid: Any) -> Any:
+        obj = self._externals.get(pid)
+        if obj is None:
+            raise CheckpointError(f"checkpoint references missing object '{pid}'")
+        return obj
+
+
+def save_checkpoint(
+    path: str | Path,
+    state: Mapping[str, Any],
+    externals: Mapping[str, Any] | None = None,
+) -> Path:
+    """Atomically write ``state`` to ``path``.
+
+    Objects in ``externals`` are referenced by name instead of pickled.
+    """
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    payload = {"version": CHECKPOINT_VERSION, **state}
+    with tmp.open("wb") as handle:
+        _Pickler(handle, externals or {}).dump(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, target)
+    return target
+
+
+def load_checkpoint(
+    path: str | Path, externals: Mapping[str, Any] | None = None
+) -> Dict[str, Any]:
+    """Load a checkpoint written by :func:`save_checkpoint`."""
+
+    source = Path(path)
+    if not source.exists():
+        raise CheckpointError(f"checkpoint not found: {source}")
+    with source.open("rb") as handle:
+        payload = _Unpickler(handle, externals or {}).load()
+    version = payload.get("version") if isinstance(payload, dict) else None
+    if version != CHECKPOINT_VERSION:
+        raise CheckpointError(f"unsupported checkpoint version {version!r} in {source}")
+    return payload
+
+
+def discard_checkpoint(path: str | Path) -> None:
+    """Remove a checkpoint once the run it protects has completed."""
+
+    Path(path).unlink(missing_ok=True)
+
+
+__all__ = [
+    "CHECKPOINT_FILENAME",
+    "CHECKPOINT_VERSION",
+    "CheckpointError",
+    "ENGINE_STATE_FILENAME",
+    "discard_checkpoint",
+    "load_checkpoint",
+    "save_checkpoint",
+]
@@ -9,6 +9,7 @@ import platform
 import sys
 import time
 from pathlib import Path
+from typing import Any
 
 from microalpha.reporting.robustness import write_robustness_artifacts
 from microalpha.reporting.summary import generate_summary
@@ -45,6 +46,24 @@ def main() -> None:
         action="store_true",
         help="Enable cProfile and write to <artifacts_dir>/profile.pstats",
     )
+    run_parser.add_argument(
+        "--data-workers",
+        type=int,
+        dest="data_load_workers",
+        help="Threads used to parse per-symbol CSVs (overrides data_load_workers)",
+    )
+    run_parser.add_argument(
+        "--resume",
+        metavar="ARTIFACT_DIR",
+        default=None,
+        help="Resume an interrupted run of the same config from its checkpoint",
+    )
+    run_parser.add_argument(
+        "--extend",
+        metavar="ARTIFACT_DIR",
+        default=None,
+        help="Extend an incremental run with bars added since it finished",
+    )
 
     wfv_parser = subparsers.add_parser("wfv")
     wfv_parser.add_argument("-c", "--config", required=True)
@@ -70,6 +89,18 @@ def main() -> None:
         dest="reality_check_block_len",
         help="Override block length for walk-forward bootstrap (default Politis-White)",
     )
+    wfv_parser.add_argument(
+        "--data-workers",
+        type=int,
+        dest="data_load_workers",
+        help="Threads used to parse per-symbol CSVs (overrides data_load_workers)",
+    )
+    wfv_parser.add_argument(
+        "--resume",
+        metavar="ARTIFACT_DIR",
+        default=None,
+        help="Resume an interrupted run of the same config from its checkpoint",
+    )
 
     report_parser = subparsers.add_parser("report")
     report_parser.add_argument(
@@ -147,6 +178,29 @@ def main() -> None:
     )
     verify_parser.add_argument("artifact_dir")
 
+    feed_parser = subparsers.add_parser(
+        "feed", help="Replay local price CSVs over TCP as a stand-in live feed."
+    )
+    feed_parser.add_argument("--data-path", required=True)
+    feed_parser.add_argument("--symbols", nargs="+", required=True)
+    feed_parser.add_argument("--host", default="127.0.0.1")
+    feed_parser.add_argument(
+        "--port", type=int, default=0, help="Port to listen on (0 picks a free one)."
+    )
+    feed_parser.add_argument(
+        "--speed",
+        type=float,
+        default=None,
+        help="Replay speed relative to bar time (default: as fast as possible).",
+    )
+    feed_parser.add_argument("--bar-mode", action="store_true")
+    feed_parser.add_argument(
+        "--clients",
+        type=int,
+        default=1,
+        help="Exit after serving this many clients (0 serves until killed).",
+    )
+
     args = parser.parse_args()
 
     if args.cmd == "info":
@@ -172,6 +226,10 @@ def main() -> None:
         print(json.dumps(verify_artifact_dir(args.artifact_dir), indent=2))
         return
 
+    if args.cmd == "feed":
+        _serve_feed(args)
+        return
+
     t0 = time.time()
 
     if args.cmd == "run":
@@ -179,10 +237,19 @@ def main() -> None:
             import os as _os
 
             _os.environ["MICROALPHA_PROFILE"] = "1"
+        data_kwargs: dict[str, Any] = {}
+        if getattr(args, "data_load_workers", None) is not None:
+            data_kwargs["data_load_workers"] = args.data_load_workers
+        if getattr(args, "resume", None):
+            data_kwargs["resume"] = args.resume
+        if getattr(args, "extend", None):
+            data_kwargs["extend"] = args.extend
         if args.outdir:
-            manifest = run_from_config(args.config, override_artifacts_dir=args.outdir)
+            manifest = run_from_config(
+                args.config, override_artifacts_dir=args.outdir, **data_kwargs
+            )
         else:
-            manifest = run_from_config(args.config)
+            manifest = run_from_config(args.config, **data_kwargs)
     elif args.cmd == "wfv":
         if getattr(args, "profile", False):
             import os as _os
@@ -191,6 +258,8 @@ def main() -> None:
         run_kwargs = {
             "reality_check_method": getattr(args, "reality_check_method", None),
             "reality_check_block_len": getattr(args, "reality_check_block_len", None),
+            "data_load_workers": getattr(args, "data_load_workers", None),
+            "resume": getattr(args, "resume", None),
         }
         if args.outdir:
             manifest = run_walk_forward(
@@ -270,6 +339,29 @@ def main() -> None:
     print(json.dumps(manifest, indent=2))
 
 
+def _serve_feed(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from .data import MultiCsvDataHandler
+    from .live import serve_replay
+
+    def ready(host: str, port: int) -> None:
+        print(json.dumps({"host": host, "port": port}), flush=True)
+
+    handler = MultiCsvDataHandler(Path(args.data_path), args.symbols)
+    asyncio.run(
+        serve_replay(
+            handler,
+            args.host,
+            args.port,
+            speed=args.speed,
+            bar_mode=args.bar_mode,
+            clients=args.clients or None,
+            ready=ready,
+        )
+    )
+
+
 def _build_info() -> dict[str, str]:
     info = {
         "python": platform.python_version(),
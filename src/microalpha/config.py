@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 import warnings
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, ValidationError, model_validator
 
@@ -127,6 +127,34 @@ class BorrowCfg(BaseModel):
     )
 
 
+class TraceCfg(BaseModel):
+    sample_rate: float = Field(
+        default=1.0,
+        gt=0.0,
+        le=1.0,
+        description="Fraction of market events (or bars) to record.",
+    )
+    symbols: List[str] | None = Field(
+        default=None, description="Only record events for these symbols."
+    )
+    buffer_events: int = Field(
+        default=65_536, ge=1, description="Events buffered between writes."
+    )
+
+
+class TradeLogCfg(BaseModel):
+    batch_size: int = Field(
+        default=1, ge=1, description="Trade records buffered between writes."
+    )
+    background: bool = Field(
+        default=False, description="Encode and write batches on a worker thread."
+    )
+    columnar: Literal["auto", "parquet", "arrow", "csv"] | None = Field(
+        default=None,
+        description="Also write trades in this format next to trades.jsonl.",
+    )
+
+
 class BacktestCfg(BaseModel):
     data_path: str
     symbol: str
@@ -155,6 +183,30 @@ class BacktestCfg(BaseModel):
     end_date: str | None = None
     metrics_hac_lags: int | None = None
     meta_path: str | None = None
+    data_cache_dir: str | None = None
+    data_stream_mode: Literal["merge", "dense"] = "merge"
+    data_lazy_load: bool = False
+    data_memory_budget_mb: float | None = None
+    data_load_workers: int = Field(default=1, ge=1)
+    data_csv_engine: Literal["c", "pyarrow"] = "c"
+    bar_mode: bool = False
+    # "array" marks positions with vector ops (see microalpha.book)
+    portfolio_book: Literal["dict", "array"] = "dict"
+    # Reuse the mark for further market events at an already-marked timestamp
+    portfolio_incremental_marks: bool = False
+    # Cross-check every Nth reused mark against a full revaluation
+    portfolio_revalue_every: int | None = Field(default=None, ge=1)
+    # "columnar" keeps the equity curve in numpy columns (see microalpha.equity)
+    portfolio_equity_store: Literal["records", "columnar"] = "records"
+    # Size each bar's target_weight signals together (Portfolio.on_rebalance)
+    portfolio_batch_rebalance: bool = False
+    # Snapshot engine state every N events to <artifacts>/checkpoint.pkl
+    checkpoint_every: int | None = Field(default=None, ge=1)
+    # Keep <artifacts>/engine_state.pkl so the run can be extended with new bars
+    incremental: bool = False
+    # Record engine events to <artifacts>/trace.bin (see microalpha.trace)
+    trace: TraceCfg | None = None
+    trade_log: TradeLogCfg = Field(default_factory=TradeLogCfg)
 
     @model_validator(mode="after")
     def _sync_gross_leverage(self) -> "BacktestCfg":
@@ -43,3 +43,8 @@ class WFVCfg(BaseModel):
     artifacts_dir: str | None = None
     reality_check: RealityCheckCfg = Field(default_factory=RealityCheckCfg)
     non_degenerate: NonDegenerateCfg | None = None
+    insample_engine: Literal["event", "vectorized"] = "event"
+    # Grid candidates run together off one data pass, this many at a time
+    insample_fanout: int = Field(default=1, ge=1)
+    # Snapshot progress to <artifacts>/checkpoint.pkl before each fold
+    checkpoint_folds: bool = False
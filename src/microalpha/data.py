@@ -1,15 +1,20 @@
 # microalpha/data.py
 from __future__ import annotations
 
-import heapq
+import csv
 import numbers
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import dropwhile
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Sequence, cast
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, cast
 
 import numpy as np
 import pandas as pd
 
-from .events import MarketEvent
+from .data_cache import PanelCache, resolve_panel_cache
+from .events import BarEvent, MarketEvent
 
 
 class DataHandler:
@@ -20,27 +25,162 @@ class DataHandler:
     def stream(self) -> Iterator[MarketEvent]:
         raise NotImplementedError("stream() must be implemented")
 
+    def stream_bars(self) -> Iterator[BarEvent]:
+        """Yield one ``BarEvent`` per timestamp by grouping ``stream()``."""
+        return bars_from_events(self.stream())
+
+    def stream_after(self, timestamp: int) -> Iterator[MarketEvent]:
+        """Yield the ``stream()`` events strictly after ``timestamp``."""
+        return dropwhile(lambda event: event.timestamp <= timestamp, self.stream())
+
+    def stream_bars_after(self, timestamp: int) -> Iterator[BarEvent]:
+        """Yield the ``stream_bars()`` bars strictly after ``timestamp``."""
+        return dropwhile(lambda bar: bar.timestamp <= timestamp, self.stream_bars())
+
     def set_date_range(
         self, start_date, end_date
     ) -> None:  # pragma: no cover - interface stub
         raise NotImplementedError("set_date_range() must be implemented")
 
 
+def _frozen(values: np.ndarray) -> np.ndarray:
+    values.setflags(write=False)
+    return values
+
+
+def _return_volatility(prices: np.ndarray) -> Optional[float]:
+    """Population std of simple returns, or ``None`` with fewer than 2 prices."""
+    if prices.shape[0] < 2:
+        return None
+    returns = np.diff(prices) / prices[:-1]
+    return float(np.std(returns, ddof=0))
+
+
+def estimate_volatility(
+    data_handler, symbol: str, end_timestamp: int, lookback: int
+) -> Optional[float]:
+    """Return-volatility over the last ``lookback`` closes up to ``end_timestamp``.
+
+    Uses the handler's cached ``recent_volatility`` when available and falls
+    back to ``get_recent_prices`` for third-party handlers.
+    """
+    method = getattr(data_handler, "recent_volatility", None)
+    if callable(method):
+        return method(symbol, end_timestamp, lookback)
+    prices = data_handler.get_recent_prices(symbol, end_timestamp, lookback)
+    return _return_volatility(np.asarray(prices, dtype=float))
+
+
+def bars_from_events(events: Iterable[MarketEvent]) -> Iterator[BarEvent]:
+    """Group a timestamp-ordered event stream into cross-sectional bars."""
+    timestamp: Optional[int] = None
+    symbols: List[str] = []
+    prices: List[float] = []
+    volumes: List[float] = []
+    for event in events:
+        if event.timestamp != timestamp:
+            if timestamp is not None:
+                yield BarEvent(
+                    timestamp,
+                    tuple(symbols),
+                    _frozen(np.asarray(prices, dtype=float)),
+                    _frozen(np.asarray(volumes, dtype=float)),
+                )
+            timestamp = event.timestamp
+            symbols, prices, volumes = [], [], []
+        symbols.append(event.symbol)
+        prices.append(event.price)
+        volumes.append(event.volume)
+    if timestamp is not None:
+        yield BarEvent(
+            timestamp,
+            tuple(symbols),
+            _frozen(np.asarray(prices, dtype=float)),
+            _frozen(np.asarray(volumes, dtype=float)),
+        )
+
+
+def _read_csv_c(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def _read_csv_pyarrow(path: Path) -> pd.DataFrame:
+    """Parse with ``pyarrow.csv``; floats are correctly rounded.
+
+    The index column is read as text and converted with ``pd.to_datetime`` so
+    timestamps match the C parser exactly. Float columns match
+    ``float_precision="round_trip"``, which can differ from pandas' default
+    C parser in the last ulp.
+    """
+
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "csv_engine='pyarrow' requires pyarrow (pip install pyarrow)"
+        ) from exc
+
+    with Path(path).open("r", encoding="utf-8", newline="") as handle:
+        header = next(csv.reader(handle), None)
+    if not header:
+        raise pd.errors.EmptyDataError(f"No columns to parse from file {path}")
+    index_col = header[0]
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(column_types={index_col: pa.string()}),
+    )
+    frame = table.to_pandas()
+    index = pd.DatetimeIndex(pd.to_datetime(frame.pop(index_col)))
+    frame.index = index.rename(index_col or None)
+    frame.columns = pd.Index(list(frame.columns))
+    return frame
+
+
+CSV_ENGINES = {"c": _read_csv_c, "pyarrow": _read_csv_pyarrow}
+
+
+def _read_price_csv(
+    path: Path, cache: PanelCache | None, engine: str = "c"
+) -> pd.DataFrame:
+    reader = CSV_ENGINES[engine]
+    if cache is not None:
+        return cache.read_csv(path, reader=reader, parser=engine)
+    return reader(path)
+
+
+def _check_csv_engine(engine: str) -> str:
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown csv_engine '{engine}'")
+    return engine
+
+
 class CsvDataHandler(DataHandler):
-    def __init__(self, csv_dir: Path, symbol: str, mode: str = "exact"):
+    def __init__(
+        self,
+        csv_dir: Path,
+        symbol: str,
+        mode: str = "exact",
+        cache_dir: str | Path | None = None,
+        csv_engine: str = "c",
+    ):
         self.csv_dir = csv_dir
         self.symbol = symbol
+        self.csv_engine = _check_csv_engine(csv_engine)
         self.file_path = self.csv_dir / f"{self.symbol}.csv"
+        # optional on-disk columnar cache (falls back to $MICROALPHA_DATA_CACHE)
+        self.cache = resolve_panel_cache(cache_dir)
         # load the full dataset here
         self.full_data = self._load_data()
         # hold the subset of data for a specific backtest period
         self.data = self.full_data
         self.mode = mode
+        self._price_index: Optional[_PriceIndex] = None
 
     def _load_data(self) -> Optional[pd.DataFrame]:
         """Loads the entire CSV into a dataframe, returns it."""
         try:
-            df = pd.read_csv(self.file_path, index_col=0, parse_dates=True)
+            df = _read_price_csv(self.file_path, self.cache, self.csv_engine)
         except FileNotFoundError as exc:
             raise FileNotFoundError(f"Data file not found: {self.file_path}") from exc
 
@@ -65,9 +205,18 @@ class CsvDataHandler(DataHandler):
     def stream(self) -> Iterator[MarketEvent]:
         """Yield ``MarketEvent`` instances ordered by timestamp."""
         if self.data is None:
-            return
+            return iter(())
+        return self._events(self.data.sort_index())
+
+    def stream_after(self, timestamp: int) -> Iterator[MarketEvent]:
+        if self.data is None:
+            return iter(())
+        frame = self.data.sort_index()
+        index = frame.index.astype("datetime64[ns]").view("i8")
+        return self._events(frame.iloc[_rows_before(index, _to_ns(timestamp)) :])
 
-        for row in self.data.sort_index().itertuples():
+    def _events(self, frame: pd.DataFrame) -> Iterator[MarketEvent]:
+        for row in frame.itertuples():
             ts_int = self._to_int_timestamp(row.Index)
             volume = float(getattr(row, "volume", 0.0))
             price = cast(float, row.close)
@@ -75,23 +224,18 @@ class CsvDataHandler(DataHandler):
 
     def get_latest_price(self, symbol: str, timestamp: int):
         """Return the price for ``symbol`` according to the configured lookup mode."""
-        if symbol != self.symbol or self.data is None:
+        index = self._current_index() if symbol == self.symbol else None
+        if index is None:
             return None
+        return index.lookup(_to_ns(timestamp), exact=self.mode == "exact")
 
-        ts = self._to_datetime(timestamp)
-
-        if self.mode == "exact":
-            try:
-                close_value = cast(float, self.data.loc[ts, "close"])
-                return close_value
-            except KeyError:
-                return None
-
-        idx = self.data.index.searchsorted(ts, side="right") - 1
-        if idx < 0:
+    def _current_index(self) -> Optional["_PriceIndex"]:
+        if self.data is None:
             return None
-        close_value = cast(float, self.data.iloc[idx]["close"])
-        return close_value
+        index = self._price_index
+        if index is None or index.source is not self.data:
+            index = self._price_index = _PriceIndex.from_frame(self.data)
+        return index
 
     def get_future_timestamps(
         self, start_timestamp: int, n: int, symbol: str | None = None
@@ -100,27 +244,44 @@ class CsvDataHandler(DataHandler):
         Gets the next `n` timestamps from the data starting after a given timestamp.
         Used by the TWAP execution handler to schedule child orders.
         """
-        if self.data is None or (symbol is not None and symbol != self.symbol):
+        if symbol is not None and symbol != self.symbol:
             return []
+        index = self._current_index()
+        if index is None:
+            return []
+        return _timestamps_after(index.timestamps, _to_ns(start_timestamp), n)
 
-        # Get the index of all future dates
-        ts = self._to_datetime(start_timestamp)
-        future_dates = self.data.index[self.data.index > ts]
-
-        # Return the next n dates, or fewer if we are at the end of the data
-        return [self._to_int_timestamp(idx) for idx in future_dates[:n]]
+    def last_timestamps(self, n: int, symbol: str | None = None) -> List[int]:
+        """Return the final ``n`` timestamps of the active date range."""
+        if symbol is not None and symbol != self.symbol:
+            return []
+        index = self._current_index()
+        if index is None:
+            return []
+        return _last_timestamps(index.timestamps, n)
 
     # --- Extensions for sizing/execution models ---
+    def price_history(
+        self, symbol: str, end_timestamp: int, lookback: int
+    ) -> np.ndarray:
+        """Read-only view of the last ``lookback`` closes at or before a timestamp."""
+        index = self._current_index() if symbol == self.symbol else None
+        if index is None:
+            return _EMPTY_HISTORY
+        return index.history(_to_ns(end_timestamp), lookback)
+
+    def recent_volatility(
+        self, symbol: str, end_timestamp: int, lookback: int
+    ) -> Optional[float]:
+        index = self._current_index() if symbol == self.symbol else None
+        if index is None:
+            return None
+        return index.volatility(_to_ns(end_timestamp), lookback)
+
     def get_recent_prices(
         self, symbol: str, end_timestamp: int, lookback: int
     ) -> List[float]:
-        if symbol != self.symbol or self.data is None or lookback <= 0:
-            return []
-        ts = self._to_datetime(end_timestamp)
-        df = self.data.loc[:ts]
-        if df.empty:
-            return []
-        return [float(x) for x in df["close"].iloc[-lookback:].tolist()]
+        return self.price_history(symbol, end_timestamp, lookback).tolist()
 
     def get_volume_at(self, symbol: str, timestamp: int) -> Optional[float]:
         if symbol != self.symbol or self.data is None:
@@ -160,24 +321,103 @@ class MultiCsvDataHandler(DataHandler):
 
     Streams `MarketEvent`s sorted by timestamp across all symbols. Each CSV is
     expected at `<csv_dir>/<symbol>.csv` with a datetime index and a `close` column.
+
+    ``stream_mode="dense"`` precomputes a T×N price matrix once per date range
+    and streams events by row lookups; ``"merge"`` (default) walks the cached
+    union timeline advancing per-symbol cursors.
+
+    With ``lazy=True`` construction only records each symbol's time span:
+    from the panel cache entry when one is fresh, otherwise from the first and
+    last rows of the CSV (the whole index column only when the first row is
+    later than the last). Rows in between are assumed to lie within those
+    bounds. Files are parsed on ``set_date_range`` (or first access) and only
+    for symbols whose span overlaps the window. ``memory_budget_mb`` bounds
+    the resident ``full_frames``: symbols outside the active window are
+    evicted least-recently-used first once the budget is exceeded.
+
+    ``load_workers`` parses symbol files on a bounded thread pool; results are
+    assembled in symbol order, so they match serial loading. ``csv_engine``
+    selects the parser from ``CSV_ENGINES`` (``"c"`` or optional ``"pyarrow"``).
+
+    Each date range is resolved once into ``[lo, hi)`` row offsets per symbol
+    and cached (see ``WINDOW_CACHE_SIZE``); states, price indexes and the dense
+    panel are zero-copy views into immutable per-symbol arrays, so revisiting
+    a fold window does no slicing or array conversion.
     """
 
-    def __init__(self, csv_dir: Path, symbols: Sequence[str], mode: str = "ffill"):
+    STREAM_MODES = ("merge", "dense")
+    WINDOW_CACHE_SIZE = 8
+
+    def __init__(
+        self,
+        csv_dir: Path,
+        symbols: Sequence[str],
+        mode: str = "ffill",
+        cache_dir: str | Path | None = None,
+        stream_mode: str = "merge",
+        lazy: bool = False,
+        memory_budget_mb: float | None = None,
+        load_workers: int = 1,
+        csv_engine: str = "c",
+    ):
+        if stream_mode not in self.STREAM_MODES:
+            raise ValueError(f"Unknown stream_mode '{stream_mode}'")
+        if memory_budget_mb is not None and memory_budget_mb < 0:
+            raise ValueError("memory_budget_mb must be non-negative")
+        if int(load_workers) < 1:
+            raise ValueError("load_workers must be at least 1")
+        self.load_workers = int(load_workers)
+        self.csv_engine = _check_csv_engine(csv_engine)
         self.csv_dir = csv_dir
         self.symbols = list(symbols)
         self.mode = mode
-        self.full_frames: Dict[str, Optional[pd.DataFrame]] = {
-            s: self._load_single(s) for s in self.symbols
-        }
-        self.frames: Dict[str, Optional[pd.DataFrame]] = dict(self.full_frames)
+        self.stream_mode = stream_mode
+        self.lazy = bool(lazy)
+        self.memory_budget_mb = memory_budget_mb
+        self.cache = resolve_panel_cache(cache_dir)
+        self._spans: Dict[str, Optional[tuple[int, int]]] = {}
+        self._nbytes: Dict[str, int] = {}
+        self._arrays: Dict[str, _Arrays] = {}
+        self._windows: "OrderedDict[tuple, _FoldWindow]" = OrderedDict()
+        self._window: Optional[_FoldWindow] = None
+        self.full_frames: "OrderedDict[str, Optional[pd.DataFrame]]" = OrderedDict()
+        if self.lazy:
+            for sym in self.symbols:
+                path = Path(self.csv_dir) / f"{sym}.csv"
+                if not path.exists():
+                    raise FileNotFoundError(f"Data file not found: {path}")
+                span = self.cache.span(path, self.csv_engine) if self.cache else None
+                self._spans[sym] = span or _csv_time_span(path)
+        else:
+            for sym, df in zip(self.symbols, self._load_many(self.symbols)):
+                self.full_frames[sym] = df
         # Compatibility flags with single-asset handler
         self.full_data: Optional[pd.DataFrame] = None
         self.data: Optional[pd.DataFrame] = pd.DataFrame()
 
+    @property
+    def frames(self) -> Dict[str, Optional[pd.DataFrame]]:
+        return self._active_window().frames
+
+    def _active_window(self) -> "_FoldWindow":
+        if self._window is None:
+            self.set_date_range(None, None)
+        return cast(_FoldWindow, self._window)
+
+    def _load_many(self, symbols: Sequence[str]) -> List[Optional[pd.DataFrame]]:
+        """Parse ``symbols`` on up to ``load_workers`` threads, in input order."""
+        if self.load_workers == 1 or len(symbols) < 2:
+            return [self._load_single(sym) for sym in symbols]
+        workers = min(self.load_workers, len(symbols))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="microalpha-csv"
+        ) as pool:
+            return list(pool.map(self._load_single, symbols))
+
     def _load_single(self, symbol: str) -> Optional[pd.DataFrame]:
         path = self.csv_dir / f"{symbol}.csv"
         try:
-            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            df = _read_price_csv(path, self.cache, self.csv_engine)
         except FileNotFoundError as exc:
             raise FileNotFoundError(f"Data file not found: {path}") from exc
         if df is None or df.empty:
@@ -186,55 +426,208 @@ class MultiCsvDataHandler(DataHandler):
             raise ValueError(f"Expected 'close' column in {path}")
         if not isinstance(df.index, pd.DatetimeIndex):
             raise TypeError("CSV index must be datetimes (parsed via parse_dates=True)")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
         return df
 
     def set_date_range(self, start_date, end_date) -> None:
-        for sym, df in self.full_frames.items():
+        if self.lazy and self._load_window(start_date, end_date):
+            # Resident symbols changed, so cached offsets may be stale.
+            self._windows.clear()
+        key = (start_date, end_date)
+        try:
+            window = self._windows.get(key)
+            cacheable = True
+        except TypeError:  # unhashable bounds are never cached
+            window, cacheable = None, False
+        if window is None:
+            window = self._slice_window(start_date, end_date)
+            if cacheable:
+                self._windows[key] = window
+                if len(self._windows) > self.WINDOW_CACHE_SIZE:
+                    self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+        self._window = window
+
+    def _slice_window(self, start_date, end_date) -> "_FoldWindow":
+        bounds: Dict[str, tuple[int, int]] = {}
+        frames: Dict[str, Optional[pd.DataFrame]] = {}
+        for sym in self.symbols:
+            df = self.full_frames.get(sym)
             if df is None:
-                self.frames[sym] = None
+                frames[sym] = None
+                continue
+            # Same label semantics as df.loc[start_date:end_date].
+            lo, hi, _ = df.index.slice_indexer(start_date, end_date).indices(len(df))
+            hi = max(lo, hi)
+            bounds[sym] = (lo, hi)
+            frames[sym] = df.iloc[lo:hi]
+        return _FoldWindow(bounds, frames)
+
+    def _symbol_arrays(self, symbol: str) -> "_Arrays":
+        """Immutable timestamps/close/volume arrays for the resident frame.
+
+        ``volumes`` is ``None`` when the CSV has no ``volume`` column.
+        """
+        arrays = self._arrays.get(symbol)
+        if arrays is None:
+            df = self.full_frames[symbol]
+            assert df is not None
+            stamps = df.index.astype("datetime64[ns]").to_numpy()
+            timestamps = np.ascontiguousarray(stamps.view(np.int64))
+            prices = np.ascontiguousarray(df["close"].to_numpy(dtype=float))
+            volumes = None
+            if "volume" in df.columns:
+                volumes = _frozen(
+                    np.ascontiguousarray(
+                        pd.to_numeric(df["volume"], errors="coerce").to_numpy(
+                            dtype=float, na_value=np.nan
+                        )
+                    )
+                )
+            arrays = self._arrays[symbol] = (
+                _frozen(timestamps),
+                _frozen(prices),
+                volumes,
+            )
+        return arrays
+
+    def _window_arrays(self, window: "_FoldWindow", symbol: str) -> Optional["_Arrays"]:
+        bounds = window.bounds.get(symbol)
+        if bounds is None:
+            return None
+        lo, hi = bounds
+        timestamps, prices, volumes = self._symbol_arrays(symbol)
+        return (
+            timestamps[lo:hi],
+            prices[lo:hi],
+            None if volumes is None else volumes[lo:hi],
+        )
+
+    def _load_window(self, start_date, end_date) -> bool:
+        needed = []
+        for sym in self.symbols:
+            span = self._spans.get(sym)
+            if span is not None and not _span_overlaps(span, start_date, end_date):
+                continue
+            needed.append(sym)
+
+        missing = [sym for sym in needed if sym not in self.full_frames]
+        for sym in needed:
+            if sym in self.full_frames:
+                self.full_frames.move_to_end(sym)
+        for sym, df in zip(missing, self._load_many(missing)):
+            self.full_frames[sym] = df
+            self._nbytes[sym] = (
+                0 if df is None else int(df.memory_usage(index=True).sum())
+            )
+        return self._evict(set(needed)) or bool(missing)
+
+    def _evict(self, keep: set[str]) -> bool:
+        if self.memory_budget_mb is None:
+            return False
+        evicted = False
+        budget = int(self.memory_budget_mb * 1024 * 1024)
+        resident = sum(self._nbytes.values())
+        for sym in list(self.full_frames):
+            if resident <= budget:
+                break
+            if sym in keep:
+                continue
+            resident -= self._nbytes.pop(sym, 0)
+            del self.full_frames[sym]
+            self._arrays.pop(sym, None)
+            evicted = True
+        return evicted
+
+    def union_timestamps(self) -> np.ndarray:
+        """Sorted int64 union timeline of the active window (cached, read-only)."""
+        window = self._window or self._active_window()
+        if window.union is None:
+            if window.dense is not None:
+                union = window.dense.timestamps
             else:
-                self.frames[sym] = df.loc[start_date:end_date]
+                arrays = [
+                    arrays[0]
+                    for arrays in (
+                        self._window_arrays(window, sym) for sym in self.symbols
+                    )
+                    if arrays is not None
+                ]
+                union = (
+                    np.unique(np.concatenate(arrays))
+                    if arrays
+                    else np.empty(0, dtype=np.int64)
+                )
+            window.union = _frozen(union)
+        return window.union
 
     def _iter_union_index(self) -> Iterator[pd.Timestamp]:
-        arrays = [
-            df.index.astype("datetime64[ns]").view("i8")
-            for df in self.frames.values()
-            if df is not None
-        ]
-        for ts_int in self._merge_timestamp_arrays(arrays):
+        for ts_int in self.union_timestamps().tolist():
             yield pd.Timestamp(ts_int, unit="ns")
 
-    @staticmethod
-    def _merge_timestamp_arrays(arrays: Sequence[np.ndarray]) -> Iterator[int]:
-        iterables = [iter(arr) for arr in arrays if len(arr)]
-        if not iterables:
-            return
-        last: Optional[int] = None
-        for value in heapq.merge(*iterables):
-            ts_int = int(value)
-            if last != ts_int:
-                last = ts_int
-                yield ts_int
-
     def _build_states(self) -> Dict[str, "_SymbolState"]:
+        window = self._active_window()
         states: Dict[str, "_SymbolState"] = {}
         for sym in self.symbols:
-            df = self.frames.get(sym)
-            if df is None or df.empty:
+            arrays = self._window_arrays(window, sym)
+            if arrays is None or not arrays[0].size:
                 continue
-            timestamps = df.index.astype("datetime64[ns]").view("i8")
-            prices = df["close"].to_numpy(dtype=float)
-            states[sym] = _SymbolState(timestamps=timestamps, prices=prices)
+            states[sym] = _SymbolState(*arrays)
         return states
 
+    def dense_panel(self) -> Optional["_DensePanel"]:
+        """Return the cached T×N panel for the active date range."""
+        window = self._active_window()
+        if window.dense is None:
+            states = self._build_states()
+            if not states:
+                return None
+            window.dense = _DensePanel.build(
+                [sym for sym in self.symbols if sym in states],
+                states,
+                self.mode,
+                timestamps=self.union_timestamps(),
+            )
+        return window.dense
+
+    def stream_bars(self) -> Iterator[BarEvent]:
+        """Yield one array-backed snapshot per union timestamp."""
+        return self._bars_from(None)
+
+    def stream_bars_after(self, timestamp: int) -> Iterator[BarEvent]:
+        return self._bars_from(_to_ns(timestamp))
+
+    def _bars_from(self, after: Optional[int]) -> Iterator[BarEvent]:
+        if not self.frames:
+            return
+        panel = self.dense_panel()
+        if panel is not None:
+            yield from panel.bars(_rows_before(panel.timestamps, after))
+
     def stream(self) -> Iterator[MarketEvent]:
+        return self._events_from(None)
+
+    def stream_after(self, timestamp: int) -> Iterator[MarketEvent]:
+        return self._events_from(_to_ns(timestamp))
+
+    def _events_from(self, after: Optional[int]) -> Iterator[MarketEvent]:
         if not self.frames:
             return
+        if self.stream_mode == "dense":
+            panel = self.dense_panel()
+            if panel is not None:
+                yield from panel.events(_rows_before(panel.timestamps, after))
+            return
         states = self._build_states()
         if not states:
             return
-        arrays = [state.timestamps for state in states.values()]
-        for ts_int in self._merge_timestamp_arrays(arrays):
+        union = self.union_timestamps()
+        if after is not None:
+            for resumed in states.values():
+                resumed.seek(after)
+        for ts_int in union[_rows_before(union, after) :].tolist():
             for sym in self.symbols:
                 state = states.get(sym)
                 if state is None:
@@ -242,84 +635,328 @@ class MultiCsvDataHandler(DataHandler):
                 price = state.price_at(ts_int, mode=self.mode)
                 if price is None:
                     continue
-                yield MarketEvent(ts_int, sym, price, 0.0)
+                yield MarketEvent(ts_int, sym, price, state.volume_at(ts_int))
 
-    def get_latest_price(self, symbol: str, timestamp: int):
-        df = self.frames.get(symbol)
+    def _price_index(self, symbol: str) -> Optional["_PriceIndex"]:
+        window = self._window or self._active_window()
+        df = window.frames.get(symbol)
         if df is None:
             return None
-        ts = CsvDataHandler._to_datetime(timestamp)
-        return self._lookup_price(df, ts)
+        index = window.price_indexes.get(symbol)
+        if index is None or index.source is not df:
+            arrays = self._window_arrays(window, symbol)
+            if arrays is None:
+                return None
+            index = window.price_indexes[symbol] = _PriceIndex(df, *arrays)
+        return index
+
+    def get_latest_price(self, symbol: str, timestamp: int):
+        index = self._price_index(symbol)
+        if index is None:
+            return None
+        return index.lookup(_to_ns(timestamp), exact=self.mode == "exact")
+
+    def price_row(
+        self, timestamp: int
+    ) -> Optional[tuple[List[str], np.ndarray, np.ndarray]]:
+        """Return the dense panel's symbols, latest prices and priced mask.
+
+        Prices match ``get_latest_price`` for each panel symbol, with NaN and a
+        False mask entry where it would return ``None``; both are read-only
+        views. Returns ``None`` unless the panel is already built, so callers
+        fall back to per-symbol lookups instead of materialising it.
+        """
+        panel = (self._window or self._active_window()).dense
+        if panel is None:
+            return None
+        prices, priced = panel.price_row(_to_ns(timestamp), exact=self.mode == "exact")
+        return panel.symbols, prices, priced
 
     def get_future_timestamps(
         self, start_timestamp: int, n: int, symbol: str | None = None
     ) -> List[int]:
         # Execution schedules must use events actually observed for the order symbol.
-        ts = CsvDataHandler._to_datetime(start_timestamp)
-        if symbol is not None:
-            frame = self.frames.get(symbol)
-            if frame is None:
-                return []
-            future = frame.index[frame.index > ts]
-            return [CsvDataHandler._to_int_timestamp(t) for t in future[:n]]
-        union = list(self._iter_union_index())
-        idx = pd.Index(union).searchsorted(ts, side="right")
-        return [CsvDataHandler._to_int_timestamp(t) for t in union[idx : idx + n]]
-
-    def _lookup_price(self, df: pd.DataFrame, ts: pd.Timestamp) -> Optional[float]:
-        if self.mode == "exact":
-            try:
-                return cast(float, df.loc[ts, "close"])  # type: ignore[index]
-            except KeyError:
-                return None
-        idx = df.index.searchsorted(ts, side="right") - 1
-        if idx < 0:
-            return None
-        return cast(float, df.iloc[idx]["close"])  # type: ignore[index]
+        if symbol is None:
+            return _timestamps_after(
+                self.union_timestamps(), _to_ns(start_timestamp), n
+            )
+        window = self._window or self._active_window()
+        arrays = self._window_arrays(window, symbol)
+        if arrays is None:
+            return []
+        return _timestamps_after(arrays[0], _to_ns(start_timestamp), n)
+
+    def last_timestamps(self, n: int, symbol: str | None = None) -> List[int]:
+        """Return the final ``n`` timestamps of the active window.
+
+        With ``symbol`` the timestamps are that symbol's own prints, matching
+        ``get_future_timestamps``.
+        """
+        if symbol is None:
+            return _last_timestamps(self.union_timestamps(), n)
+        window = self._window or self._active_window()
+        arrays = self._window_arrays(window, symbol)
+        if arrays is None:
+            return []
+        return _last_timestamps(arrays[0], n)
 
     # --- Extensions for sizing/execution models ---
+    def price_history(
+        self, symbol: str, end_timestamp: int, lookback: int
+    ) -> np.ndarray:
+        """Read-only view of the last ``lookback`` closes at or before a timestamp."""
+        index = self._price_index(symbol)
+        if index is None:
+            return _EMPTY_HISTORY
+        return index.history(_to_ns(end_timestamp), lookback)
+
+    def recent_volatility(
+        self, symbol: str, end_timestamp: int, lookback: int
+    ) -> Optional[float]:
+        """Cached return-volatility of ``price_history`` (see ``_PriceIndex``)."""
+        index = self._price_index(symbol)
+        if index is None:
+            return None
+        return index.volatility(_to_ns(end_timestamp), lookback)
+
     def get_recent_prices(
         self, symbol: str, end_timestamp: int, lookback: int
     ) -> List[float]:
-        df = self.frames.get(symbol)
-        if df is None or lookback <= 0:
-            return []
-        ts = CsvDataHandler._to_datetime(end_timestamp)
-        window = df.loc[:ts]
-        if window is None or window.empty:
-            return []
-        series = window["close"].iloc[-lookback:]
-        return [float(x) for x in series.tolist()]
+        return self.price_history(symbol, end_timestamp, lookback).tolist()
 
     def get_volume_at(self, symbol: str, timestamp: int) -> Optional[float]:
-        df = self.frames.get(symbol)
-        if df is None:
+        index = self._price_index(symbol)
+        if index is None:
             return None
-        ts = CsvDataHandler._to_datetime(timestamp)
-        if "volume" not in df.columns:
+        return index.volume_at(_to_ns(timestamp))
+
+
+def _csv_time_span(path: Path) -> Optional[tuple[int, int]]:
+    """Return the earliest/latest index timestamps of a CSV without parsing it.
+
+    Reads the header, the first data row and the tail of the file, treating
+    the file as ordered between those rows. Files whose first row is later
+    than their last (newest-first exports) fall back to parsing the index
+    column. Returns ``None`` when the bounds cannot be determined, which
+    callers treat as "always load".
+    """
+
+    try:
+        with path.open("rb") as handle:
+            header = handle.readline()
+            first = handle.readline()
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            handle.seek(max(0, size - 4096))
+            tail = handle.read().splitlines()
+    except OSError:
+        return None
+    last = next((line for line in reversed(tail) if line.strip()), b"")
+    if not header.strip() or not first.strip() or not last:
+        return None
+    lo, hi = _row_timestamp(first), _row_timestamp(last)
+    if lo is None or hi is None:
+        return None
+    if lo <= hi:
+        return lo, hi
+    return _index_column_span(path)
+
+
+def _row_timestamp(line: bytes) -> Optional[int]:
+    field = line.decode("utf-8", errors="replace").split(",", 1)[0]
+    try:
+        ts = pd.Timestamp(field.strip().strip('"'))
+    except (ValueError, TypeError):
+        return None
+    if ts is pd.NaT or ts.tzinfo is not None:
+        return None
+    return int(ts.value)
+
+
+def _index_column_span(path: Path) -> Optional[tuple[int, int]]:
+    """Exact bounds from the parsed index column, for files read out of order."""
+
+    try:
+        column = pd.read_csv(path, usecols=[0]).iloc[:, 0]
+        stamps = pd.to_datetime(column, errors="coerce")
+    except (OSError, ValueError, TypeError, IndexError):
+        return None
+    if stamps.empty or stamps.isna().any() or stamps.dt.tz is not None:
+        return None
+    return int(stamps.min().value), int(stamps.max().value)
+
+
+def _span_overlaps(span: tuple[int, int], start_date, end_date) -> bool:
+    """Whether ``df.loc[start_date:end_date]`` can select rows within ``span``.
+
+    Slices the span's two bounds with the same label semantics as the window
+    itself, so partial-string and intraday bounds resolve identically.
+    """
+    bounds = pd.DatetimeIndex(np.asarray(span, dtype="datetime64[ns]"))
+    before, through, _ = bounds.slice_indexer(start_date, end_date).indices(2)
+    # ``before`` bounds precede the window, ``through`` are at or before its end.
+    return before < 2 and through > 0
+
+
+def _timestamps_after(timestamps: np.ndarray, ts_int: int, n: int) -> List[int]:
+    start = int(np.searchsorted(timestamps, ts_int, side="right"))
+    return timestamps[start : start + max(int(n), 0)].tolist()
+
+
+def _last_timestamps(timestamps: np.ndarray, n: int) -> List[int]:
+    n = max(int(n), 0)
+    return timestamps[timestamps.shape[0] - n :].tolist() if n else []
+
+
+def _rows_before(timestamps: np.ndarray, after: Optional[int]) -> int:
+    """Number of leading timestamps at or before ``after`` (0 for ``None``)."""
+    if after is None:
+        return 0
+    return int(np.searchsorted(timestamps, after, side="right"))
+
+
+def _to_ns(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return CsvDataHandler._to_int_timestamp(value)
+
+
+class _PriceIndex:
+    """Sorted int64 nanosecond timestamps with parallel close prices.
+
+    Lookups keep a cursor at the last answered position so the common
+    forward-only access pattern (one query per market event) advances in O(1)
+    and only falls back to ``np.searchsorted`` on jumps or backward queries.
+    Return-volatility is memoised per lookback against the window end, so
+    repeated sizing queries within a bar reuse one estimate.
+    """
+
+    __slots__ = ("source", "timestamps", "prices", "volumes", "_cursor", "_vol_cache")
+
+    def __init__(
+        self,
+        source,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: Optional[np.ndarray] = None,
+    ):
+        self.source = source
+        self.timestamps = timestamps
+        self.prices = prices
+        self.volumes = volumes
+        # number of timestamps <= the most recent query
+        self._cursor = 0
+        # lookback -> (window end position, volatility)
+        self._vol_cache: Dict[int, tuple[int, Optional[float]]] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "_PriceIndex":
+        frame = df if df.index.is_monotonic_increasing else df.sort_index()
+        timestamps = frame.index.astype("datetime64[ns]").view("i8")
+        prices = frame["close"].to_numpy(dtype=float).view()
+        return cls(df, np.ascontiguousarray(timestamps), _frozen(prices))
+
+    def position(self, ts_int: int) -> int:
+        """Return the number of timestamps ``<= ts_int``."""
+        timestamps = self.timestamps
+        pos = self._cursor
+        size = timestamps.shape[0]
+        if pos > 0 and timestamps.item(pos - 1) > ts_int:
+            pos = int(np.searchsorted(timestamps, ts_int, side="right"))
+        elif pos < size and timestamps.item(pos) <= ts_int:
+            if pos + 1 == size or timestamps.item(pos + 1) > ts_int:
+                pos += 1
+            else:
+                pos = int(np.searchsorted(timestamps, ts_int, side="right"))
+        self._cursor = pos
+        return pos
+
+    def lookup(self, ts_int: int, exact: bool) -> Optional[float]:
+        pos = self.position(ts_int)
+        if pos == 0:
             return None
-        try:
-            value = df.loc[ts, "volume"]  # type: ignore[index]
-            if isinstance(value, pd.Series):
-                if value.empty:
-                    return None
-                value = value.iloc[0]
-            if isinstance(value, numbers.Real):
-                return float(value)
+        if exact and self.timestamps.item(pos - 1) != ts_int:
             return None
-        except KeyError:
+        return self.prices.item(pos - 1)
+
+    def history(self, ts_int: int, lookback: int) -> np.ndarray:
+        if lookback <= 0:
+            return _EMPTY_HISTORY
+        pos = self.position(ts_int)
+        return self.prices[max(0, pos - lookback) : pos]
+
+    def volatility(self, ts_int: int, lookback: int) -> Optional[float]:
+        pos = self.position(ts_int)
+        cached = self._vol_cache.get(lookback)
+        if cached is not None and cached[0] == pos:
+            return cached[1]
+        vol = (
+            _return_volatility(self.prices[max(0, pos - lookback) : pos])
+            if lookback > 0
+            else None
+        )
+        self._vol_cache[lookback] = (pos, vol)
+        return vol
+
+    def volume_at(self, ts_int: int) -> Optional[float]:
+        """Volume of the first bar stamped exactly ``ts_int``, else ``None``."""
+        if self.volumes is None:
             return None
+        pos = self.position(ts_int) - 1
+        timestamps = self.timestamps
+        if pos < 0 or timestamps.item(pos) != ts_int:
+            return None
+        while pos > 0 and timestamps.item(pos - 1) == ts_int:
+            pos -= 1
+        return self.volumes.item(pos)
+
+
+_EMPTY_HISTORY = _frozen(np.empty(0, dtype=float))
+
+_Arrays = tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+
+class _FoldWindow:
+    """Cached view of one date range: per-symbol ``[lo, hi)`` row offsets."""
+
+    __slots__ = ("bounds", "frames", "price_indexes", "dense", "union")
+
+    def __init__(
+        self,
+        bounds: Dict[str, tuple[int, int]],
+        frames: Dict[str, Optional[pd.DataFrame]],
+    ):
+        self.bounds = bounds
+        self.frames = frames
+        self.price_indexes: Dict[str, _PriceIndex] = {}
+        self.dense: Optional[_DensePanel] = None
+        self.union: Optional[np.ndarray] = None
 
 
 class _SymbolState:
-    __slots__ = ("timestamps", "prices", "position", "last_ts", "last_price")
+    __slots__ = (
+        "timestamps",
+        "prices",
+        "volumes",
+        "position",
+        "last_ts",
+        "last_price",
+        "last_volume",
+    )
 
-    def __init__(self, timestamps: np.ndarray, prices: np.ndarray):
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: Optional[np.ndarray] = None,
+    ):
         self.timestamps = timestamps
         self.prices = prices
+        self.volumes = volumes
         self.position = 0
         self.last_ts: Optional[int] = None
         self.last_price: Optional[float] = None
+        self.last_volume = 0.0
 
     def _advance(self, ts_int: int) -> None:
         size = self.timestamps.shape[0]
@@ -328,8 +965,26 @@ class _SymbolState:
             current_price = float(self.prices[self.position])
             self.last_ts = current_ts
             self.last_price = current_price
+            if self.volumes is not None:
+                self.last_volume = float(self.volumes[self.position])
             self.position += 1
 
+    def seek(self, ts_int: int) -> None:
+        """Jump to the state ``_advance(ts_int)`` would reach from the start."""
+        pos = int(np.searchsorted(self.timestamps, ts_int, side="right"))
+        self.position = pos
+        if pos:
+            self.last_ts = int(self.timestamps[pos - 1])
+            self.last_price = float(self.prices[pos - 1])
+            if self.volumes is not None:
+                self.last_volume = float(self.volumes[pos - 1])
+
+    def volume_at(self, ts_int: int) -> float:
+        """Volume traded at ``ts_int``; forward-filled prices carry ``0.0``."""
+        if self.last_ts == ts_int:
+            return self.last_volume
+        return 0.0
+
     def price_at(self, ts_int: int, mode: str) -> Optional[float]:
         self._advance(ts_int)
         if mode == "exact":
@@ -337,3 +992,123 @@ class _SymbolState:
                 return self.last_price
             return None
         return self.last_price
+
+
+class _DensePanel:
+    """Union timeline with a T×N price matrix and an emit mask.
+
+    Column order follows the handler's symbol order so rows stream events in
+    exactly the order produced by the merge path. ``observed`` marks the cells
+    where the symbol actually printed; in ``ffill`` mode ``emit`` also covers
+    forward-filled cells.
+    """
+
+    __slots__ = ("timestamps", "symbols", "prices", "volumes", "emit", "observed")
+
+    CHUNK_ROWS = 4096
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        symbols: List[str],
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        emit: np.ndarray,
+        observed: np.ndarray,
+    ):
+        self.timestamps = timestamps
+        self.symbols = symbols
+        self.prices = prices
+        self.volumes = volumes
+        self.emit = emit
+        self.observed = observed
+
+    @classmethod
+    def build(
+        cls,
+        symbols: List[str],
+        states: Dict[str, "_SymbolState"],
+        mode: str,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> "_DensePanel":
+        if timestamps is None:
+            timestamps = np.unique(
+                np.concatenate([states[sym].timestamps for sym in symbols])
+            )
+        timestamps = timestamps.astype(np.int64, copy=False)
+        num_rows = timestamps.shape[0]
+        observed = np.full((num_rows, len(symbols)), -1, dtype=np.int64)
+        for col, sym in enumerate(symbols):
+            ts = states[sym].timestamps
+            # keep the last observation when a timestamp repeats
+            last = np.ones(ts.shape[0], dtype=bool)
+            last[:-1] = ts[1:] != ts[:-1]
+            rows = np.searchsorted(timestamps, ts[last])
+            observed[rows, col] = np.flatnonzero(last)
+
+        if mode == "exact":
+            source = observed
+        else:
+            row_ids = np.where(observed >= 0, np.arange(num_rows)[:, None], -1)
+            np.maximum.accumulate(row_ids, axis=0, out=row_ids)
+            cols = np.arange(len(symbols))[None, :]
+            source = np.where(row_ids >= 0, observed[row_ids, cols], -1)
+
+        prices = np.full(source.shape, np.nan, dtype=float)
+        # volume only on rows where the symbol actually printed
+        volumes = np.zeros(source.shape, dtype=float)
+        for col, sym in enumerate(symbols):
+            mask = source[:, col] >= 0
+            prices[mask, col] = states[sym].prices[source[mask, col]]
+            sym_volumes = states[sym].volumes
+            if sym_volumes is not None:
+                seen = observed[:, col] >= 0
+                volumes[seen, col] = sym_volumes[observed[seen, col]]
+        return cls(timestamps, symbols, prices, volumes, source >= 0, observed >= 0)
+
+    def price_row(self, ts_int: int, exact: bool) -> tuple[np.ndarray, np.ndarray]:
+        """Prices and priced mask as of ``ts_int``.
+
+        In ``exact`` mode only a row stamped at ``ts_int`` is priced.
+        """
+        row = int(np.searchsorted(self.timestamps, ts_int, side="right")) - 1
+        if row < 0 or (exact and self.timestamps.item(row) != ts_int):
+            num_cols = len(self.symbols)
+            return _frozen(np.full(num_cols, np.nan)), _frozen(np.zeros(num_cols, bool))
+        return _frozen(self.prices[row]), _frozen(self.emit[row])
+
+    def events(self, first_row: int = 0) -> Iterator[MarketEvent]:
+        symbols = self.symbols
+        for start in range(first_row, self.timestamps.shape[0], self.CHUNK_ROWS):
+            stop = start + self.CHUNK_ROWS
+            rows, cols = np.nonzero(self.emit[start:stop])
+            ts_values = self.timestamps[start:stop][rows].tolist()
+            price_values = self.prices[start:stop][rows, cols].tolist()
+            volume_values = self.volumes[start:stop][rows, cols].tolist()
+            for ts_int, col, price, volume in zip(
+                ts_values, cols.tolist(), price_values, volume_values
+            ):
+                yield MarketEvent(ts_int, symbols[col], price, volume)
+
+    def bars(self, first_row: int = 0) -> Iterator[BarEvent]:
+        all_symbols = tuple(self.symbols)
+        num_cols = len(all_symbols)
+        timestamps = self.timestamps[first_row:].tolist()
+        for row, ts_int in enumerate(timestamps, start=first_row):
+            cols = np.flatnonzero(self.emit[row])
+            if cols.size == 0:
+                continue
+            if cols.size == num_cols:
+                symbols = all_symbols
+                prices = self.prices[row].copy()
+                volumes = self.volumes[row].copy()
+            else:
+                symbols = tuple(all_symbols[col] for col in cols.tolist())
+                prices = self.prices[row, cols]
+                volumes = self.volumes[row, cols]
+            yield BarEvent(
+                ts_int,
+                symbols,
+                _frozen(prices),
+                _frozen(volumes),
+            )
@@ -0,0 +1,241 @@
+"""Persistent columnar cache for per-symbol CSV price files.
+
+Parsing hundreds of CSVs with ``pd.read_csv(..., parse_dates=True)`` dominates
+start-up time on large panels. The cache stores each parsed file as raw ``.npy``
+arrays (an ``int64`` index in the frame's datetime unit plus one
+``int64``/``float64`` array per column) that are loaded with ``mmap_mode="r"``
+and wrapped without copying, so the frame stays backed by the mapped files.
+
+Each entry lives in a directory named after the source file and a SHA-1 of its
+resolved path. ``meta.json`` records the source's size, modification time and
+SHA-256, which are checked on every load: a size change or a content change
+behind a new mtime rebuilds the entry. It also records the CSV parser that
+produced the entry (switching parsers rebuilds it rather than mixing results),
+the exact index span used by lazy loading, and the ``CACHE_SCHEMA_VERSION``
+it was written with; entries from other schema versions are ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+CACHE_ENV_VAR = "MICROALPHA_DATA_CACHE"
+CACHE_SCHEMA_VERSION = 2
+
+_CACHEABLE_KINDS = {"i": "int64", "f": "float64"}
+
+
+def resolve_panel_cache(
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> "PanelCache | None":
+    """Return a cache rooted at ``cache_dir`` or ``$MICROALPHA_DATA_CACHE``."""
+
+    root = cache_dir if cache_dir is not None else os.getenv(CACHE_ENV_VAR)
+    if not root:
+        return None
+    return PanelCache(Path(os.path.expandvars(os.path.expanduser(str(root)))))
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PanelCache:
+    """Directory of memory-mappable column arrays keyed by source file."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        # counters are shared by parallel loader threads
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def entry_dir(self, source: Path) -> Path:
+        resolved = str(Path(source).resolve())
+        key = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
+        return self.root / f"{Path(source).stem}-{key}"
+
+    def read_csv(
+        self,
+        path: Path,
+        reader: Callable[[Path], pd.DataFrame] | None = None,
+        parser: str = "c",
+    ) -> pd.DataFrame:
+        """Load ``path`` from the cache, rebuilding the entry when it is stale.
+
+        ``reader`` parses the CSV on a miss (default ``pd.read_csv``) and
+        ``parser`` names it so entries from different parsers never mix.
+        """
+
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(path)
+        cached = self.load(path, parser=parser)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+        with self._lock:
+            self.misses += 1
+        if reader is None:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        else:
+            df = reader(path)
+        self.store(path, df, parser=parser)
+        return df
+
+    # ------------------------------------------------------------------
+    def load(self, source: Path, parser: str = "c") -> Optional[pd.DataFrame]:
+        """Return the cached frame for ``source`` or ``None`` if missing/stale."""
+
+        entry = self.entry_dir(source)
+        meta = self._fresh_meta(source, parser)
+        if meta is None:
+            return None
+        try:
+            return self._frame_from_entry(entry, meta)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def span(self, source: Path, parser: str = "c") -> Optional[tuple[int, int]]:
+        """Return the cached ``(earliest, latest)`` index timestamps in ns.
+
+        Reads only ``meta.json``; ``None`` when the entry is missing or stale
+        or the index has no usable bounds.
+        """
+
+        meta = self._fresh_meta(source, parser)
+        span = None if meta is None else meta.get("span_ns")
+        if not span:
+            return None
+        return int(span[0]), int(span[1])
+
+    def _fresh_meta(self, source: Path, parser: str) -> Optional[Dict[str, Any]]:
+        entry = self.entry_dir(source)
+        meta = self._read_meta(entry)
+        if meta is None:
+            return None
+        if meta.get("parser", "c") != parser:
+            return None
+        stat = Path(source).stat()
+        if meta.get("size") != stat.st_size:
+            return None
+        if meta.get("mtime_ns") != stat.st_mtime_ns:
+            # Touched but possibly unchanged: fall back to the content hash.
+            if meta.get("sha256") != _file_sha256(Path(source)):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            self._write_json(entry / "meta.json", meta)
+        return meta
+
+    def store(self, source: Path, df: pd.DataFrame, parser: str = "c") -> bool:
+        """Persist ``df`` for ``source``; returns ``False`` when not cacheable."""
+
+        index = df.index
+        if not isinstance(index, pd.DatetimeIndex) or index.tz is not None:
+            return False
+        columns: list[Dict[str, Any]] = []
+        for position, (name, dtype) in enumerate(df.dtypes.items()):
+            kind = _CACHEABLE_KINDS.get(np.dtype(dtype).kind)
+            if kind is None or not isinstance(name, str):
+                return False
+            columns.append({"name": name, "dtype": kind, "file": f"c{position}.npy"})
+
+        span = None
+        if len(index) and not index.hasnans:
+            span = [int(index.min().value), int(index.max().value)]
+        stat = Path(source).stat()
+        meta: Dict[str, Any] = {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "source": str(Path(source).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_sha256(Path(source)),
+            "parser": parser,
+            "rows": int(len(df)),
+            "index_name": index.name,
+            "index_unit": index.unit,
+            "span_ns": span,
+            "columns": columns,
+        }
+
+        entry = self.entry_dir(source)
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=self.root))
+        try:
+            index_values = index.to_numpy().view(np.int64)
+            np.save(staging / "index.npy", np.ascontiguousarray(index_values))
+            for spec in columns:
+                values = df[spec["name"]].to_numpy(dtype=spec["dtype"])
+                np.save(staging / spec["file"], np.ascontiguousarray(values))
+            # meta.json is written last so a present meta marks a complete entry.
+            self._write_json(staging / "meta.json", meta)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read_meta(entry: Path) -> Optional[Dict[str, Any]]:
+        meta_path = entry / "meta.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(meta, dict):
+            return None
+        if meta.get("schema_version") != CACHE_SCHEMA_VERSION:
+            return None
+        return meta
+
+    @staticmethod
+    def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+        tmp_path = path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _frame_from_entry(entry: Path, meta: Dict[str, Any]) -> pd.DataFrame:
+        index_values = np.load(entry / "index.npy", mmap_mode="r")
+        unit = str(meta.get("index_unit") or "ns")
+        index = pd.DatetimeIndex(
+            np.asarray(index_values).view(f"datetime64[{unit}]"),
+            name=meta.get("index_name"),
+            copy=False,
+        )
+        data = {
+            spec["name"]: np.asarray(np.load(entry / spec["file"], mmap_mode="r"))
+            for spec in meta["columns"]
+        }
+        frame = pd.DataFrame(data, index=index, copy=False)
+        if len(frame) != int(meta.get("rows", len(frame))):
+            raise ValueError("cache entry row count mismatch")
+        return frame
+
+
+__all__ = [
+    "CACHE_ENV_VAR",
+    "CACHE_SCHEMA_VERSION",
+    "PanelCache",
+    "resolve_panel_cache",
+]
@@ -3,28 +3,81 @@
 from __future__ import annotations
 
 import cProfile
+import heapq
 import os
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
 import numpy as np
 
-from .events import FillEvent, LookaheadError, MarketEvent, OrderEvent, SignalEvent
+from .checkpoint import CheckpointError, load_checkpoint, save_checkpoint
+from .data import bars_from_events
+from .events import (
+    BarEvent,
+    FillEvent,
+    LookaheadError,
+    MarketEvent,
+    OrderEvent,
+    SignalEvent,
+)
 from .execution import ExecutionPlan
+from .timing import (
+    EQUITY_REFRESH,
+    MARK,
+    MATERIALIZE,
+    ORDER_FLOW,
+    PLANNING,
+    STRATEGY,
+    EngineTiming,
+)
+from .trace import TraceRecorder
 
 
 class Engine:
     def __init__(
-        self, data, strategy, portfolio, broker, rng: np.random.Generator | None = None
+        self,
+        data,
+        strategy,
+        portfolio,
+        broker,
+        rng: np.random.Generator | None = None,
+        bar_mode: bool = False,
+        checkpoint_path: str | Path | None = None,
+        checkpoint_every: int | None = None,
+        trace: TraceRecorder | None = None,
     ):
+        if bar_mode and not callable(getattr(strategy, "on_bar", None)):
+            raise ValueError("bar_mode requires a strategy implementing on_bar")
+        if checkpoint_every is not None and checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be a positive number of events")
         self.clock: int | None = None
         self.data = data
         self.strategy = strategy
         self.portfolio = portfolio
         self.broker = broker
         self.rng = rng or np.random.default_rng()
+        self.bar_mode = bool(bar_mode)
         self._pending_equity_refresh_ts: int | None = None
-        self._pending_executions: list[ExecutionPlan] = []
+        # symbol -> min-heap of (timestamp, sequence, plan); the sequence keeps
+        # same-timestamp plans in scheduling order.
+        self._pending_executions: dict[str, list[tuple[int, int, ExecutionPlan]]] = {}
+        self._pending_seq = 0
+        # Number of stream events already applied; a restored engine skips
+        # them when ``run`` replays the data handler.
+        self._stream_position = 0
+        # Set by ``restore(from_clock=True)``: the stream (and stream position)
+        # starts after this clock.
+        self._replay_after: int | None = None
+        # (timestamp, path, metadata) of a one-off snapshot armed by
+        # ``snapshot_before``.
+        self._snapshot: tuple[int, Path, Mapping[str, Any] | None] | None = None
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = checkpoint_every
+        # Optional event trace; records are rewound on ``restore``.
+        self.trace = trace
+        self.timing = EngineTiming()
 
     def run(self) -> None:
         profiler = None
@@ -32,12 +85,30 @@ class Engine:
             profiler = cProfile.Profile()
             profiler.enable()
 
-        for market_event in self.data.stream():
-            self._on_market(market_event)
-
-        if self._pending_equity_refresh_ts is not None:
-            self.portfolio.refresh_equity_after_fills(self._pending_equity_refresh_ts)
-            self._pending_equity_refresh_ts = None
+        started = perf_counter_ns()
+        handle = self._on_bar if self.bar_mode else self._on_market
+        first = position = self._stream_position
+        if self._replay_after is not None:
+            stream = self._stream_after(self._replay_after)
+        else:
+            stream = self._bar_stream() if self.bar_mode else self.data.stream()
+        if first:
+            stream = islice(stream, first, None)
+        if self._snapshot is not None:
+            stream = self._snapshot_stream(stream, first, *self._snapshot)
+            self._snapshot = None
+        every = (self.checkpoint_every or 0) if self.checkpoint_path else 0
+        next_checkpoint = first + every if every else -1
+        for event in stream:
+            handle(event)
+            position += 1
+            if position == next_checkpoint:
+                self._stream_position = position
+                self.checkpoint()
+                next_checkpoint += every
+        self._stream_position = position
+        self._finish_run(position - first)
+        self.timing.wall_ns += perf_counter_ns() - started
 
         if profiler:
             profiler.disable()
@@ -47,69 +118,254 @@ class Engine:
             output_dir.mkdir(parents=True, exist_ok=True)
             profiler.dump_stats(str(output_dir / "profile.pstats"))
 
-    def _on_market(self, market_event: MarketEvent) -> None:
-        if self.clock is not None and market_event.timestamp < self.clock:
-            raise LookaheadError("out-of-order market event")
+    def _finish_run(self, events: int) -> None:
+        if self._pending_equity_refresh_ts is not None:
+            self._refresh_equity(self._pending_equity_refresh_ts)
+            self._pending_equity_refresh_ts = None
+        timing = self.timing
+        timing.calls[MARK] += events
+        timing.calls[STRATEGY] += events
+        timing.events += events
+        timing.runs += 1
+
+    def _checkpoint_externals(self) -> dict[str, object]:
+        # Rebuilt from the run configuration on resume rather than pickled.
+        return {
+            "data": self.data,
+            "trade_logger": getattr(self.portfolio, "trade_logger", None),
+        }
+
+    def _stream_after(self, timestamp: int) -> Iterator:
+        method = "stream_bars_after" if self.bar_mode else "stream_after"
+        after = getattr(self.data, method, None)
+        if callable(after):
+            return after(timestamp)
+        stream = self._bar_stream() if self.bar_mode else self.data.stream()
+        return (event for event in stream if event.timestamp > timestamp)
+
+    def _snapshot_stream(
+        self,
+        stream: Iterable,
+        position: int,
+        timestamp: int,
+        path: Path,
+        metadata: Mapping[str, Any] | None,
+    ) -> Iterator:
+        iterator = iter(stream)
+        for event in iterator:
+            if event.timestamp >= timestamp:
+                self._stream_position = position
+                self.checkpoint(path, metadata=metadata)
+                yield event
+                break
+            yield event
+            position += 1
+        else:
+            self._stream_position = position
+            self.checkpoint(path, metadata=metadata)
+        yield from iterator
+
+    def snapshot_before(
+        self,
+        timestamp: int,
+        path: str | Path,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Have the next ``run`` checkpoint to ``path`` before ``timestamp``.
+
+        The snapshot is written just before the first event at or after
+        ``timestamp`` (or at the end of the stream if none is), which lets an
+        incremental run re-open the tail of the data once it has been extended.
+        """
+
+        self._snapshot = (int(timestamp), Path(path), metadata)
+
+    def checkpoint(
+        self,
+        path: str | Path | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> Path:
+        """Snapshot the engine, strategy, portfolio and broker to ``path``.
+
+        Defaults to ``checkpoint_path``. The snapshot is taken between events,
+        so it is consistent whenever ``run`` calls it. ``metadata`` is stored
+        alongside and returned by :meth:`restore`.
+        """
+
+        target = Path(path) if path is not None else self.checkpoint_path
+        if target is None:
+            raise ValueError("checkpoint requires a path")
+        trade_logger = getattr(self.portfolio, "trade_logger", None)
+        state = {
+            "stream_position": self._stream_position,
+            "replay_after": self._replay_after,
+            "bar_mode": self.bar_mode,
+            "clock": self.clock,
+            "pending_executions": self._pending_executions,
+            "pending_seq": self._pending_seq,
+            "pending_equity_refresh_ts": self._pending_equity_refresh_ts,
+            "rng_state": self.rng.bit_generator.state,
+            "strategy": self.strategy,
+            "portfolio": self.portfolio,
+            "broker": self.broker,
+            "trade_log_offset": trade_logger.tell() if trade_logger else None,
+            "trace": self.trace.state() if self.trace is not None else None,
+            "metadata": dict(metadata or {}),
+        }
+        return save_checkpoint(target, state, self._checkpoint_externals())
+
+    def restore(
+        self, path: str | Path | None = None, *, from_clock: bool = False
+    ) -> dict[str, Any]:
+        """Load a snapshot written by :meth:`checkpoint` so ``run`` resumes it.
+
+        The strategy, portfolio and broker are replaced by their checkpointed
+        copies (read them back from the engine after the run). The data
+        handler and trade log stay the live objects passed to this engine;
+        records logged after the snapshot are truncated from the trade log.
+        By default ``run`` skips the events consumed before the snapshot;
+        ``from_clock=True`` instead replays every event after the snapshot
+        clock, for data handlers that gained rows since. Returns the
+        snapshot metadata.
+        """
+
+        source = Path(path) if path is not None else self.checkpoint_path
+        if source is None:
+            raise ValueError("restore requires a path")
+        state = load_checkpoint(source, self._checkpoint_externals())
+        if state.get("bar_mode") != self.bar_mode:
+            raise CheckpointError("checkpoint bar_mode differs from this engine")
+        self._stream_position = int(state["stream_position"])
+        self._replay_after = state.get("replay_after")
+        self.clock = state["clock"]
+        self._pending_executions = state["pending_executions"]
+        self._pending_seq = state["pending_seq"]
+        self._pending_equity_refresh_ts = state["pending_equity_refresh_ts"]
+        self.rng.bit_generator.state = state["rng_state"]
+        self.strategy = state["strategy"]
+        self.portfolio = state["portfolio"]
+        self.broker = state["broker"]
+        offset = state.get("trade_log_offset")
+        trade_logger = getattr(self.portfolio, "trade_logger", None)
+        if offset is not None and trade_logger is not None:
+            trade_logger.truncate(offset)
+        trace_state = state.get("trace")
+        if trace_state is not None and self.trace is not None:
+            self.trace.rewind(trace_state)
+        if from_clock:
+            self._stream_position = 0
+            self._replay_after = self.clock
+        return dict(state.get("metadata") or {})
+
+    def _bar_stream(self) -> Iterator[BarEvent]:
+        stream_bars = getattr(self.data, "stream_bars", None)
+        if callable(stream_bars):
+            return stream_bars()
+        return bars_from_events(self.data.stream())
+
+    def _advance_clock(self, timestamp: int, message: str) -> None:
+        if self.clock is not None and timestamp < self.clock:
+            raise LookaheadError(message)
 
         if (
             self._pending_equity_refresh_ts is not None
-            and market_event.timestamp != self._pending_equity_refresh_ts
+            and timestamp != self._pending_equity_refresh_ts
         ):
-            self.portfolio.refresh_equity_after_fills(self._pending_equity_refresh_ts)
+            self._refresh_equity(self._pending_equity_refresh_ts)
             self._pending_equity_refresh_ts = None
 
-        self.clock = market_event.timestamp
+        self.clock = timestamp
+
+    def _refresh_equity(self, timestamp: int) -> None:
+        start = perf_counter_ns()
+        self.portfolio.refresh_equity_after_fills(timestamp)
+        self.timing.lap(EQUITY_REFRESH, start)
+
+    def _on_market(self, market_event: MarketEvent) -> None:
+        # Mark and strategy run once per event: accumulate inline and let
+        # ``run`` add the call counts.
+        phase_ns = self.timing.ns
+        self._advance_clock(market_event.timestamp, "out-of-order market event")
+        if self.trace is not None:
+            self.trace.market(market_event)
+        start = perf_counter_ns()
         self.portfolio.on_market(market_event)
+        phase_ns[MARK] += perf_counter_ns() - start
         self._materialize_due(market_event)
 
+        start = perf_counter_ns()
         signals_iter: Iterable[SignalEvent] = self.strategy.on_market(market_event)
         signals = list(signals_iter)
+        phase_ns[STRATEGY] += perf_counter_ns() - start
+        if signals:
+            self._process_signals(signals, market_event.timestamp)
+
+    def _on_bar(self, bar: BarEvent) -> None:
+        """Mark, fill, and query the strategy once for a cross-sectional bar."""
+        if self.clock is not None and bar.timestamp == self.clock:
+            raise LookaheadError("duplicate bar timestamp")
+        phase_ns = self.timing.ns
+        self._advance_clock(bar.timestamp, "out-of-order bar event")
+        if self.trace is not None:
+            self.trace.market(bar)
+        start = perf_counter_ns()
+        self.portfolio.on_bar(bar)
+        phase_ns[MARK] += perf_counter_ns() - start
+        self._materialize_due_symbols(bar.timestamp, bar.symbols)
+
+        start = perf_counter_ns()
+        signals_iter: Iterable[SignalEvent] = self.strategy.on_bar(
+            bar.timestamp, bar.symbols, bar.prices, bar.volumes
+        )
+        signals = list(signals_iter)
+        phase_ns[STRATEGY] += perf_counter_ns() - start
+        if signals:
+            self._process_signals(signals, bar.timestamp)
+
+    def _process_signals(self, signals: list[SignalEvent], timestamp: int) -> None:
+        if not signals:
+            return
+        timing = self.timing
+        trace = self.trace
         order_flow = getattr(self.portfolio, "order_flow", None)
-        if order_flow and signals:
+        batch = getattr(self.portfolio, "batch_rebalance", False)
+        if order_flow:
+            start = perf_counter_ns()
             try:
-                order_flow.begin_rebalance(signals, market_event.timestamp)
+                order_flow.begin_rebalance(signals, timestamp)
             except (
                 Exception
             ) as exc:  # pragma: no cover - diagnostics should not fail run
                 order_flow.record_error(
                     f"begin_rebalance_error: {type(exc).__name__}: {exc}"
                 )
+            timing.lap(ORDER_FLOW, start)
         same_day_fill = False
         for signal in signals:
-            if signal.timestamp < self.clock:
+            if signal.timestamp < timestamp:
                 raise LookaheadError("signal time < current clock")
-            if signal.timestamp > self.clock:
+            if signal.timestamp > timestamp:
                 raise LookaheadError("signal time > current clock")
+            if trace is not None:
+                trace.record(signal)
+            if batch:
+                continue
 
+            start = perf_counter_ns()
             orders: Iterable[OrderEvent] = self.portfolio.on_signal(signal)
+            timing.lap(PLANNING, start)
             for order in orders:
-                plans = self._plan_execution(order, market_event.timestamp)
-                if not plans:
-                    if order_flow:
-                        reason = getattr(
-                            getattr(self.broker, "executor", None),
-                            "last_reject_reason",
-                            None,
-                        )
-                        order_flow.record_broker_reject(order, reason)
-                    continue
-                if order_flow:
-                    order_flow.record_broker_accept(order)
-                for plan in plans:
-                    if plan.timestamp < market_event.timestamp:
-                        raise LookaheadError("planned fill before current market event")
-                    if plan.timestamp == market_event.timestamp:
-                        fill = self._materialize(plan)
-                        if fill is not None:
-                            if order_flow:
-                                order_flow.record_fill(fill, order=plan.order)
-                            self.portfolio.on_fill(fill)
-                            same_day_fill = True
-                    else:
-                        self._pending_executions.append(plan)
+                same_day_fill |= self._route_order(order, timestamp, order_flow)
+        if batch:
+            start = perf_counter_ns()
+            orders = self.portfolio.on_rebalance(signals)
+            timing.lap(PLANNING, start)
+            for order in orders:
+                same_day_fill |= self._route_order(order, timestamp, order_flow)
         if same_day_fill:
-            self._pending_equity_refresh_ts = market_event.timestamp
-        if order_flow and signals:
+            self._pending_equity_refresh_ts = timestamp
+        if order_flow:
+            start = perf_counter_ns()
             try:
                 order_flow.end_rebalance()
             except (
@@ -118,6 +374,53 @@ class Engine:
                 order_flow.record_error(
                     f"end_rebalance_error: {type(exc).__name__}: {exc}"
                 )
+            timing.lap(ORDER_FLOW, start)
+
+    def _route_order(self, order: OrderEvent, timestamp: int, order_flow) -> bool:
+        """Plan ``order``, fill slices due now and schedule the rest.
+
+        Returns whether any slice filled at ``timestamp``.
+        """
+        timing = self.timing
+        trace = self.trace
+        if trace is not None:
+            trace.record(order)
+        start = perf_counter_ns()
+        plans = self._plan_execution(order, timestamp)
+        start = timing.lap(PLANNING, start)
+        if not plans:
+            if order_flow:
+                reason = getattr(
+                    getattr(self.broker, "executor", None),
+                    "last_reject_reason",
+                    None,
+                )
+                order_flow.record_broker_reject(order, reason)
+                timing.lap(ORDER_FLOW, start)
+            return False
+        if order_flow:
+            order_flow.record_broker_accept(order)
+            timing.lap(ORDER_FLOW, start)
+        filled = False
+        for plan in plans:
+            if plan.timestamp < timestamp:
+                raise LookaheadError("planned fill before current market event")
+            if plan.timestamp == timestamp:
+                start = perf_counter_ns()
+                fill = self._materialize(plan)
+                if fill is not None:
+                    if trace is not None:
+                        trace.record(fill)
+                    if order_flow:
+                        start = timing.lap(MATERIALIZE, start)
+                        order_flow.record_fill(fill, order=plan.order)
+                        start = timing.lap(ORDER_FLOW, start)
+                    self.portfolio.on_fill(fill)
+                    filled = True
+                timing.lap(MATERIALIZE, start)
+            else:
+                self._schedule(plan)
+        return filled
 
     def _plan_execution(
         self, order: OrderEvent, market_timestamp: int
@@ -141,41 +444,112 @@ class Engine:
         return plan.prepared_fill
 
     def _materialize_due(self, market_event: MarketEvent) -> None:
-        overdue = [
-            plan
-            for plan in self._pending_executions
-            if plan.timestamp < market_event.timestamp
-            and plan.order.symbol == market_event.symbol
-        ]
-        if overdue:
-            raise LookaheadError("scheduled execution timestamp was not observed")
-
-        due = [
-            plan
-            for plan in self._pending_executions
-            if plan.timestamp == market_event.timestamp
-            and plan.order.symbol == market_event.symbol
-        ]
+        self._materialize_due_symbols(market_event.timestamp, (market_event.symbol,))
+
+    def _schedule(self, plan: ExecutionPlan) -> None:
+        heap = self._pending_executions.setdefault(plan.order.symbol, [])
+        heapq.heappush(heap, (plan.timestamp, self._pending_seq, plan))
+        self._pending_seq += 1
+
+    def _materialize_due_symbols(self, timestamp: int, symbols: Sequence[str]) -> None:
+        pending = self._pending_executions
+        if not pending:
+            return
+        for symbol in symbols:
+            heap = pending.get(symbol)
+            if heap and heap[0][0] < timestamp:
+                raise LookaheadError("scheduled execution timestamp was not observed")
+
+        # Fill in bar symbol order, matching the per-event replay.
+        due: list[ExecutionPlan] = []
+        for symbol in symbols:
+            heap = pending.get(symbol)
+            if not heap or heap[0][0] != timestamp:
+                continue
+            while heap and heap[0][0] == timestamp:
+                due.append(heapq.heappop(heap)[2])
+            if not heap:
+                del pending[symbol]
         if not due:
             return
 
-        due_ids = {id(plan) for plan in due}
-        self._pending_executions = [
-            plan for plan in self._pending_executions if id(plan) not in due_ids
-        ]
+        timing = self.timing
+        trace = self.trace
         order_flow = getattr(self.portfolio, "order_flow", None)
         applied = False
+        start = perf_counter_ns()
         for plan in due:
             fill = self._materialize(plan)
             if fill is None:
                 continue
-            if fill.timestamp != market_event.timestamp:
+            if fill.timestamp != timestamp:
                 raise LookaheadError(
                     "materialized fill timestamp differs from schedule"
                 )
+            if trace is not None:
+                trace.record(fill)
             if order_flow:
+                start = timing.lap(MATERIALIZE, start)
                 order_flow.record_fill(fill, order=plan.order)
+                start = timing.lap(ORDER_FLOW, start)
             self.portfolio.on_fill(fill)
             applied = True
+        timing.lap(MATERIALIZE, start)
         if applied:
-            self.portfolio.refresh_equity_after_fills(market_event.timestamp)
+            self._refresh_equity(timestamp)
+
+
+class FanOutEngine:
+    """Drive several independent engines off one pass over a shared stream.
+
+    Each engine keeps its own clock, pending executions, RNG and lookahead
+    checks and sees every event in stream order, so the results equal running
+    the engines one after another while the data handler streams (and builds
+    events) only once. Engines must share the data handler and ``bar_mode``
+    and must not have been run or restored. Each engine's ``timing`` is
+    charged its own phases plus an equal share of the shared streaming time.
+    """
+
+    def __init__(self, engines: Sequence[Engine]):
+        self.engines = list(engines)
+        if not self.engines:
+            raise ValueError("FanOutEngine requires at least one engine")
+        lead = self.engines[0]
+        for engine in self.engines:
+            if engine.data is not lead.data:
+                raise ValueError("fan-out engines must share one data handler")
+            if engine.bar_mode != lead.bar_mode:
+                raise ValueError("fan-out engines must share bar_mode")
+            if engine.clock is not None or engine._stream_position:
+                raise ValueError("fan-out engines must start from a fresh state")
+        self.data = lead.data
+        self.bar_mode = lead.bar_mode
+
+    def run(self) -> None:
+        engines = self.engines
+        lead = engines[0]
+        phase_ns = [-sum(engine.timing.ns) for engine in engines]
+        started = perf_counter_ns()
+        if self.bar_mode:
+            stream: Iterable = lead._bar_stream()
+            handlers: list[Callable[[Any], None]]
+            handlers = [engine._on_bar for engine in engines]
+        else:
+            stream = self.data.stream()
+            handlers = [engine._on_market for engine in engines]
+        events = 0
+        for event in stream:
+            for handle in handlers:
+                handle(event)
+            events += 1
+        wall_ns = perf_counter_ns() - started
+        for idx, engine in enumerate(engines):
+            phase_ns[idx] += sum(engine.timing.ns)
+        shared_ns = max(wall_ns - sum(phase_ns), 0) // len(engines)
+        for engine, own_ns in zip(engines, phase_ns):
+            refresh_start = perf_counter_ns()
+            engine._stream_position = events
+            engine._finish_run(events)
+            engine.timing.wall_ns += (
+                own_ns + shared_ns + perf_counter_ns() - refresh_start
+            )
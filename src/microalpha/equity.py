@@ -0,0 +1,400 @@
+"""Columnar and streaming stores for a portfolio's equity curve.
+
+By default ``Portfolio.equity_curve`` is a list of ``{"timestamp", "equity",
+"exposure", "gross_exposure"}`` dicts. ``Portfolio(equity_store="columnar")``
+keeps the same points in an :class:`EquityRecorder` instead: growable numpy
+columns that still read as a sequence of those dicts, and that
+:func:`~microalpha.metrics.compute_metrics` consumes without building the
+dicts. ``equity_store="online"`` uses :class:`OnlineEquityStats`, which folds
+each point into running return, drawdown and exposure statistics and keeps
+only a short equity tail for volatility targeting.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+EQUITY_COLUMNS = ("timestamp", "equity", "exposure", "gross_exposure")
+EQUITY_STORES = ("records", "columnar", "online")
+
+
+_CHUNK = 4096
+
+
+class EquityRecorder(Sequence):
+    """Equity points in preallocated numpy columns, grown by doubling.
+
+    New points are buffered as tuples and copied into the columns a chunk at
+    a time or when the curve is read. Indexing and iteration yield the same
+    dicts the list store holds, so code that reads ``equity_curve[-1]`` or
+    compares curves keeps working.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._stored = 0
+        self._rows: List[Tuple[int, float, float, float]] = []
+        self._timestamp = np.zeros(capacity, dtype=np.int64)
+        self._equity = np.zeros(capacity)
+        self._exposure = np.zeros(capacity)
+        self._gross = np.zeros(capacity)
+
+    def record(
+        self,
+        timestamp: int,
+        equity: float,
+        exposure: float,
+        gross_exposure: float,
+        *,
+        overwrite_last: bool = True,
+    ) -> None:
+        """Append a point, or replace the last one if it has the same timestamp."""
+        rows = self._rows
+        row = (timestamp, equity, exposure, gross_exposure)
+        if overwrite_last and rows and rows[-1][0] == timestamp:
+            rows[-1] = row
+        elif (
+            overwrite_last
+            and not rows
+            and self._stored
+            and self._timestamp[self._stored - 1] == timestamp
+        ):
+            self._stored -= 1
+            rows.append(row)
+        else:
+            rows.append(row)
+            if len(rows) >= _CHUNK:
+                self._flush()
+
+    def _flush(self) -> None:
+        rows = self._rows
+        if not rows:
+            return
+        start = self._stored
+        stop = start + len(rows)
+        while stop > self._timestamp.shape[0]:
+            self._grow()
+        timestamps, equity, exposure, gross = zip(*rows)
+        self._timestamp[start:stop] = timestamps
+        self._equity[start:stop] = equity
+        self._exposure[start:stop] = exposure
+        self._gross[start:stop] = gross
+        self._stored = stop
+        rows.clear()
+
+    def _grow(self) -> None:
+        def extend(values: np.ndarray) -> np.ndarray:
+            grown = np.zeros(values.shape[0] * 2, dtype=values.dtype)
+            grown[: values.shape[0]] = values
+            return grown
+
+        self._timestamp = extend(self._timestamp)
+        self._equity = extend(self._equity)
+        self._exposure = extend(self._exposure)
+        self._gross = extend(self._gross)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only views of the recorded columns, keyed like the records."""
+        self._flush()
+        size = self._stored
+        views = {}
+        for name, values in zip(
+            EQUITY_COLUMNS, (self._timestamp, self._equity, self._exposure, self._gross)
+        ):
+            view = values[:size]
+            view.flags.writeable = False
+            views[name] = view
+        return views
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: col.copy() for name, col in self.columns().items()})
+
+    def tail_equity(self, count: int) -> np.ndarray:
+        """Copy of the last ``count`` equity values."""
+        self._flush()
+        return self._equity[max(self._stored - count, 0) : self._stored].copy()
+
+    def _point(self, idx: int) -> Dict[str, float | int]:
+        return {
+            "timestamp": self._timestamp.item(idx),
+            "equity": self._equity.item(idx),
+            "exposure": self._exposure.item(idx),
+            "gross_exposure": self._gross.item(idx),
+        }
+
+    def __len__(self) -> int:
+        return self._stored + len(self._rows)
+
+    def __getitem__(self, index):
+        self._flush()
+        if isinstance(index, slice):
+            return [self._point(idx) for idx in range(*index.indices(self._stored))]
+        if index < 0:
+            index += self._stored
+        if not 0 <= index < self._stored:
+            raise IndexError("equity index out of range")
+        return self._point(index)
+
+    def __iter__(self) -> Iterator[Dict[str, float | int]]:
+        self._flush()
+        return (self._point(idx) for idx in range(self._stored))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EquityRecorder):
+            return all(
+                np.array_equal(mine, theirs)
+                for mine, theirs in zip(
+                    self.columns().values(), other.columns().values()
+                )
+            )
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EquityRecorder(points={len(self)})"
+
+
+class _RunningMoments:
+    """Mean and population variance, merged a chunk at a time."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values: np.ndarray) -> None:
+        count = values.size
+        if not count:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def __copy__(self) -> "_RunningMoments":
+        clone = _RunningMoments()
+        clone.count, clone.mean, clone.m2 = self.count, self.mean, self.m2
+        return clone
+
+
+class _Accumulator:
+    """Statistics over the committed equity points."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first_equity = 0.0
+        self.last_equity = 0.0
+        self.returns = _RunningMoments()
+        self.downside_sq = 0.0
+        self.downside_count = 0
+        self.traded = 0
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+        self.drawdown_run = 0
+        self.max_drawdown_run = 0
+        self.exposure = _RunningMoments()
+        self.gross = _RunningMoments()
+        self.max_gross = -math.inf
+        self.max_net = 0.0
+
+    def add(self, points: Sequence[Tuple[float, float, float]]) -> None:
+        if not points:
+            return
+        equity, exposure, gross = (np.asarray(col, dtype=float) for col in zip(*points))
+        if self.count:
+            previous = np.concatenate(([self.last_equity], equity[:-1]))
+            returns = equity / previous - 1.0
+        else:
+            self.first_equity = float(equity[0])
+            returns = np.concatenate(([0.0], equity[1:] / equity[:-1] - 1.0))
+        self.count += equity.size
+        self.last_equity = float(equity[-1])
+        self.returns.add(returns)
+        downside = returns[returns < 0.0]
+        self.downside_sq += float((downside**2).sum())
+        self.downside_count += downside.size
+        self.traded += int(np.count_nonzero(returns))
+
+        peaks = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        self.peak = float(peaks[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.nan_to_num((peaks - equity) / peaks)
+            below = equity / peaks < 1.0
+        self.max_drawdown = max(self.max_drawdown, float(drawdown.max()))
+        # Longest run of points under water, carrying the open run across chunks.
+        breaks = np.flatnonzero(~below)
+        if not breaks.size:
+            self.drawdown_run += below.size
+            longest = self.drawdown_run
+        else:
+            runs = np.diff(breaks) - 1
+            longest = max(
+                self.drawdown_run + int(breaks[0]),
+                int(runs.max()) if runs.size else 0,
+                below.size - 1 - int(breaks[-1]),
+            )
+            self.drawdown_run = below.size - 1 - int(breaks[-1])
+        self.max_drawdown_run = max(self.max_drawdown_run, longest)
+
+        self.exposure.add(exposure)
+        self.gross.add(gross)
+        self.max_gross = max(self.max_gross, float(gross.max()))
+        self.max_net = max(self.max_net, float(np.abs(exposure).max()))
+
+    def __copy__(self) -> "_Accumulator":
+        clone = _Accumulator.__new__(_Accumulator)
+        clone.__dict__.update(self.__dict__)
+        for name in ("returns", "exposure", "gross"):
+            setattr(clone, name, copy.copy(getattr(self, name)))
+        return clone
+
+
+class OnlineEquityStats:
+    """Running Sharpe, Sortino, drawdown and exposure statistics.
+
+    The latest point stays pending until a later timestamp arrives, so
+    overwrite-last updates within a timestamp are free. Committed points are
+    folded in a chunk at a time, and the statistics match
+    :func:`~microalpha.metrics.compute_metrics` on the full curve up to
+    floating-point rounding. Only the last ``tail`` equity values are kept,
+    for volatility targeting.
+    """
+
+    def __init__(self, tail: int = 20):
+        self._stats = _Accumulator()
+        self._pending: Tuple[int, float, float, float] | None = None
+        self._chunk: List[Tuple[float, float, float]] = []
+        self._tail: Deque[float] = deque(maxlen=max(int(tail), 1))
+
+    def record(
+        self,
+        timestamp: int,
+        equity: float,
+        exposure: float,
+        gross_exposure: float,
+        *,
+        overwrite_last: bool = True,
+    ) -> None:
+        pending = self._pending
+        if pending is not None and not (overwrite_last and pending[0] == timestamp):
+            self._chunk.append(pending[1:])
+            self._tail.append(pending[1])
+            if len(self._chunk) >= _CHUNK:
+                self._stats.add(self._chunk)
+                self._chunk = []
+        self._pending = (timestamp, equity, exposure, gross_exposure)
+
+    def last(self) -> Dict[str, float | int] | None:
+        if self._pending is None:
+            return None
+        return dict(zip(EQUITY_COLUMNS, self._pending))
+
+    def tail_equity(self, count: int) -> np.ndarray:
+        """The last ``count`` equity values, including the pending point."""
+        values: List[float] = list(self._tail)
+        if self._pending is not None:
+            values.append(self._pending[1])
+        return np.asarray(values[-count:] if count > 0 else [], dtype=float)
+
+    def __len__(self) -> int:
+        return self._stats.count + len(self._chunk) + (self._pending is not None)
+
+    def summary(self, periods: int = 252) -> Dict[str, Any]:
+        """Metrics over every recorded point, keyed like ``compute_metrics``."""
+        stats = copy.copy(self._stats)
+        stats.add(self._chunk)
+        if self._pending is not None:
+            stats.add([self._pending[1:]])
+        count = stats.count
+        if not count:
+            return {}
+        mean, std = stats.returns.mean, stats.returns.std
+        sharpe = se = tstat = 0.0
+        if count > 1 and std > 0.0:
+            sharpe = math.sqrt(periods) * mean / std
+            # iid standard error with ddof=0, as in risk_stats.sharpe_stats
+            se = math.sqrt(periods / count)
+            tstat = sharpe / se
+        downside_std = (
+            math.sqrt(stats.downside_sq / stats.downside_count)
+            if stats.downside_count
+            else 0.0
+        )
+        sortino = 0.0
+        if downside_std > 0:
+            sortino = (mean * periods) / (downside_std * math.sqrt(periods))
+        cagr = 0.0
+        if count > 1:
+            base = stats.last_equity / stats.first_equity
+            years = max(float(count) / periods, 1e-9)
+            cagr = -1.0 if base <= 0.0 else float(base ** (1.0 / years) - 1.0)
+        max_drawdown = stats.max_drawdown
+        return {
+            "sharpe_ratio": float(sharpe),
+            "sortino_ratio": float(sortino),
+            "max_drawdown": float(max_drawdown),
+            "max_drawdown_duration": stats.max_drawdown_run,
+            "cagr": cagr,
+            "calmar_ratio": float(cagr / max_drawdown) if max_drawdown > 0 else 0.0,
+            "ann_vol": float(std * periods**0.5) if count > 1 else 0.0,
+            "avg_exposure": stats.exposure.mean,
+            "avg_gross_exposure": stats.gross.mean,
+            "max_gross_exposure": stats.max_gross,
+            "max_net_exposure": stats.max_net,
+            "exposure_std": stats.exposure.std,
+            "gross_exposure_std": stats.gross.std,
+            "points": count,
+            "traded_days": stats.traded,
+            "final_equity": stats.last_equity,
+            "sharpe_ratio_se": se,
+            "sharpe_ratio_tstat": tstat,
+            "sharpe_ratio_ci_low": sharpe - 1.96 * se,
+            "sharpe_ratio_ci_high": sharpe + 1.96 * se,
+        }
+
+    def __repr__(self) -> str:
+        return f"OnlineEquityStats(points={len(self)})"
+
+
+def equity_rows(
+    curve: Sequence[Mapping[str, float | int]] | EquityRecorder | OnlineEquityStats,
+    consumer: str,
+) -> Sequence[Mapping[str, float | int]]:
+    """Return ``curve`` as per-row equity records for ``consumer``.
+
+    Raises ``ValueError`` for :class:`OnlineEquityStats`, which keeps running
+    statistics rather than rows.
+    """
+    if isinstance(curve, OnlineEquityStats):
+        raise ValueError(
+            f"{consumer} needs per-row equity, which the online equity store "
+            "does not keep"
+        )
+    return curve
+
+
+__all__ = [
+    "EQUITY_COLUMNS",
+    "EQUITY_STORES",
+    "EquityRecorder",
+    "OnlineEquityStats",
+    "equity_rows",
+]
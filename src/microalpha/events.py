@@ -1,28 +1,82 @@
-"""Core event types exchanged between components."""
+"""Core event types exchanged between components.
+
+Events are frozen, slotted dataclasses: instances are immutable and carry no
+per-instance ``__dict__``. The per-event types (market, signal, order, fill)
+are built on every step, so their ``__init__`` stores fields through the slot
+descriptors directly instead of the frozen ``__setattr__`` round-trip of the
+generated one; equality, hashing, ``repr`` and ``replace`` are unchanged.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterator, Literal, Optional, Tuple
+
+import numpy as np
+
+
+def _slot_setters(cls: type) -> Tuple[Callable[[Any, Any], None], ...]:
+    """Slot descriptor ``__set__`` methods for ``cls``'s fields, in order."""
+    return tuple(getattr(cls, field.name).__set__ for field in fields(cls))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class MarketEvent:
     timestamp: int
     symbol: str
     price: float
     volume: float
 
+    def __init__(self, timestamp: int, symbol: str, price: float, volume: float):
+        set_timestamp, set_symbol, set_price, set_volume = _MARKET_SETTERS
+        set_timestamp(self, timestamp)
+        set_symbol(self, symbol)
+        set_price(self, price)
+        set_volume(self, volume)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BarEvent:
+    """Cross-sectional snapshot of every symbol observed at ``timestamp``.
+
+    ``prices`` and ``volumes`` are read-only arrays aligned with ``symbols``.
+    """
+
+    timestamp: int
+    symbols: Tuple[str, ...]
+    prices: np.ndarray
+    volumes: np.ndarray
+
+    def market_events(self) -> Iterator[MarketEvent]:
+        """Expand the bar into per-symbol ``MarketEvent``s in symbol order."""
+        for symbol, price, volume in zip(
+            self.symbols, self.prices.tolist(), self.volumes.tolist()
+        ):
+            yield MarketEvent(self.timestamp, symbol, price, volume)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True, init=False)
 class SignalEvent:
     timestamp: int
     symbol: str
     side: Literal["LONG", "SHORT", "EXIT"]
     meta: Optional[Dict[str, Any]] = None
 
+    def __init__(
+        self,
+        timestamp: int,
+        symbol: str,
+        side: Literal["LONG", "SHORT", "EXIT"],
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        set_timestamp, set_symbol, set_side, set_meta = _SIGNAL_SETTERS
+        set_timestamp(self, timestamp)
+        set_symbol(self, symbol)
+        set_side(self, side)
+        set_meta(self, meta)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class OrderEvent:
     timestamp: int
     symbol: str
@@ -32,8 +86,35 @@ class OrderEvent:
     price: float | None = None
     order_id: str | None = None
 
+    def __init__(
+        self,
+        timestamp: int,
+        symbol: str,
+        qty: int,
+        side: Literal["BUY", "SELL"],
+        order_type: Literal["MARKET", "LIMIT", "CANCEL"] = "MARKET",
+        price: float | None = None,
+        order_id: str | None = None,
+    ):
+        (
+            set_timestamp,
+            set_symbol,
+            set_qty,
+            set_side,
+            set_order_type,
+            set_price,
+            set_order_id,
+        ) = _ORDER_SETTERS
+        set_timestamp(self, timestamp)
+        set_symbol(self, symbol)
+        set_qty(self, qty)
+        set_side(self, side)
+        set_order_type(self, order_type)
+        set_price(self, price)
+        set_order_id(self, order_id)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True, init=False)
 class FillEvent:
     timestamp: int
     symbol: str
@@ -44,6 +125,42 @@ class FillEvent:
     latency_ack: float = 0.0
     latency_fill: float = 0.0
 
+    def __init__(
+        self,
+        timestamp: int,
+        symbol: str,
+        qty: int,
+        price: float,
+        commission: float,
+        slippage: float,
+        latency_ack: float = 0.0,
+        latency_fill: float = 0.0,
+    ):
+        (
+            set_timestamp,
+            set_symbol,
+            set_qty,
+            set_price,
+            set_commission,
+            set_slippage,
+            set_latency_ack,
+            set_latency_fill,
+        ) = _FILL_SETTERS
+        set_timestamp(self, timestamp)
+        set_symbol(self, symbol)
+        set_qty(self, qty)
+        set_price(self, price)
+        set_commission(self, commission)
+        set_slippage(self, slippage)
+        set_latency_ack(self, latency_ack)
+        set_latency_fill(self, latency_fill)
+
+
+_MARKET_SETTERS = _slot_setters(MarketEvent)
+_SIGNAL_SETTERS = _slot_setters(SignalEvent)
+_ORDER_SETTERS = _slot_setters(OrderEvent)
+_FILL_SETTERS = _slot_setters(FillEvent)
+
 
 class LookaheadError(Exception):
     """Raised when an operation would violate temporal ordering."""
@@ -9,6 +9,7 @@ from typing import Any, Dict, Literal, Mapping, Optional, Protocol, Sequence, ca
 
 import numpy as np
 
+from .data import estimate_volatility
 from .events import FillEvent, OrderEvent
 from .lob import LatencyModel, LimitOrderBook
 from .market_metadata import SymbolMeta
@@ -299,23 +300,16 @@ class Executor:
     ) -> float:
         if meta.volatility_bps and meta.volatility_bps > 0:
             return float(meta.volatility_bps)
-        prices: list[float] = []
+        vol: float | None
         try:
-            prices = list(
-                self.data_handler.get_recent_prices(
-                    symbol, timestamp, max(self.volatility_lookback, 2)
-                )
+            vol = estimate_volatility(
+                self.data_handler, symbol, timestamp, max(self.volatility_lookback, 2)
             )
         except AttributeError:
-            prices = []
-        if len(prices) < 2:
+            vol = None
+        if vol is None:
             spread = meta.spread_bps if meta.spread_bps else 0.0
             return max(spread, 1.0)
-        prices_arr: np.ndarray = np.asarray(prices, dtype=float)
-        returns = np.diff(prices_arr) / prices_arr[:-1]
-        if returns.size == 0:
-            return max(meta.spread_bps or 0.0, 1.0)
-        vol = float(np.std(returns, ddof=0))
         vol_bps = vol * 10_000.0
         return max(vol_bps, 1.0)
 
@@ -7,6 +7,7 @@ from typing import Mapping, Sequence
 
 import numpy as np
 
+from .equity import EquityRecorder, OnlineEquityStats, equity_rows
 from .portfolio import Portfolio
 
 
@@ -22,6 +23,8 @@ def _equity_series(
 ) -> np.ndarray:
     if not equity_records:
         return np.asarray([], dtype=float)
+    if isinstance(equity_records, EquityRecorder):
+        return equity_records.columns()["equity"].copy()
     values: list[float] = []
     for record in equity_records:
         try:
@@ -43,13 +46,15 @@ def _equity_is_constant(series: np.ndarray, *, tol_abs: float, tol_rel: float) -
 def evaluate_portfolio_integrity(
     portfolio: Portfolio,
     *,
-    equity_records: Sequence[Mapping[str, float | int]] | None = None,
+    equity_records: (
+        Sequence[Mapping[str, float | int]] | EquityRecorder | OnlineEquityStats | None
+    ) = None,
     slippage_total: float = 0.0,
     tol_abs: float = 1e-6,
     tol_rel: float = 1e-8,
 ) -> IntegrityResult:
-    equity_records = equity_records or portfolio.equity_curve
-    equity_series = _equity_series(equity_records)
+    records = equity_rows(equity_records or portfolio.equity_curve, "Integrity checks")
+    equity_series = _equity_series(records)
 
     num_trades = len(getattr(portfolio, "trades", None) or [])
     turnover = float(getattr(portfolio, "total_turnover", 0.0) or 0.0)
@@ -0,0 +1,272 @@
+"""Asyncio replay feeds for paper-trading dry runs.
+
+``AsyncReplayDataHandler`` replays a local data handler's events (or bars) in
+real time, accelerated, or as fast as possible. ``AsyncSocketDataHandler``
+reads the same events as JSON lines from a local TCP feed such as the one
+:func:`serve_replay` (``microalpha feed``) runs. Both delegate price and
+calendar lookups to a local data handler, so portfolios and executors behave
+as in a backtest. :class:`AsyncEngine` drives the engine's event handlers from
+such a feed and records decision latency: the time from a market event or
+bar arriving to each order it produces.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from time import perf_counter_ns
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .engine import Engine
+from .events import BarEvent, MarketEvent, OrderEvent
+
+Feed = AsyncIterator[Tuple[Any, int]]
+
+
+def encode_event(event: MarketEvent | BarEvent) -> bytes:
+    """Serialise a market event or bar as one JSON line."""
+    if isinstance(event, BarEvent):
+        payload: Dict[str, Any] = {
+            "type": "bar",
+            "timestamp": event.timestamp,
+            "symbols": list(event.symbols),
+            "prices": event.prices.tolist(),
+            "volumes": event.volumes.tolist(),
+        }
+    else:
+        payload = {
+            "type": "market",
+            "timestamp": event.timestamp,
+            "symbol": event.symbol,
+            "price": event.price,
+            "volume": event.volume,
+        }
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def decode_event(line: bytes | str) -> MarketEvent | BarEvent:
+    """Parse a line written by :func:`encode_event`."""
+    payload = json.loads(line)
+    if payload["type"] == "bar":
+        prices = np.asarray(payload["prices"], dtype=float)
+        volumes = np.asarray(payload["volumes"], dtype=float)
+        prices.setflags(write=False)
+        volumes.setflags(write=False)
+        return BarEvent(
+            int(payload["timestamp"]), tuple(payload["symbols"]), prices, volumes
+        )
+    return MarketEvent(
+        int(payload["timestamp"]),
+        payload["symbol"],
+        float(payload["price"]),
+        float(payload["volume"]),
+    )
+
+
+async def _paced(events: Iterable[Any], speed: float | None) -> AsyncIterator[Any]:
+    """Yield ``events`` spaced by their timestamps divided by ``speed``.
+
+    ``speed=1`` replays in real time and ``None`` as fast as possible (still
+    yielding to the event loop between events).
+    """
+    loop = asyncio.get_running_loop()
+    origin: Tuple[float, int] | None = None
+    for event in events:
+        if speed is None:
+            await asyncio.sleep(0)
+        else:
+            if origin is None:
+                origin = (loop.time(), event.timestamp)
+            due = origin[0] + (event.timestamp - origin[1]) / 1e9 / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield event
+
+
+def _check_speed(speed: float | None) -> float | None:
+    if speed is not None and speed <= 0:
+        raise ValueError("speed must be positive (or None for as fast as possible)")
+    return speed
+
+
+class AsyncReplayDataHandler:
+    """Replay ``handler``'s stream as an asyncio feed at ``speed``.
+
+    Lookups (prices, future timestamps, volumes) are answered by ``handler``.
+    """
+
+    def __init__(self, handler, speed: float | None = None):
+        self.handler = handler
+        self.speed = _check_speed(speed)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+    async def events(self, bar_mode: bool = False) -> Feed:
+        """Yield ``(event, arrival_ns)`` pairs in stream order."""
+        handler = self.handler
+        stream = handler.stream_bars() if bar_mode else handler.stream()
+        async for event in _paced(stream, self.speed):
+            yield event, perf_counter_ns()
+
+
+class AsyncSocketDataHandler:
+    """Read events from a local TCP feed; lookups are answered by ``handler``."""
+
+    def __init__(self, host: str, port: int, handler):
+        self.host = host
+        self.port = int(port)
+        self.handler = handler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+    async def events(self, bar_mode: bool = False) -> Feed:
+        """Yield ``(event, arrival_ns)`` pairs until the feed closes."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while line := await reader.readline():
+                arrival = perf_counter_ns()
+                event = decode_event(line)
+                if isinstance(event, BarEvent) != bar_mode:
+                    sent = "bars" if not bar_mode else "market events"
+                    raise ValueError(f"feed sends {sent}; check bar_mode")
+                yield event, arrival
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+
+async def serve_replay(
+    handler,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    *,
+    speed: float | None = None,
+    bar_mode: bool = False,
+    clients: int | None = 1,
+    ready: Callable[[str, int], None] | None = None,
+) -> None:
+    """Replay ``handler``'s stream to each client as JSON lines.
+
+    Every connection gets the full stream from the start, paced at ``speed``.
+    ``ready`` is called with the bound address once the server listens (pass
+    ``port=0`` to pick a free port). Returns after ``clients`` connections
+    have been served, or never when ``clients`` is ``None``.
+    """
+
+    _check_speed(speed)
+    finished = asyncio.Event()
+    served = 0
+
+    async def replay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        nonlocal served
+        stream = handler.stream_bars() if bar_mode else handler.stream()
+        try:
+            async for event in _paced(stream, speed):
+                writer.write(encode_event(event))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                # Flush buffered bytes before the server may shut down.
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            served += 1
+            if clients is not None and served >= clients:
+                finished.set()
+
+    server = await asyncio.start_server(replay, host, port)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    if ready is not None:
+        ready(bound_host, bound_port)
+    async with server:
+        await finished.wait()
+
+
+def _latency_stats(samples: List[int]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples, dtype=np.float64) / 1e3
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {
+        "count": len(samples),
+        "mean_us": round(float(values.mean()), 3),
+        "p50_us": round(p50, 3),
+        "p90_us": round(p90, 3),
+        "p99_us": round(p99, 3),
+        "max_us": round(float(values.max()), 3),
+    }
+
+
+class LatencyRecorder:
+    """Collect per-event and per-order latencies in nanoseconds.
+
+    ``event_ns`` runs from feed arrival to the engine finishing the event;
+    ``decision_ns`` from feed arrival to each order leaving the portfolio.
+    """
+
+    __slots__ = ("event_ns", "decision_ns")
+
+    def __init__(self) -> None:
+        self.event_ns: List[int] = []
+        self.decision_ns: List[int] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": _latency_stats(self.event_ns),
+            "decisions": _latency_stats(self.decision_ns),
+        }
+
+
+class AsyncEngine(Engine):
+    """Run the engine off an asyncio feed and record decision latency.
+
+    ``data`` must provide ``events(bar_mode)`` -- an
+    :class:`AsyncReplayDataHandler` or :class:`AsyncSocketDataHandler`. Event
+    handling, lookahead checks and timings are the synchronous engine's.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.latency = LatencyRecorder()
+        self._arrival_ns = 0
+
+    async def run_async(self) -> LatencyRecorder:
+        started = perf_counter_ns()
+        handle = self._on_bar if self.bar_mode else self._on_market
+        record = self.latency.event_ns.append
+        events = 0
+        async for event, arrival in self.data.events(self.bar_mode):
+            self._arrival_ns = arrival
+            handle(event)
+            record(perf_counter_ns() - arrival)
+            events += 1
+        self._stream_position += events
+        self._finish_run(events)
+        self.timing.wall_ns += perf_counter_ns() - started
+        return self.latency
+
+    def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    def _plan_execution(self, order: OrderEvent, market_timestamp: int):
+        self.latency.decision_ns.append(perf_counter_ns() - self._arrival_ns)
+        return super()._plan_execution(order, market_timestamp)
+
+
+__all__ = [
+    "AsyncEngine",
+    "AsyncReplayDataHandler",
+    "AsyncSocketDataHandler",
+    "LatencyRecorder",
+    "decode_event",
+    "encode_event",
+    "serve_replay",
+]
@@ -2,24 +2,226 @@
 
 from __future__ import annotations
 
+import itertools
 import json
 import os
-from typing import Any, Dict
+import queue
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, TextIO
+
+import pandas as pd
+
+COLUMNAR_FORMATS = ("auto", "parquet", "arrow", "csv")
+_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+class _Sink:
+    """File handle plus optional write-behind thread.
+
+    Kept apart from :class:`JsonlWriter` so the exit hook can flush buffered
+    records without holding the writer alive.
+    """
+
+    def __init__(self, handle: TextIO, background: bool):
+        self.handle = handle
+        self.pending: List[Dict[str, Any]] = []
+        self.error: BaseException | None = None
+        self.queue: queue.Queue | None = None
+        self.worker: threading.Thread | None = None
+        if background:
+            self.queue = queue.Queue()
+            self.worker = threading.Thread(
+                target=self._drain, name="jsonl-writer", daemon=True
+            )
+            self.worker.start()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        self.handle.write("".join(json.dumps(obj) + "\n" for obj in batch))
+        self.handle.flush()
+
+    def _drain(self) -> None:
+        assert self.queue is not None
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is None:
+                    return
+                if self.error is None:
+                    self._write(batch)
+            except BaseException as exc:  # surfaced on the caller's next call
+                self.error = exc
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """Hand buffered records to the file (or the worker)."""
+        if self.pending:
+            batch, self.pending = self.pending, []
+            if self.queue is None:
+                self._write(batch)
+            else:
+                self.queue.put(batch)
+        self.raise_error()
+
+    def sync(self) -> None:
+        """Flush and wait until every record is on disk."""
+        self.flush()
+        if self.queue is not None:
+            self.queue.join()
+        self.raise_error()
+
+    def raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("trade log write failed") from error
+
+    def close(self) -> None:
+        if self.handle.closed:
+            return
+        try:
+            self.sync()
+        finally:
+            if self.queue is not None and self.worker is not None:
+                self.queue.put(None)
+                self.worker.join()
+            self.handle.close()
 
 
 class JsonlWriter:
-    """Append-only JSON Lines writer."""
+    """Append-only JSON Lines writer.
+
+    Records are buffered and written ``batch_size`` at a time; with
+    ``background=True`` a worker thread encodes and writes each batch so
+    :meth:`write` only appends to a list. :meth:`tell`, :meth:`truncate` and
+    :meth:`close` wait for queued records first, and buffered records are
+    still written if the writer is garbage collected or the interpreter
+    exits without :meth:`close`.
+    """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        append: bool = False,
+        *,
+        batch_size: int = 1,
+        background: bool = False,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive number of records")
         directory = os.path.dirname(path)
         if directory:
             os.makedirs(directory, exist_ok=True)
         self.path = path
-        self._handle = open(path, "w", encoding="utf-8")
+        self.batch_size = int(batch_size)
+        handle = open(path, "a" if append else "w", encoding="utf-8")
+        self._sink = _Sink(handle, background)
+        self._finalizer = weakref.finalize(self, self._sink.close)
 
     def write(self, obj: Dict[str, Any]) -> None:
-        self._handle.write(json.dumps(obj) + "\n")
-        self._handle.flush()
+        sink = self._sink
+        sink.pending.append(obj)
+        if len(sink.pending) >= self.batch_size:
+            sink.flush()
+
+    def flush(self) -> None:
+        """Write buffered records and wait until they are on disk."""
+        self._sink.sync()
+
+    def tell(self) -> int:
+        """Return the byte offset just past the last written record."""
+        self._sink.sync()
+        return os.fstat(self._sink.handle.fileno()).st_size
+
+    def truncate(self, offset: int) -> None:
+        """Drop records written after ``offset`` (used when resuming a run)."""
+        self._sink.sync()
+        handle = self._sink.handle
+        handle.truncate(offset)
+        handle.seek(offset)
 
     def close(self) -> None:
-        self._handle.close()
+        self._finalizer()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _resolve_format(fmt: str) -> str:
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{fmt}'")
+    if fmt == "csv":
+        return fmt
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:  # pragma: no cover - optional dependency
+        if fmt != "auto":
+            raise ImportError(f"{fmt} output requires pyarrow (pip install pyarrow)")
+        return "csv"
+    return "parquet" if fmt == "auto" else fmt
+
+
+def write_columnar(
+    jsonl_path: str | Path, fmt: str = "auto", *, chunk_rows: int = 65_536
+) -> str:
+    """Write the records of a JSON Lines file next to it in a columnar format.
+
+    ``"auto"`` picks Parquet when pyarrow is installed and CSV otherwise;
+    ``"arrow"`` writes an Arrow IPC (Feather v2) file. Returns the new path.
+
+    Parquet and Arrow output is parsed by pyarrow's block-wise JSON reader
+    straight into one columnar table, without a Python object per record.
+    CSV output converts ``chunk_rows`` records at a time, so only one chunk
+    is held in memory.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive number of records")
+    source = Path(jsonl_path)
+    resolved = _resolve_format(fmt)
+    target = source.with_suffix(_SUFFIXES[resolved])
+    if resolved == "csv":
+        _write_csv_chunks(source, target, chunk_rows)
+        return str(target)
+
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pa_parquet
+
+    if source.stat().st_size:
+        table = pa_json.read_json(source)
+    else:
+        table = pa.table({})
+    if resolved == "parquet":
+        pa_parquet.write_table(table, target)
+    else:
+        pa_feather.write_feather(table, target)
+    return str(target)
+
+
+def _write_csv_chunks(source: Path, target: Path, chunk_rows: int) -> None:
+    columns: List[str] | None = None
+    with (
+        source.open(encoding="utf-8") as handle,
+        target.open("w", encoding="utf-8", newline="") as out,
+    ):
+        while lines := list(itertools.islice(handle, chunk_rows)):
+            chunk = [json.loads(line) for line in lines if line.strip()]
+            if not chunk:
+                continue
+            frame = pd.DataFrame.from_records(chunk)
+            if columns is None:
+                columns = list(frame.columns)
+            elif not set(frame.columns) <= set(columns):
+                extra = sorted(set(frame.columns) - set(columns))
+                raise ValueError(f"records gained columns {extra} after the header")
+            frame.reindex(columns=columns).to_csv(
+                out, index=False, header=out.tell() == 0
+            )
+
+
+__all__ = ["COLUMNAR_FORMATS", "JsonlWriter", "write_columnar"]
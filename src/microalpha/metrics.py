@@ -8,11 +8,78 @@ from typing import Any, Dict, List, Mapping, Optional, Sequence
 import numpy as np
 import pandas as pd
 
+from .equity import EquityRecorder, OnlineEquityStats
 from .risk_stats import sharpe_stats
 
 
+def _equity_frame(equity_records) -> pd.DataFrame:
+    if isinstance(equity_records, EquityRecorder):
+        columns = equity_records.columns()
+        timestamps = columns["timestamp"]
+        if timestamps.size < 2 or bool(np.all(timestamps[1:] >= timestamps[:-1])):
+            # Already in time order: keep the first point per timestamp, with
+            # the row labels drop_duplicates would have left.
+            keep = np.ones(timestamps.size, dtype=bool)
+            keep[1:] = timestamps[1:] != timestamps[:-1]
+            rows = np.flatnonzero(keep)
+            return pd.DataFrame(
+                {name: col[rows] for name, col in columns.items()}, index=rows
+            )
+        equity_records = equity_records.to_frame()
+    df = pd.DataFrame(equity_records).drop_duplicates("timestamp")
+    return df.sort_values("timestamp")
+
+
+def _trade_stats(trades: Optional[List[Mapping[str, Any]]]) -> Dict[str, float]:
+    num_trades = 0
+    avg_trade_notional = 0.0
+    win_rate = 0.0
+    total_realized_pnl = 0.0
+    if trades:
+        tdf = pd.DataFrame(trades)
+        num_trades = int(len(tdf))
+        if num_trades:
+            avg_trade_notional = float((tdf["qty"].abs() * tdf["price"].abs()).mean())
+        # Realized PnL attribution if present
+        if "realized_pnl" in tdf:
+            total_realized_pnl = float(tdf["realized_pnl"].sum())
+            wins = (tdf["realized_pnl"] > 0).sum()
+            losses = (tdf["realized_pnl"] < 0).sum()
+            denom = max(wins + losses, 1)
+            win_rate = float(wins / denom)
+    return {
+        "num_trades": num_trades,
+        "avg_trade_notional": float(avg_trade_notional),
+        "win_rate": float(win_rate),
+        "total_realized_pnl": float(total_realized_pnl),
+    }
+
+
+def _online_metrics(
+    stats: OnlineEquityStats,
+    turnover: float,
+    periods: int,
+    trades: Optional[List[Mapping[str, Any]]],
+) -> Dict[str, Any]:
+    summary = stats.summary(periods)
+    points = summary.pop("points")
+    return {
+        "equity_df": pd.DataFrame([stats.last()]),
+        **summary,
+        "alpha": 0.0,
+        "beta": 0.0,
+        "information_ratio": 0.0,
+        "total_turnover": float(turnover),
+        "turnover_per_day": float(turnover / max(points, 1)),
+        **_trade_stats(trades),
+        "sharpe_hac_lags": 0.0,
+    }
+
+
 def compute_metrics(
-    equity_records: Sequence[Mapping[str, float | int]],
+    equity_records: (
+        Sequence[Mapping[str, float | int]] | EquityRecorder | OnlineEquityStats
+    ),
     turnover: float,
     periods: int = 252,
     trades: Optional[List[Mapping[str, Any]]] = None,
@@ -20,6 +87,20 @@ def compute_metrics(
     rf: float = 0.0,
     hac_lags: int | None = None,
 ) -> Dict[str, Any]:
+    """Summarise an equity curve (plus optional trades and benchmark).
+
+    ``equity_records`` may be a list of equity dicts, an
+    :class:`~microalpha.equity.EquityRecorder`, whose columns are used
+    directly, or an :class:`~microalpha.equity.OnlineEquityStats`, whose
+    running statistics are returned with iid Sharpe errors and a one-row
+    ``equity_df`` holding the final point.
+    """
+    if isinstance(equity_records, OnlineEquityStats) and equity_records:
+        if benchmark_equity or hac_lags is not None or rf:
+            raise ValueError(
+                "online equity stats support neither benchmarks, rf nor HAC lags"
+            )
+        return _online_metrics(equity_records, turnover, periods, trades)
     if not equity_records:
         df = pd.DataFrame(columns=["timestamp", "equity", "exposure", "returns"])
         return {
@@ -33,8 +114,7 @@ def compute_metrics(
             "final_equity": 0.0,
         }
 
-    df = pd.DataFrame(equity_records).drop_duplicates("timestamp")
-    df = df.sort_values("timestamp")
+    df = _equity_frame(equity_records)
     df["returns"] = df["equity"].pct_change().fillna(0.0)
 
     returns = df["returns"]
@@ -110,26 +190,6 @@ def compute_metrics(
         or 0
     )
 
-    # Trade stats (if provided)
-    num_trades = 0
-    avg_trade_notional = 0.0
-    win_rate = 0.0
-    total_realized_pnl = 0.0
-    if trades:
-        import pandas as _pd
-
-        tdf = _pd.DataFrame(trades)
-        num_trades = int(len(tdf))
-        if num_trades:
-            avg_trade_notional = float((tdf["qty"].abs() * tdf["price"].abs()).mean())
-        # Realized PnL attribution if present
-        if "realized_pnl" in tdf:
-            total_realized_pnl = float(tdf["realized_pnl"].sum())
-            wins = (tdf["realized_pnl"] > 0).sum()
-            losses = (tdf["realized_pnl"] < 0).sum()
-            denom = max(wins + losses, 1)
-            win_rate = float(wins / denom)
-
     # Benchmark-relative metrics if provided
     alpha = beta = information_ratio = 0.0
     if benchmark_equity:
@@ -177,10 +237,7 @@ def compute_metrics(
         "total_turnover": float(turnover),
         "turnover_per_day": float(turnover / max(len(df), 1)),
         "traded_days": traded_days,
-        "num_trades": num_trades,
-        "avg_trade_notional": float(avg_trade_notional),
-        "win_rate": float(win_rate),
-        "total_realized_pnl": float(total_realized_pnl),
+        **_trade_stats(trades),
         "final_equity": float(equity_series.iloc[-1]),
         "sharpe_ratio_se": sharpe_se,
         "sharpe_ratio_tstat": sharpe_tstat,
@@ -3,9 +3,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Mapping, cast
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    cast,
+)
 
-from .events import FillEvent, LookaheadError, MarketEvent, OrderEvent, SignalEvent
+import numpy as np
+
+from .book import ArrayBook, AvgCostView, PositionsView, running_sum
+from .equity import EQUITY_STORES, EquityRecorder, OnlineEquityStats
+from .events import (
+    BarEvent,
+    FillEvent,
+    LookaheadError,
+    MarketEvent,
+    OrderEvent,
+    SignalEvent,
+)
 from .logging import JsonlWriter
 from .market_metadata import SymbolMeta
 
@@ -14,6 +35,11 @@ if TYPE_CHECKING:
 
 NS_PER_DAY = 86_400_000_000_000
 TRADING_DAYS_PER_YEAR = 252
+BOOK_MODES = ("dict", "array")
+
+
+class MarkDriftError(RuntimeError):
+    """Raised when a reused mark no longer matches a full revaluation."""
 
 
 @dataclass
@@ -21,7 +47,37 @@ class PortfolioPosition:
     qty: int = 0
 
 
+def _is_target_weight(signal: SignalEvent) -> bool:
+    return bool(
+        signal.meta and "target_weight" in signal.meta and "qty" not in signal.meta
+    )
+
+
 class Portfolio:
+    """Track cash, positions and equity, and size orders from signals.
+
+    ``book="array"`` keeps positions in an :class:`~microalpha.book.ArrayBook`
+    so each mark-to-market is vectorised; ``positions`` and ``avg_cost`` then
+    become live mapping views with the same contents as the default dicts.
+
+    Prices are a function of the timestamp, so with ``incremental_marks=True``
+    (off by default) the book is revalued only when the timestamp moves or a
+    fill lands; further market events at the same timestamp reuse the running
+    market and gross values. Positions edited outside :meth:`on_fill` need
+    :meth:`invalidate_marks`. ``revalue_every=N`` cross-checks every Nth
+    reused mark against a full revaluation and raises
+    :class:`MarkDriftError` on any difference.
+
+    ``equity_store`` picks how ``equity_curve`` is kept: ``"records"`` (a
+    list of dicts), ``"columnar"`` (an :class:`~microalpha.equity.EquityRecorder`)
+    or ``"online"`` (running :class:`~microalpha.equity.OnlineEquityStats`
+    only).
+
+    With ``batch_rebalance`` the engine hands each bar's signals to
+    :meth:`on_rebalance`, which sizes ``target_weight`` signals together
+    instead of one :meth:`on_signal` call at a time.
+    """
+
     def __init__(
         self,
         data_handler,
@@ -43,12 +99,29 @@ class Portfolio:
         symbol_meta: Mapping[str, SymbolMeta] | None = None,
         borrow_cfg: Mapping[str, float | None] | object | None = None,
         order_flow: "OrderFlowDiagnostics | None" = None,
+        book: str = "dict",
+        incremental_marks: bool = False,
+        revalue_every: int | None = None,
+        equity_store: str = "records",
+        batch_rebalance: bool = False,
     ):
+        if book not in BOOK_MODES:
+            raise ValueError(f"Unknown book mode '{book}'")
+        if equity_store not in EQUITY_STORES:
+            raise ValueError(f"Unknown equity store '{equity_store}'")
+        if revalue_every is not None and revalue_every < 1:
+            raise ValueError("revalue_every must be a positive number of marks")
         self.data_handler = data_handler
         self.initial_cash = initial_cash
         self.cash = initial_cash
-        self.positions: Dict[str, PortfolioPosition] = {}
-        self.equity_curve: List[Dict[str, float | int]] = []
+        self._book = ArrayBook() if book == "array" else None
+        self.positions: MutableMapping[str, PortfolioPosition] = (
+            PositionsView(self._book) if self._book is not None else {}
+        )
+        self.equity_store = equity_store
+        self.equity_curve: (
+            List[Dict[str, float | int]] | EquityRecorder | OnlineEquityStats
+        ) = []
         self.current_time: int | None = None
         self.total_turnover = 0.0
         self.default_order_qty = default_order_qty
@@ -69,11 +142,17 @@ class Portfolio:
         self.commission_total: float = 0.0
         self.vol_target_annualized = vol_target_annualized
         self.vol_lookback = vol_lookback or 20
+        if equity_store == "columnar":
+            self.equity_curve = EquityRecorder()
+        elif equity_store == "online":
+            self.equity_curve = OnlineEquityStats(tail=self.vol_lookback)
         self.max_portfolio_heat = max_portfolio_heat
         self.sector_of: Dict[str, str] = sectors or {}
         self.max_positions_per_sector = max_positions_per_sector
         self.capital_policy = capital_policy
-        self.avg_cost: Dict[str, float] = {}
+        self.avg_cost: MutableMapping[str, float] = (
+            AvgCostView(self._book) if self._book is not None else {}
+        )
         self.cum_realized_pnl: float = 0.0
         self._symbol_meta: Dict[str, SymbolMeta] = {}
         if symbol_meta:
@@ -85,6 +164,13 @@ class Portfolio:
         self.borrow_fee_multiplier: float = 1.0
         self.order_flow = order_flow
         self._last_sizing_reject_reason: str | None = None
+        self.batch_rebalance = batch_rebalance
+        self.incremental_marks = incremental_marks
+        self.revalue_every = revalue_every
+        self.reused_marks = 0
+        self._fill_count = 0
+        # (timestamp, fill count, borrow applied) of the last full revaluation
+        self._marked_at: tuple[int, int, bool] | None = None
         if borrow_cfg is not None:
             if isinstance(borrow_cfg, Mapping):
                 self.borrow_fee_bps = (
@@ -122,6 +208,10 @@ class Portfolio:
             event.timestamp, apply_borrow_costs=True, overwrite_last=True
         )
 
+    def on_bar(self, bar: BarEvent) -> None:
+        """Mark the book once for a cross-sectional bar."""
+        self._record_equity(bar.timestamp, apply_borrow_costs=True, overwrite_last=True)
+
     def refresh_equity_after_fills(self, timestamp: int) -> None:
         """Refresh the latest equity snapshot after same-day fills."""
         self._record_equity(timestamp, apply_borrow_costs=False, overwrite_last=True)
@@ -134,19 +224,26 @@ class Portfolio:
         overwrite_last: bool,
     ) -> None:
         self.current_time = timestamp
-        market_value = 0.0
-        gross_market_value = 0.0
-        borrow_cost = 0.0
-        for symbol, position in self.positions.items():
-            price = self.data_handler.get_latest_price(symbol, timestamp)
-            if price is None:
-                continue
-            market_value += position.qty * price
-            gross_market_value += abs(position.qty * price)
-            if apply_borrow_costs:
-                borrow_cost += self._borrow_cost_for(
-                    symbol, position.qty, price, timestamp
-                )
+        marked = self._marked_at
+        if (
+            self.incremental_marks
+            and marked is not None
+            and marked[0] == timestamp
+            and marked[1] == self._fill_count
+            and (marked[2] or not apply_borrow_costs)
+        ):
+            # Same prices, same positions and borrow already accrued today.
+            market_value = self.market_value
+            gross_market_value = self.gross_market_value
+            borrow_cost = 0.0
+            self.reused_marks += 1
+            if self.revalue_every and self.reused_marks % self.revalue_every == 0:
+                self._check_marks(timestamp, apply_borrow_costs)
+        else:
+            market_value, gross_market_value, borrow_cost = self._revalue(
+                timestamp, apply_borrow_costs
+            )
+            self._marked_at = (timestamp, self._fill_count, apply_borrow_costs)
 
         if apply_borrow_costs and borrow_cost > 0.0:
             self.cash -= borrow_cost
@@ -169,6 +266,15 @@ class Portfolio:
         ):
             self.drawdown_halted = True
 
+        if not isinstance(self.equity_curve, list):
+            self.equity_curve.record(
+                timestamp,
+                total_equity,
+                exposure,
+                gross_exposure,
+                overwrite_last=overwrite_last,
+            )
+            return
         record = {
             "timestamp": timestamp,
             "equity": total_equity,
@@ -184,6 +290,90 @@ class Portfolio:
         else:
             self.equity_curve.append(record)
 
+    def invalidate_marks(self) -> None:
+        """Force the next mark to revalue every position."""
+        self._marked_at = None
+
+    def _check_marks(self, timestamp: int, apply_borrow_costs: bool) -> None:
+        expected = (self.market_value, self.gross_market_value, 0.0)
+        actual = self._revalue(timestamp, apply_borrow_costs)
+        if actual != expected:
+            raise MarkDriftError(
+                f"reused mark at {timestamp} is (market, gross, borrow)="
+                f"{expected} but a full revaluation gives {actual}; were positions "
+                "changed outside on_fill without invalidate_marks()?"
+            )
+
+    def _revalue(
+        self, timestamp: int, apply_borrow_costs: bool
+    ) -> tuple[float, float, float]:
+        """Price every position: ``(market_value, gross_value, borrow_cost)``."""
+        if self._book is not None:
+            return self._mark_book(timestamp, apply_borrow_costs)
+        market_value = 0.0
+        gross_market_value = 0.0
+        borrow_cost = 0.0
+        for symbol, position in self.positions.items():
+            price = self.data_handler.get_latest_price(symbol, timestamp)
+            if price is None:
+                continue
+            market_value += position.qty * price
+            gross_market_value += abs(position.qty * price)
+            if apply_borrow_costs:
+                borrow_cost += self._borrow_cost_for(
+                    symbol, position.qty, price, timestamp
+                )
+        return market_value, gross_market_value, borrow_cost
+
+    def _mark_book(
+        self, timestamp: int, apply_borrow_costs: bool
+    ) -> tuple[float, float, float]:
+        """Vectorised ``(market_value, gross_market_value, borrow_cost)``.
+
+        Sums run left to right in symbol-id order, the dict book's iteration
+        order, so both books produce identical floats.
+        """
+        book = self._book
+        assert book is not None
+        prices, priced = book.marks(self.data_handler, timestamp)
+        qty = book.qty[: book.size]
+        values = np.where(priced, qty * prices, 0.0)
+        market_value = running_sum(values)
+        gross_market_value = running_sum(np.abs(values))
+        if not apply_borrow_costs:
+            return market_value, gross_market_value, 0.0
+
+        rates = book.borrow_rates(self.borrow_rate_bps)
+        last_day = book.borrow_day[: book.size]
+        short = priced & (qty < 0) & ~np.isnan(rates)
+        last_day[priced & ~short] = -1
+        current_day = int(timestamp // NS_PER_DAY)
+        charged = np.flatnonzero(short & (last_day != current_day))
+        if not charged.size:
+            return market_value, gross_market_value, 0.0
+        prev_day = last_day[charged]
+        days = np.where(prev_day < 0, 1, np.maximum(current_day - prev_day, 1))
+        last_day[charged] = current_day
+        daily_rate = rates[charged] / 10_000.0 / TRADING_DAYS_PER_YEAR
+        notional = np.abs(qty[charged]) * prices[charged]
+        borrow_cost = running_sum(notional * daily_rate * days)
+        return market_value, gross_market_value, borrow_cost
+
+    def _book_marks_or_cost(
+        self, timestamp: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Quantities, latest prices falling back to average cost, and which
+        symbols had either."""
+        book = self._book
+        assert book is not None
+        prices, priced = book.marks(self.data_handler, timestamp)
+        avg_cost = book.avg_cost[: book.size]
+        return (
+            book.qty[: book.size],
+            np.where(priced, prices, avg_cost),
+            priced | ~np.isnan(avg_cost),
+        )
+
     def valuation_snapshot(
         self, timestamp: int | None = None
     ) -> tuple[float, float, float]:
@@ -191,6 +381,18 @@ class Portfolio:
         ts = self.current_time if timestamp is None else timestamp
         if ts is None:
             return 0.0, 0.0, 0.0
+        if self._book is not None:
+            qty, prices, known = self._book_marks_or_cost(ts)
+            valued = (qty != 0) & known
+            values = np.where(valued, qty * prices, 0.0)
+            avg_cost = self._book.avg_cost[: self._book.size]
+            avg_cost = np.where(np.isnan(avg_cost), prices, avg_cost)
+            unrealized = np.where(valued, (prices - avg_cost) * qty, 0.0)
+            return (
+                running_sum(values),
+                running_sum(np.abs(values)),
+                running_sum(unrealized),
+            )
         market_value = 0.0
         gross_market_value = 0.0
         unrealized_pnl = 0.0
@@ -212,9 +414,7 @@ class Portfolio:
         if self.current_time is not None and signal.timestamp < self.current_time:
             raise LookaheadError("Signal event timestamp is in the past.")
 
-        target_weight_request = bool(
-            signal.meta and "target_weight" in signal.meta and "qty" not in signal.meta
-        )
+        target_weight_request = _is_target_weight(signal)
         price = self.data_handler.get_latest_price(signal.symbol, signal.timestamp)
         if price is None:
             if self.order_flow:
@@ -416,6 +616,194 @@ class Portfolio:
             self.order_flow.record_order_created(order, signal=signal)
         return [order]
 
+    def on_rebalance(self, signals: Sequence[SignalEvent]) -> List[OrderEvent]:
+        """Size one rebalance's signals together and return its orders.
+
+        ``target_weight`` signals are sized in one vectorised pass against the
+        book as it stands, so the orders do not depend on signal order. Caps
+        apply to the whole target book: names are clipped to
+        ``max_single_name_weight``; new names beyond
+        ``max_positions_per_sector`` are dropped, smallest target first; all
+        targets are scaled down pro rata to fit ``max_exposure`` and
+        ``max_gross_leverage``; and trades are scaled pro rata to fit
+        ``turnover_cap``. If a symbol has several targets, the last one wins.
+        Other signals go through :meth:`on_signal`. Orders come back in
+        signal order.
+        """
+        batch = [idx for idx, signal in enumerate(signals) if _is_target_weight(signal)]
+        sized = dict(zip(batch, self._size_targets([signals[idx] for idx in batch])))
+        orders: List[OrderEvent] = []
+        for idx, signal in enumerate(signals):
+            if idx in sized:
+                order = sized[idx]
+                if order is not None:
+                    orders.append(order)
+            else:
+                orders.extend(self.on_signal(signal))
+        return orders
+
+    def _size_targets(self, signals: List[SignalEvent]) -> List[OrderEvent | None]:
+        order_flow = self.order_flow
+        count = len(signals)
+        price_of: List[float] = [np.nan] * count
+        weight_of: List[float] = [0.0] * count
+        qty_of: List[int] = [0] * count
+        last_for = {signal.symbol: idx for idx, signal in enumerate(signals)}
+        lookup = self.data_handler.get_latest_price
+        for idx, signal in enumerate(signals):
+            if self.current_time is not None and signal.timestamp < self.current_time:
+                raise LookaheadError("Signal event timestamp is in the past.")
+            if last_for[signal.symbol] != idx:
+                if order_flow:
+                    order_flow.record_order_drop("target_superseded", signal=signal)
+                continue
+            price = lookup(signal.symbol, signal.timestamp)
+            if price is None:
+                if order_flow:
+                    order_flow.record_order_drop("missing_price", signal=signal)
+                continue
+            price_of[idx] = price
+            weight_of[idx] = float(signal.meta["target_weight"])  # type: ignore[index]
+            position = self.positions.get(signal.symbol)
+            if position is not None:
+                qty_of[idx] = position.qty
+        prices = np.array(price_of, dtype=float)
+        weights = np.array(weight_of)
+        current = np.array(qty_of, dtype=np.int64)
+        live = ~np.isnan(prices)
+        prices = np.where(live, prices, 1.0)
+
+        equity = self.last_equity if self.last_equity else self.initial_cash
+        desired = np.zeros(count, dtype=np.int64)
+        if equity > 0:
+            desired[live] = (weights[live] * equity / prices[live]).astype(np.int64)
+        reasons: Dict[int, str] = {}
+
+        def clip(mask: np.ndarray, reason: str) -> None:
+            for idx in np.flatnonzero(mask & live).tolist():
+                reasons.setdefault(idx, reason)
+
+        if self.drawdown_halted:
+            growing = np.abs(desired) > np.abs(current)
+            clip(growing, "drawdown_halted")
+            desired = np.where(growing, current, desired)
+
+        if self.max_single_name_weight is not None and equity > 0:
+            limit = (float(self.max_single_name_weight) * equity / prices).astype(
+                np.int64
+            )
+            over = live & (np.abs(desired) > limit)
+            clip(over, "max_single_name_weight")
+            desired = np.where(over, np.sign(desired) * limit, desired)
+
+        if self.max_positions_per_sector and self.sector_of:
+            dropped = self._sector_overflow(
+                signals, desired, current, prices, live, self.max_positions_per_sector
+            )
+            clip(dropped, "max_positions_per_sector")
+            desired = np.where(dropped, 0, desired)
+
+        scale, reason = 1.0, None
+        notional = np.where(live, desired * prices, 0.0)
+        held = np.where(live, current * prices, 0.0)
+        if self.max_exposure is not None and equity > 0:
+            other = self.market_value - float(held.sum())
+            batch_net = float(notional.sum())
+            cap = float(self.max_exposure) * equity
+            if abs(other + batch_net) > cap and batch_net:
+                bound = cap if other + batch_net > 0 else -cap
+                scale = min(max((bound - other) / batch_net, 0.0), 1.0)
+                reason = "max_exposure"
+        if self.max_gross_leverage is not None and equity > 0:
+            current_gross = (
+                self.gross_market_value
+                if self.gross_market_value > 0.0
+                else self._estimate_gross_market_value()
+            )
+            other = current_gross - float(np.abs(held).sum())
+            batch_gross = float(np.abs(notional).sum())
+            cap = float(self.max_gross_leverage) * equity
+            if other + batch_gross > cap and batch_gross:
+                gross_scale = min(max((cap - other) / batch_gross, 0.0), 1.0)
+                if gross_scale < scale:
+                    scale, reason = gross_scale, "max_gross_leverage"
+        if reason is not None and scale < 1.0:
+            scaled = np.where(live, desired * scale, desired).astype(np.int64)
+            clip(scaled != desired, reason)
+            desired = scaled
+
+        delta = desired - current
+        if self.turnover_cap is not None:
+            traded = float((np.abs(delta) * prices)[live].sum())
+            if self.total_turnover + traded > self.turnover_cap and traded:
+                room = max(float(self.turnover_cap) - self.total_turnover, 0.0)
+                scaled = (delta * min(room / traded, 1.0)).astype(np.int64)
+                clip(scaled != delta, "turnover_cap")
+                delta = scaled
+
+        orders: List[OrderEvent | None] = [None] * count
+        quantities = delta.tolist()
+        for idx in np.flatnonzero(live).tolist():
+            signal = signals[idx]
+            qty = quantities[idx]
+            reason = reasons.get(idx)
+            if qty == 0:
+                if order_flow:
+                    order_flow.record_order_drop(
+                        reason or "target_weight_already_met",
+                        signal=signal,
+                        clipped_by_caps=reason is not None,
+                    )
+                continue
+            if reason is not None and order_flow:
+                order_flow.record_order_clip(reason, signal=signal)
+            side: Literal["BUY", "SELL"] = "BUY" if qty > 0 else "SELL"
+            order = OrderEvent(signal.timestamp, signal.symbol, abs(qty), side)
+            if order_flow:
+                order_flow.record_order_created(order, signal=signal)
+            orders[idx] = order
+        return orders
+
+    def _sector_overflow(
+        self,
+        signals: List[SignalEvent],
+        desired: np.ndarray,
+        current: np.ndarray,
+        prices: np.ndarray,
+        live: np.ndarray,
+        per_sector: int,
+    ) -> np.ndarray:
+        """Flag new names that would push a sector past ``per_sector`` names.
+
+        Held names always keep their slot; new names are admitted largest
+        target notional first, then by symbol.
+        """
+        live_of = live.tolist()
+        batch = {signal.symbol for idx, signal in enumerate(signals) if live_of[idx]}
+        open_in: Dict[str, int] = {}
+        for sym, pos in self.positions.items():
+            sector = self.sector_of.get(sym)
+            if sector and pos.qty != 0 and sym not in batch:
+                open_in[sector] = open_in.get(sector, 0) + 1
+        held = (current != 0).tolist()
+        sizes = np.where(live & (desired != 0), np.abs(desired * prices), 0.0).tolist()
+        candidates = []
+        for idx, signal in enumerate(signals):
+            sector = self.sector_of.get(signal.symbol)
+            if not sector or not sizes[idx]:
+                continue
+            if held[idx]:
+                open_in[sector] = open_in.get(sector, 0) + 1
+            else:
+                candidates.append((-sizes[idx], signal.symbol, idx, sector))
+        dropped = np.zeros(len(signals), dtype=bool)
+        for _, _, idx, sector in sorted(candidates):
+            if open_in.get(sector, 0) >= per_sector:
+                dropped[idx] = True
+            else:
+                open_in[sector] = open_in.get(sector, 0) + 1
+        return dropped
+
     def on_fill(self, fill: FillEvent) -> None:
         if self.current_time is not None and fill.timestamp < self.current_time:
             raise LookaheadError("Fill event timestamp is in the past.")
@@ -423,6 +811,7 @@ class Portfolio:
         position = self.positions.setdefault(fill.symbol, PortfolioPosition())
         prev_qty = position.qty
         position.qty += fill.qty
+        self._fill_count += 1
 
         trade_value = fill.price * fill.qty
         self.cash -= trade_value
@@ -506,20 +895,10 @@ class Portfolio:
             self._last_borrow_day.pop(key, None)
             return 0.0
 
-        meta = self._symbol_meta.get(key)
-        raw_bps = (
-            meta.borrow_fee_annual_bps if meta and meta.borrow_fee_annual_bps else None
-        )
-        if raw_bps is None and self.borrow_fee_bps is not None:
-            raw_bps = self.borrow_fee_bps
-        if raw_bps is None and self.borrow_fee_floor_bps is not None:
-            raw_bps = self.borrow_fee_floor_bps
-        if raw_bps is None or raw_bps <= 0:
+        effective_bps = self.borrow_rate_bps(symbol)
+        if effective_bps is None:
             self._last_borrow_day.pop(key, None)
             return 0.0
-        effective_bps = float(raw_bps) * self.borrow_fee_multiplier
-        if self.borrow_fee_floor_bps is not None:
-            effective_bps = max(effective_bps, float(self.borrow_fee_floor_bps))
 
         current_day = int(timestamp // NS_PER_DAY)
         prev_day = self._last_borrow_day.get(key)
@@ -539,10 +918,31 @@ class Portfolio:
         notional = abs(qty) * price
         return notional * daily_rate * days
 
+    def borrow_rate_bps(self, symbol: str) -> float | None:
+        """Effective annual borrow fee for shorting ``symbol``, or ``None`` if free."""
+        meta = self._symbol_meta.get(symbol.upper())
+        raw_bps = (
+            meta.borrow_fee_annual_bps if meta and meta.borrow_fee_annual_bps else None
+        )
+        if raw_bps is None and self.borrow_fee_bps is not None:
+            raw_bps = self.borrow_fee_bps
+        if raw_bps is None and self.borrow_fee_floor_bps is not None:
+            raw_bps = self.borrow_fee_floor_bps
+        if raw_bps is None or raw_bps <= 0:
+            return None
+        effective_bps = float(raw_bps) * self.borrow_fee_multiplier
+        if self.borrow_fee_floor_bps is not None:
+            effective_bps = max(effective_bps, float(self.borrow_fee_floor_bps))
+        return effective_bps
+
     def _estimate_gross_market_value(self) -> float:
         gross_value = 0.0
         if self.current_time is None:
             return gross_value
+        if self._book is not None:
+            qty, prices, known = self._book_marks_or_cost(self.current_time)
+            valued = (qty != 0) & known
+            return running_sum(np.where(valued, np.abs(qty) * prices, 0.0))
         for sym, pos in self.positions.items():
             if pos.qty == 0:
                 continue
@@ -601,9 +1001,12 @@ class Portfolio:
             # Approximate daily vol from equity history
             import pandas as _pd
 
-            eq = _pd.DataFrame(self.equity_curve)
+            if isinstance(self.equity_curve, list):
+                eq = _pd.DataFrame(self.equity_curve).tail(self.vol_lookback)
+            else:
+                tail = self.equity_curve.tail_equity(self.vol_lookback)
+                eq = _pd.DataFrame({"equity": tail})
             if not eq.empty:
-                eq = eq.tail(self.vol_lookback)
                 ret = eq["equity"].pct_change().dropna()
                 if not ret.empty:
                     ann_vol = float(ret.std(ddof=0) * (252**0.5))
@@ -615,14 +1018,23 @@ class Portfolio:
         if self.max_portfolio_heat and price:
             projected_pos_value = abs(base) * price
             current_heat_value = 0.0
-            for sym, pos in self.positions.items():
-                p = (
-                    self.data_handler.get_latest_price(sym, self.current_time)
-                    if self.current_time is not None
-                    else None
-                )
-                if p:
-                    current_heat_value += abs(pos.qty) * p
+            if self._book is not None:
+                if self.current_time is not None:
+                    marks, priced = self._book.marks(
+                        self.data_handler, self.current_time
+                    )
+                    qty = self._book.qty[: self._book.size]
+                    heat = np.where(priced, np.abs(qty) * marks, 0.0)
+                    current_heat_value = running_sum(heat)
+            else:
+                for sym, pos in self.positions.items():
+                    p = (
+                        self.data_handler.get_latest_price(sym, self.current_time)
+                        if self.current_time is not None
+                        else None
+                    )
+                    if p:
+                        current_heat_value += abs(pos.qty) * p
             projected_heat = (current_heat_value + projected_pos_value) / max(
                 self.last_equity, 1e-9
             )
@@ -16,6 +16,7 @@ import yaml
 
 from .broker import SimulatedBroker
 from .capital import VolatilityScaledPolicy
+from .checkpoint import CHECKPOINT_FILENAME, ENGINE_STATE_FILENAME, discard_checkpoint
 from .config import CapitalPolicyCfg, SlippageCfg, parse_config
 from .data import CsvDataHandler, MultiCsvDataHandler
 from .engine import Engine
@@ -30,11 +31,12 @@ from .execution import (
 )
 from .execution_safety import evaluate_execution_safety
 from .integrity import evaluate_portfolio_integrity
-from .logging import JsonlWriter
+from .logging import JsonlWriter, write_columnar
 from .manifest import (
     build as build_manifest,
     extract_config_summary,
     generate_run_id,
+    load_manifest_path,
     resolve_git_sha,
     write as write_manifest,
 )
@@ -54,6 +56,8 @@ from .strategies.cs_momentum import CrossSectionalMomentum
 from .strategies.flagship_momentum import FlagshipMomentumStrategy
 from .strategies.meanrev import MeanReversionStrategy
 from .strategies.mm import NaiveMarketMakingStrategy
+from .timing import EngineTiming
+from .trace import TRACE_FILENAME, TraceRecorder
 from .wrds import guard_no_wrds_copy
 
 STRATEGY_MAPPING = {
@@ -78,15 +82,31 @@ EXECUTION_MAPPING = {
 
 
 def run_from_config(
-    config_path: str, override_artifacts_dir: str | None = None
+    config_path: str,
+    override_artifacts_dir: str | None = None,
+    data_load_workers: int | None = None,
+    resume: str | None = None,
+    extend: str | None = None,
 ) -> Dict[str, Any]:
-    """Execute a backtest described by ``config_path``."""
+    """Execute a backtest described by ``config_path``.
+
+    ``data_load_workers`` overrides the config's CSV loader thread count.
+    ``resume`` names the artifacts directory of an interrupted run of the same
+    config; the run continues from its last checkpoint (or restarts in place
+    when none was written) and produces the same artifacts as an
+    uninterrupted run. ``extend`` names the artifacts directory of an earlier
+    ``incremental`` run of the same config (``end_date`` may move forward):
+    its saved engine state is restored and only the newer bars are replayed,
+    appending to its trade log and rewriting its equity curve and metrics.
+    """
 
     cfg_path = Path(config_path).expanduser().resolve()
     with cfg_path.open("r", encoding="utf-8") as handle:
         config = yaml.safe_load(handle)
 
     cfg = parse_config(config)
+    if data_load_workers is not None:
+        cfg = parse_config({**config, "data_load_workers": data_load_workers})
     unsafe_execution, unsafe_reasons, exec_alignment = evaluate_execution_safety(
         cfg.exec
     )
@@ -95,8 +115,16 @@ def run_from_config(
             "Unsafe execution mode detected (same-bar fills enabled). "
             "Set allow_unsafe_execution: true to proceed."
         )
+    if resume is not None and extend is not None:
+        raise ValueError("resume and extend are mutually exclusive")
     cfg_bytes = yaml.safe_dump(config).encode("utf-8")
     config_hash = hashlib.sha256(cfg_bytes).hexdigest()
+    # Incremental runs may only move the end of the window forward.
+    incremental_key = hashlib.sha256(
+        yaml.safe_dump({k: v for k, v in config.items() if k != "end_date"}).encode(
+            "utf-8"
+        )
+    ).hexdigest()
 
     full_sha, short_sha = resolve_git_sha()
     base_run_id = generate_run_id(short_sha)
@@ -105,7 +133,12 @@ def run_from_config(
         config = dict(config)
         config["artifacts_dir"] = override_artifacts_dir
 
-    run_id, artifacts_dir = prepare_artifacts_dir(cfg_path, config, base_run_id)
+    if resume is not None:
+        run_id, artifacts_dir = resume_artifacts_dir(resume, config_hash)
+    elif extend is not None:
+        run_id, artifacts_dir = resume_artifacts_dir(extend, None)
+    else:
+        run_id, artifacts_dir = prepare_artifacts_dir(cfg_path, config, base_run_id)
     manifest = build_manifest(
         cfg.seed,
         str(cfg_path),
@@ -118,10 +151,23 @@ def run_from_config(
         execution_alignment=exec_alignment,
     )
     root_rng = np.random.default_rng(manifest.seed)
-    write_manifest(manifest, str(artifacts_dir))
-    persist_config(cfg_path, artifacts_dir)
+    if resume is None and extend is None:
+        write_manifest(manifest, str(artifacts_dir))
+    if resume is None:
+        persist_config(cfg_path, artifacts_dir)
+    checkpoint_path = artifacts_dir / CHECKPOINT_FILENAME
+    state_path = artifacts_dir / ENGINE_STATE_FILENAME
+    resuming = resume is not None and checkpoint_path.exists()
+    if extend is not None and not state_path.exists():
+        raise FileNotFoundError(
+            f"No engine state to extend in {artifacts_dir}; "
+            "the original run needs incremental: true"
+        )
 
     data_dir = resolve_path(cfg.data_path, cfg_path)
+    cache_dir = (
+        resolve_path(cfg.data_cache_dir, cfg_path) if cfg.data_cache_dir else None
+    )
 
     symbol = cfg.symbol
     initial_cash = cfg.cash
@@ -178,9 +224,23 @@ def run_from_config(
         symbols = strategy_params.get("symbols") or config.get("symbols") or [symbol]
         symbols = [str(sym).upper() for sym in symbols]
         strategy_params["symbols"] = symbols
-        data_handler = MultiCsvDataHandler(csv_dir=data_dir, symbols=symbols)
+        data_handler = MultiCsvDataHandler(
+            csv_dir=data_dir,
+            symbols=symbols,
+            cache_dir=cache_dir,
+            stream_mode=cfg.data_stream_mode,
+            lazy=cfg.data_lazy_load,
+            memory_budget_mb=cfg.data_memory_budget_mb,
+            load_workers=cfg.data_load_workers,
+            csv_engine=cfg.data_csv_engine,
+        )
     else:
-        data_handler = CsvDataHandler(csv_dir=data_dir, symbol=symbol)
+        data_handler = CsvDataHandler(
+            csv_dir=data_dir,
+            symbol=symbol,
+            cache_dir=cache_dir,
+            csv_engine=cfg.data_csv_engine,
+        )
     if cfg.start_date or cfg.end_date:
         data_handler.set_date_range(cfg.start_date, cfg.end_date)
     if data_handler.data is None:
@@ -188,7 +248,21 @@ def run_from_config(
             f"Unable to load data for symbol '{symbol}' from {data_dir}"
         )
 
-    trade_logger = JsonlWriter(str(artifacts_dir / "trades.jsonl"))
+    trade_logger = JsonlWriter(
+        str(artifacts_dir / "trades.jsonl"),
+        append=resuming or extend is not None,
+        batch_size=cfg.trade_log.batch_size,
+        background=cfg.trade_log.background,
+    )
+    tracer: TraceRecorder | None = None
+    if cfg.trace is not None:
+        tracer = TraceRecorder(
+            artifacts_dir / TRACE_FILENAME,
+            sample_rate=cfg.trace.sample_rate,
+            symbols=cfg.trace.symbols,
+            capacity=cfg.trace.buffer_events,
+            append=resuming or extend is not None,
+        )
     capital_policy = resolve_capital_policy(cfg.capital_policy)
 
     order_flow = OrderFlowDiagnostics() if cfg.order_flow_diagnostics else None
@@ -211,6 +285,11 @@ def run_from_config(
         symbol_meta=symbol_meta,
         borrow_cfg=cfg.borrow,
         order_flow=order_flow,
+        book=cfg.portfolio_book,
+        incremental_marks=cfg.portfolio_incremental_marks,
+        revalue_every=cfg.portfolio_revalue_every,
+        equity_store=cfg.portfolio_equity_store,
+        batch_rebalance=cfg.portfolio_batch_rebalance,
     )
     exec_type = cfg.exec.type.lower() if cfg.exec.type else "instant"
     executor_cls = EXECUTION_MAPPING.get(exec_type, Executor)
@@ -290,10 +369,43 @@ def run_from_config(
 
     _os.environ["MICROALPHA_ARTIFACTS_DIR"] = str(artifacts_dir)
 
-    engine = Engine(data_handler, strategy, portfolio, broker, rng=engine_rng)
+    engine = Engine(
+        data_handler,
+        strategy,
+        portfolio,
+        broker,
+        rng=engine_rng,
+        bar_mode=cfg.bar_mode,
+        checkpoint_path=checkpoint_path if cfg.checkpoint_every else None,
+        checkpoint_every=cfg.checkpoint_every,
+        trace=tracer,
+    )
+    if resuming:
+        engine.restore(checkpoint_path)
+    elif extend is not None:
+        metadata = engine.restore(state_path, from_clock=True)
+        if metadata.get("config_key") != incremental_key:
+            raise ValueError(
+                f"Cannot extend {artifacts_dir}: it was produced by a different config"
+            )
+    strategy, portfolio = engine.strategy, engine.portfolio
+    order_flow = portfolio.order_flow
+    if cfg.incremental:
+        boundary = _incremental_boundary(data_handler, executor)
+        if boundary is not None:
+            engine.snapshot_before(
+                boundary, state_path, metadata={"config_key": incremental_key}
+            )
     engine.run()
+    discard_checkpoint(checkpoint_path)
+    engine_timing_path = _persist_engine_timing(engine.timing, artifacts_dir)
 
     trade_logger.close()
+    trades_columnar_path: str | None = None
+    if cfg.trade_log.columnar is not None:
+        trades_columnar_path = write_columnar(trade_logger.path, cfg.trade_log.columnar)
+    if tracer is not None:
+        tracer.close()
 
     filter_diagnostics: Dict[str, Any] | None = None
     if hasattr(strategy, "get_filter_diagnostics"):
@@ -376,8 +488,11 @@ def run_from_config(
             "factor_exposure_path": factor_path,
             "bootstrap_path": bootstrap_path,
             "trades_path": trades_path,
+            "trades_columnar_path": trades_columnar_path,
             "integrity_path": integrity_path,
             "order_flow_diagnostics_path": order_flow_path,
+            "engine_timing_path": engine_timing_path,
+            "trace_path": str(tracer.path) if tracer is not None else None,
         }
     )
     return result
@@ -404,6 +519,47 @@ def prepare_artifacts_dir(
     return candidate_run_id, candidate
 
 
+def resume_artifacts_dir(resume_dir: str, config_hash: str | None) -> tuple[str, Path]:
+    """Return ``(run_id, artifacts_dir)`` of an earlier run to continue.
+
+    When ``config_hash`` is given it must match the run's manifest.
+    """
+
+    artifacts_dir = Path(resume_dir).expanduser().resolve()
+    manifest_path = artifacts_dir / "manifest.json"
+    if not manifest_path.is_file():
+        raise FileNotFoundError(
+            f"Cannot resume {artifacts_dir}: no manifest at {manifest_path}"
+        )
+    manifest = load_manifest_path(manifest_path)
+    if config_hash is not None and manifest.get("config_sha256") != config_hash:
+        raise ValueError(
+            f"Cannot resume {artifacts_dir}: it was produced by a different config"
+        )
+    return str(manifest.get("run_id") or artifacts_dir.name), artifacts_dir
+
+
+def _incremental_boundary(data_handler, executor) -> int | None:
+    """First timestamp whose replay can change once newer bars are appended.
+
+    Orders placed within the last ``slices`` prints of a symbol that is still
+    trading were planned against a truncated future (next-print fills, TWAP
+    slices), so incremental runs keep the engine state from just before it.
+    """
+
+    end = data_handler.last_timestamps(1)
+    if not end:
+        return None
+    horizon = max(int(getattr(executor, "slices", 1) or 1), 1)
+    symbols = getattr(data_handler, "symbols", None) or [data_handler.symbol]
+    boundary = end[-1]
+    for symbol in symbols:
+        tail = data_handler.last_timestamps(horizon, symbol=symbol)
+        if tail and tail[-1] == end[-1]:
+            boundary = min(boundary, tail[0])
+    return boundary
+
+
 def persist_config(cfg_path: Path, artifacts_dir: Path) -> None:
     destination = artifacts_dir / cfg_path.name
     guard_no_wrds_copy(cfg_path, operation="copy")
@@ -473,6 +629,23 @@ def _update_manifest_order_flow(
         json.dump(payload, handle, indent=2)
 
 
+def _persist_engine_timing(timing: EngineTiming, artifacts_dir: Path) -> str:
+    # Wall-clock figures stay out of manifest.json so identical runs keep
+    # identical manifests; the manifest only points at this file.
+    path = artifacts_dir / "engine_timing.json"
+    payload = timing.to_dict()
+    payload["summary"] = timing.summary()
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+    manifest_path = artifacts_dir / "manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["engine_timing_path"] = str(path)
+        with manifest_path.open("w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+    return str(path)
+
+
 def _persist_order_flow_diagnostics(
     order_flow: OrderFlowDiagnostics,
     artifacts_dir: Path,
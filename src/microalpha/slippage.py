@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, Mapping
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
 
 from .market_metadata import SymbolMeta
 
@@ -35,6 +37,24 @@ class SlippageModel:
 
         raise NotImplementedError
 
+    def calculate_slippage_array(
+        self,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        symbols: Sequence[str | None],
+    ) -> np.ndarray:
+        """Element-wise :meth:`calculate_slippage` for aligned order arrays."""
+
+        return np.array(
+            [
+                self.calculate_slippage(int(qty), float(price), symbol=symbol)
+                for qty, price, symbol in zip(
+                    quantities.tolist(), prices.tolist(), symbols
+                )
+            ],
+            dtype=float,
+        )
+
     # -- metadata helpers -------------------------------------------------
     def update_metadata(self, metadata: Mapping[str, SymbolMeta]) -> None:
         for symbol, meta in metadata.items():
@@ -64,6 +84,15 @@ class VolumeSlippageModel(SlippageModel):
         magnitude = self.price_impact * (abs(quantity) ** 2)
         return math.copysign(magnitude, quantity)
 
+    def calculate_slippage_array(
+        self,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        symbols: Sequence[str | None],
+    ) -> np.ndarray:
+        magnitude = self.price_impact * (np.abs(quantities) ** 2)
+        return np.copysign(magnitude, quantities)
+
 
 class _ImpactBase(SlippageModel):
     def __init__(
@@ -96,6 +125,34 @@ class _ImpactBase(SlippageModel):
         magnitude = (impact_bps / 10_000.0) * price
         return math.copysign(magnitude, quantity)
 
+    def _impact_bps(self, ratio: np.ndarray) -> np.ndarray | None:
+        """Pre-floor impact in bps for an array of ``|qty| / adv`` ratios.
+
+        Subclasses without a closed form return ``None`` and are priced
+        order by order through :meth:`calculate_slippage`.
+        """
+
+        return None
+
+    def calculate_slippage_array(
+        self,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        symbols: Sequence[str | None],
+    ) -> np.ndarray:
+        metas = [self.get_metadata(symbol) for symbol in symbols]
+        adv = np.array([self._effective_adv(meta) for meta in metas], dtype=float)
+        spread = np.array(
+            [self._effective_spread_bps(meta) for meta in metas], dtype=float
+        )
+        ratio = np.abs(quantities) / np.maximum(adv, 1e-9)
+        raw_bps = self._impact_bps(ratio)
+        if raw_bps is None:
+            return super().calculate_slippage_array(quantities, prices, symbols)
+        floor = self.spread_floor_multiplier * spread
+        impact_bps = np.maximum(floor, raw_bps)
+        return np.copysign((impact_bps / 10_000.0) * prices, quantities)
+
 
 class LinearImpact(_ImpactBase):
     """Linear impact respecting a spread floor."""
@@ -127,6 +184,9 @@ class LinearImpact(_ImpactBase):
         impact_bps = self._apply_floor(self.k_lin * ratio, spread_bps)
         return self._bps_to_price(impact_bps, price, quantity)
 
+    def _impact_bps(self, ratio: np.ndarray) -> np.ndarray:
+        return self.k_lin * ratio
+
 
 class SquareRootImpact(_ImpactBase):
     """Square-root impact with spread floor."""
@@ -158,6 +218,9 @@ class SquareRootImpact(_ImpactBase):
         impact_bps = self._apply_floor(self.eta * math.sqrt(ratio), spread_bps)
         return self._bps_to_price(impact_bps, price, quantity)
 
+    def _impact_bps(self, ratio: np.ndarray) -> np.ndarray:
+        return self.eta * np.sqrt(ratio)
+
 
 class LinearPlusSqrtImpact(_ImpactBase):
     """Hybrid linear + square-root impact with spread floor."""
@@ -192,3 +255,6 @@ class LinearPlusSqrtImpact(_ImpactBase):
         sqrt_bps = self.eta * math.sqrt(ratio)
         impact_bps = self._apply_floor(linear_bps + sqrt_bps, spread_bps)
         return self._bps_to_price(impact_bps, price, quantity)
+
+    def _impact_bps(self, ratio: np.ndarray) -> np.ndarray:
+        return self.k_lin * ratio + self.eta * np.sqrt(ratio)
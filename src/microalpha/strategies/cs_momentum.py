@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List, Sequence
 
+import numpy as np
 import pandas as pd
 
 from ..events import SignalEvent
@@ -11,7 +12,10 @@ class CrossSectionalMomentum:
     """12-1 style cross-sectional momentum with monthly rebalance.
 
     Emits LONG signals for top `top_frac` fraction by trailing return over
-    `lookback_months` excluding the most recent `skip_months`.
+    `lookback_months` excluding the most recent `skip_months`. With
+    `target_gross` set, every rebalance instead emits `target_weight` signals
+    that split the gross equally across the selected names (negative for
+    shorts) and `target_weight` 0.0 EXITs for names leaving the book.
     """
 
     symbols: Sequence[str]
@@ -20,6 +24,7 @@ class CrossSectionalMomentum:
     top_frac: float = 0.3
     bottom_frac: float | None = None
     long_short: bool = True
+    target_gross: float | None = None
 
     # State
     price_history: Dict[str, List[float]]
@@ -35,6 +40,7 @@ class CrossSectionalMomentum:
         bottom_frac: float | None = None,
         long_short: bool = True,
         warmup_history: Dict[str, Sequence[float]] | None = None,
+        target_gross: float | None = None,
     ):
         self.symbols = list(symbols)
         self.lookback_months = lookback_months
@@ -42,6 +48,7 @@ class CrossSectionalMomentum:
         self.top_frac = top_frac
         self.bottom_frac = bottom_frac if bottom_frac is not None else top_frac
         self.long_short = bool(long_short)
+        self.target_gross = float(target_gross) if target_gross is not None else None
         self.price_history = {
             s: list(warmup_history.get(s, [])) if warmup_history else []
             for s in self.symbols
@@ -51,8 +58,10 @@ class CrossSectionalMomentum:
         self.last_month = None
 
     def _rebalance_needed(self, ts_ns: int) -> bool:
-        ts = pd.to_datetime(ts_ns)
-        month_key = ts.year * 100 + ts.month
+        # Called on every bar: avoid building a pandas Timestamp per call.
+        month = np.datetime64(int(ts_ns), "ns").astype("datetime64[M]")
+        months = int(month.astype(np.int64))
+        month_key = (1970 + months // 12) * 100 + months % 12 + 1
         if self.last_month is None or self.last_month != month_key:
             self.last_month = month_key
             return True
@@ -79,10 +88,30 @@ class CrossSectionalMomentum:
         if event.symbol not in self.symbols:
             return []
         self.price_history[event.symbol].append(event.price)
-        signals: List[SignalEvent] = []
 
         if not self._rebalance_needed(event.timestamp):
             return []
+        return self._rebalance(event.timestamp)
+
+    def on_bar(
+        self,
+        timestamp: int,
+        symbols: Sequence[str],
+        prices: np.ndarray,
+        volumes: np.ndarray,
+    ) -> List[SignalEvent]:
+        """Update every symbol in the bar, then rebalance at most once."""
+        for sym, price in zip(symbols, prices.tolist()):
+            history = self.price_history.get(sym)
+            if history is not None:
+                history.append(price)
+
+        if not self._rebalance_needed(timestamp):
+            return []
+        return self._rebalance(timestamp)
+
+    def _rebalance(self, timestamp: int) -> List[SignalEvent]:
+        signals: List[SignalEvent] = []
 
         # Compute scores
         scores: Dict[str, float] = {}
@@ -100,6 +129,9 @@ class CrossSectionalMomentum:
             k_bot = max(1, int(len(valid) * self.bottom_frac))
             bottom = set(sorted(valid, key=lambda sym: valid[sym])[:k_bot])
 
+        if self.target_gross is not None:
+            return self._target_weight_signals(timestamp, top, bottom - top)
+
         # Emit signals: LONG for top, SHORT for bottom, EXIT when leaving sets
         for sym in self.symbols:
             st = self.invested.get(sym, 0)
@@ -107,22 +139,46 @@ class CrossSectionalMomentum:
                 if st <= 0:
                     # exit short if any
                     if st < 0:
-                        signals.append(SignalEvent(event.timestamp, sym, "EXIT"))
+                        signals.append(SignalEvent(timestamp, sym, "EXIT"))
                     self.invested[sym] = 1
-                    signals.append(
-                        SignalEvent(event.timestamp, sym, "LONG", meta={"qty": 1})
-                    )
+                    signals.append(SignalEvent(timestamp, sym, "LONG", meta={"qty": 1}))
             elif sym in bottom and self.long_short:
                 if st >= 0:
                     if st > 0:
-                        signals.append(SignalEvent(event.timestamp, sym, "EXIT"))
+                        signals.append(SignalEvent(timestamp, sym, "EXIT"))
                     self.invested[sym] = -1
                     signals.append(
-                        SignalEvent(event.timestamp, sym, "SHORT", meta={"qty": 1})
+                        SignalEvent(timestamp, sym, "SHORT", meta={"qty": 1})
                     )
             else:
                 if st != 0:
                     self.invested[sym] = 0
-                    signals.append(SignalEvent(event.timestamp, sym, "EXIT"))
+                    signals.append(SignalEvent(timestamp, sym, "EXIT"))
+
+        return signals
 
+    def _target_weight_signals(
+        self, timestamp: int, top: set[str], bottom: set[str]
+    ) -> List[SignalEvent]:
+        assert self.target_gross is not None
+        weight = self.target_gross / (len(top) + len(bottom))
+        signals: List[SignalEvent] = []
+        for sym in self.symbols:
+            if sym in top:
+                self.invested[sym] = 1
+                signals.append(
+                    SignalEvent(timestamp, sym, "LONG", meta={"target_weight": weight})
+                )
+            elif sym in bottom:
+                self.invested[sym] = -1
+                signals.append(
+                    SignalEvent(
+                        timestamp, sym, "SHORT", meta={"target_weight": -weight}
+                    )
+                )
+            elif self.invested.get(sym, 0) != 0:
+                self.invested[sym] = 0
+                signals.append(
+                    SignalEvent(timestamp, sym, "EXIT", meta={"target_weight": 0.0})
+                )
         return signals
@@ -174,12 +174,31 @@ class FlagshipMomentumStrategy:
         if event.symbol not in self.symbol_set:
             return []
 
-        history = self.price_history.setdefault(event.symbol, [])
-        history.append(float(event.price))
+        self._append_price(event.symbol, float(event.price))
+        return self._maybe_rebalance(event.timestamp)
+
+    def on_bar(
+        self,
+        timestamp: int,
+        symbols: Sequence[str],
+        prices: np.ndarray,
+        volumes: np.ndarray,
+    ) -> List[SignalEvent]:
+        """Append the whole cross-section, then check the rebalance calendar once."""
+        symbol_set = self.symbol_set
+        for symbol, price in zip(symbols, prices.tolist()):
+            if symbol in symbol_set:
+                self._append_price(symbol, float(price))
+        return self._maybe_rebalance(timestamp)
+
+    def _append_price(self, symbol: str, price: float) -> None:
+        history = self.price_history.setdefault(symbol, [])
+        history.append(price)
         if len(history) > self.max_history:
             del history[: -self.max_history]
 
-        timestamp = pd.to_datetime(event.timestamp)
+    def _maybe_rebalance(self, event_timestamp: int) -> List[SignalEvent]:
+        timestamp = pd.to_datetime(event_timestamp)
         period_end = (
             timestamp.to_period(self.rebalance_frequency)
             .to_timestamp(how="end")
@@ -192,7 +211,7 @@ class FlagshipMomentumStrategy:
         if period_end <= self.last_period:
             return []
 
-        signals = self._rebalance(period_end, event.timestamp)
+        signals = self._rebalance(period_end, event_timestamp)
         self.last_period = period_end
         return signals
 
@@ -0,0 +1,108 @@
+"""Lightweight per-phase timers for the event loop."""
+
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, Mapping
+
+PHASES = (
+    "mark",
+    "strategy",
+    "planning",
+    "materialize",
+    "order_flow",
+    "equity_refresh",
+)
+MARK, STRATEGY, PLANNING, MATERIALIZE, ORDER_FLOW, EQUITY_REFRESH = range(len(PHASES))
+
+
+class EngineTiming:
+    """Accumulate wall time and call counts for each engine phase.
+
+    Phases are timed exclusively with ``perf_counter_ns``: ``mark`` is the
+    portfolio mark-to-market, ``planning`` covers ``portfolio.on_signal`` and
+    broker planning, ``materialize`` covers fill materialization and
+    ``portfolio.on_fill``, ``order_flow`` the diagnostics hooks and
+    ``equity_refresh`` post-fill equity updates. Time not attributed to a
+    phase (mostly pulling events from the data handler) is reported as
+    ``unattributed``.
+    """
+
+    __slots__ = ("ns", "calls", "events", "runs", "wall_ns")
+
+    def __init__(self) -> None:
+        self.ns = [0] * len(PHASES)
+        self.calls = [0] * len(PHASES)
+        self.events = 0
+        self.runs = 0
+        self.wall_ns = 0
+
+    def lap(self, phase: int, start: int) -> int:
+        """Charge ``now - start`` to ``phase`` and return ``now``."""
+        now = perf_counter_ns()
+        self.ns[phase] += now - start
+        self.calls[phase] += 1
+        return now
+
+    def merge(self, other: "EngineTiming") -> "EngineTiming":
+        for idx in range(len(PHASES)):
+            self.ns[idx] += other.ns[idx]
+            self.calls[idx] += other.calls[idx]
+        self.events += other.events
+        self.runs += other.runs
+        self.wall_ns += other.wall_ns
+        return self
+
+    @classmethod
+    def combined(cls, timings: Iterable["EngineTiming"]) -> "EngineTiming":
+        total = cls()
+        for timing in timings:
+            total.merge(timing)
+        return total
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self.wall_ns
+        phases: Dict[str, Dict[str, Any]] = {}
+        for name, ns, calls in zip(PHASES, self.ns, self.calls):
+            phases[name] = {
+                "seconds": round(ns / 1e9, 6),
+                "calls": calls,
+                "mean_us": round(ns / calls / 1e3, 3) if calls else 0.0,
+                "share": round(ns / wall, 4) if wall else 0.0,
+            }
+        unattributed = max(wall - sum(self.ns), 0)
+        return {
+            "runs": self.runs,
+            "events": self.events,
+            "wall_seconds": round(wall / 1e9, 6),
+            "events_per_second": round(self.events / (wall / 1e9), 1) if wall else 0.0,
+            "unattributed_seconds": round(unattributed / 1e9, 6),
+            "phases": phases,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact view for manifests: wall time, throughput and the top phase."""
+        payload = self.to_dict()
+        phase_seconds = {
+            name: stats["seconds"] for name, stats in payload["phases"].items()
+        }
+        slowest = max(phase_seconds, key=phase_seconds.__getitem__)
+        return {
+            "runs": payload["runs"],
+            "events": payload["events"],
+            "wall_seconds": payload["wall_seconds"],
+            "events_per_second": payload["events_per_second"],
+            "slowest_phase": slowest if phase_seconds[slowest] > 0 else None,
+            "phase_seconds": phase_seconds,
+        }
+
+
+def slowest_entry(
+    entries: Iterable[Mapping[str, Any]], key: str = "wall_seconds"
+) -> Mapping[str, Any] | None:
+    """Return the entry with the largest ``key`` (e.g. the slowest fold)."""
+    best: Mapping[str, Any] | None = None
+    for entry in entries:
+        if best is None or float(entry.get(key, 0.0)) > float(best.get(key, 0.0)):
+            best = entry
+    return best
@@ -0,0 +1,326 @@
+"""Low-overhead binary trace of the events an engine processes.
+
+The recorder keeps references to market, bar, signal, order and fill events
+in a preallocated buffer and encodes them into fixed-width records only when
+the buffer fills, so the hot path pays a list store per recorded event.
+Records are appended to a flat binary file next to a JSON sidecar holding the
+record layout and symbol table. Without a path the buffer is an in-memory
+ring that keeps the most recent events.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .events import BarEvent, FillEvent, MarketEvent, OrderEvent, SignalEvent
+
+TRACE_VERSION = 1
+TRACE_FILENAME = "trace.bin"
+KINDS = ("market", "signal", "order", "fill")
+MARKET, SIGNAL, ORDER, FILL = range(len(KINDS))
+# ``qty`` is the volume for market rows and the signed quantity for orders and
+# fills; ``weight`` is a signal's ``target_weight`` when it carries one.
+TRACE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("kind", "u1"),
+        ("side", "i1"),
+        ("symbol", "<i4"),
+        ("qty", "<f8"),
+        ("price", "<f8"),
+        ("weight", "<f8"),
+        ("commission", "<f8"),
+        ("slippage", "<f8"),
+    ]
+)
+# Structured dtypes always carry field names; ``or ()`` only narrows the type.
+_FIELDS: tuple[str, ...] = TRACE_DTYPE.names or ()
+_SIDES = {"LONG": 1, "SHORT": -1, "EXIT": 0, "BUY": 1, "SELL": -1}
+_NAN = float("nan")
+
+
+def _sidecar(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+class TraceRecorder:
+    """Record engine events to ``path`` (or an in-memory ring if ``None``).
+
+    ``sample_rate`` keeps that fraction of market events (whole bars in bar
+    mode), spread evenly over the stream; signals, orders and fills are always
+    kept. ``symbols`` restricts every record kind to those symbols.
+    ``capacity`` is the number of buffered events per write, or the ring size.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        sample_rate: float = 1.0,
+        symbols: Iterable[str] | None = None,
+        capacity: int = 65_536,
+        append: bool = False,
+    ):
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in (0, 1]")
+        if capacity < 1:
+            raise ValueError("capacity must be a positive number of events")
+        self.path = Path(path) if path is not None else None
+        self.sample_rate = float(sample_rate)
+        self.symbols = frozenset(symbols) if symbols is not None else None
+        self.capacity = int(capacity)
+        self.records = 0
+        self.dropped = 0
+        self._buffer: List[Any] = [None] * self.capacity
+        self._next = 0
+        self._wrapped = False
+        self._credit = 0.0
+        self._symbol_ids: Dict[str, int] = {}
+        self._handle: BinaryIO | None = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if append and self.path.exists():
+                meta = json.loads(_sidecar(self.path).read_text(encoding="utf-8"))
+                self._symbol_ids = {
+                    name: idx for idx, name in enumerate(meta["symbols"])
+                }
+                self.records = int(meta["records"])
+                self._handle = self.path.open("r+b")
+                self._handle.truncate(self.records * TRACE_DTYPE.itemsize)
+                self._handle.seek(0, os.SEEK_END)
+            else:
+                self._handle = self.path.open("wb")
+                self._write_sidecar()
+
+    def market(self, event: MarketEvent | BarEvent) -> None:
+        """Record a market event or bar, subject to ``sample_rate``."""
+        credit = self._credit + self.sample_rate
+        if credit < 1.0:
+            self._credit = credit
+            return
+        self._credit = credit - 1.0
+        symbols = self.symbols
+        if (
+            symbols is not None
+            and type(event) is MarketEvent
+            and event.symbol not in symbols
+        ):
+            return
+        self._append(event)
+
+    def record(self, event: SignalEvent | OrderEvent | FillEvent) -> None:
+        """Record a signal, order or fill."""
+        symbols = self.symbols
+        if symbols is not None and event.symbol not in symbols:
+            return
+        self._append(event)
+
+    def _append(self, event: Any) -> None:
+        idx = self._next
+        if self._wrapped:
+            self.dropped += 1
+        self._buffer[idx] = event
+        idx += 1
+        if idx < self.capacity:
+            self._next = idx
+        elif self._handle is not None:
+            self._next = idx
+            self.flush()
+        else:
+            self._next = 0
+            self._wrapped = True
+
+    def _pending(self) -> List[Any]:
+        buffer = self._buffer
+        if self._wrapped:
+            return buffer[self._next :] + buffer[: self._next]
+        return buffer[: self._next]
+
+    def _symbol_id(self, symbol: str) -> int:
+        ids = self._symbol_ids
+        idx = ids.get(symbol)
+        if idx is None:
+            idx = ids[symbol] = len(ids)
+        return idx
+
+    def _encode(self, events: Sequence[Any]) -> np.ndarray:
+        rows: List[tuple] = []
+        append = rows.append
+        symbol_id = self._symbol_id
+        wanted = self.symbols
+        for event in events:
+            if isinstance(event, MarketEvent):
+                append(
+                    (
+                        event.timestamp,
+                        MARKET,
+                        0,
+                        symbol_id(event.symbol),
+                        event.volume,
+                        event.price,
+                        _NAN,
+                        _NAN,
+                        _NAN,
+                    )
+                )
+            elif isinstance(event, BarEvent):
+                timestamp = event.timestamp
+                for symbol, price, volume in zip(
+                    event.symbols, event.prices.tolist(), event.volumes.tolist()
+                ):
+                    if wanted is None or symbol in wanted:
+                        append(
+                            (
+                                timestamp,
+                                MARKET,
+                                0,
+                                symbol_id(symbol),
+                                volume,
+                                price,
+                                _NAN,
+                                _NAN,
+                                _NAN,
+                            )
+                        )
+            elif isinstance(event, SignalEvent):
+                weight = (event.meta or {}).get("target_weight")
+                append(
+                    (
+                        event.timestamp,
+                        SIGNAL,
+                        _SIDES.get(event.side, 0),
+                        symbol_id(event.symbol),
+                        _NAN,
+                        _NAN,
+                        _NAN if weight is None else weight,
+                        _NAN,
+                        _NAN,
+                    )
+                )
+            elif isinstance(event, OrderEvent):
+                append(
+                    (
+                        event.timestamp,
+                        ORDER,
+                        _SIDES.get(event.side, 0),
+                        symbol_id(event.symbol),
+                        event.qty,
+                        _NAN if event.price is None else event.price,
+                        _NAN,
+                        _NAN,
+                        _NAN,
+                    )
+                )
+            elif isinstance(event, FillEvent):
+                append(
+                    (
+                        event.timestamp,
+                        FILL,
+                        (event.qty > 0) - (event.qty < 0),
+                        symbol_id(event.symbol),
+                        event.qty,
+                        event.price,
+                        _NAN,
+                        event.commission,
+                        event.slippage,
+                    )
+                )
+        return np.array(rows, dtype=TRACE_DTYPE)
+
+    def flush(self) -> None:
+        """Encode buffered events and append them to the trace file."""
+        if self._handle is None or not self._next:
+            return
+        records = self._encode(self._buffer[: self._next])
+        self._buffer[: self._next] = [None] * self._next
+        self._next = 0
+        self._handle.write(records.tobytes())
+        self._handle.flush()
+        self.records += len(records)
+        self._write_sidecar()
+
+    def _write_sidecar(self) -> None:
+        assert self.path is not None
+        meta = {
+            "version": TRACE_VERSION,
+            "dtype": [[name, str(TRACE_DTYPE[name])] for name in _FIELDS],
+            "kinds": list(KINDS),
+            "symbols": list(self._symbol_ids),
+            "records": self.records,
+            "sample_rate": self.sample_rate,
+        }
+        target = _sidecar(self.path)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def state(self) -> Dict[str, Any]:
+        """Return the position to :meth:`rewind` to when resuming a run."""
+        self.flush()
+        return {"records": self.records, "credit": self._credit}
+
+    def rewind(self, state: Dict[str, Any]) -> None:
+        """Drop records written after ``state`` and restore the sampler."""
+        self._buffer[: self._next] = [None] * self._next
+        self._next = 0
+        self._wrapped = False
+        self._credit = float(state["credit"])
+        records = int(state["records"])
+        if self._handle is not None:
+            self._handle.truncate(records * TRACE_DTYPE.itemsize)
+            self._handle.seek(0, os.SEEK_END)
+            self.records = records
+            self._write_sidecar()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return everything recorded so far as a DataFrame."""
+        if self.path is not None:
+            self.flush()
+            return read_trace(self.path)
+        records = self._encode(self._pending())
+        return _frame(records, list(self._symbol_ids))
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self.flush()
+            self._handle.close()
+            self._handle = None
+
+
+def _frame(records: np.ndarray, symbols: List[str]) -> pd.DataFrame:
+    kind_codes: np.ndarray[Any, np.dtype[np.uint8]] = records["kind"]
+    symbol_codes: np.ndarray[Any, np.dtype[np.int32]] = records["symbol"]
+    columns: Dict[str, Any] = {
+        "timestamp": records["timestamp"],
+        "kind": pd.Categorical.from_codes(kind_codes, categories=pd.Index(KINDS)),
+        "symbol": pd.Categorical.from_codes(symbol_codes, categories=pd.Index(symbols)),
+    }
+    columns.update((name, records[name]) for name in _FIELDS if name not in columns)
+    return pd.DataFrame(columns)
+
+
+def read_trace(path: str | Path) -> pd.DataFrame:
+    """Load a trace written by :class:`TraceRecorder` into a DataFrame."""
+
+    source = Path(path)
+    meta = json.loads(_sidecar(source).read_text(encoding="utf-8"))
+    if meta.get("version") != TRACE_VERSION:
+        raise ValueError(f"unsupported trace version {meta.get('version')!r}")
+    records = np.fromfile(source, dtype=TRACE_DTYPE, count=int(meta["records"]))
+    return _frame(records, list(meta["symbols"]))
+
+
+__all__ = [
+    "KINDS",
+    "TRACE_DTYPE",
+    "TRACE_FILENAME",
+    "TRACE_VERSION",
+    "TraceRecorder",
+    "read_trace",
+]
@@ -0,0 +1,629 @@
+"""Vectorized target-weight backtests over dense price panels.
+
+The event :class:`~microalpha.engine.Engine` remains the reference
+implementation. :class:`VectorizedEngine` replays the same bar-mode accounting
+(borrow accrual on the mark, fills at each symbol's next observed print,
+slippage, commission and the portfolio's target-weight caps) as array
+operations per timestamp. That makes it cheap enough to score a parameter
+grid in-sample; out-of-sample runs should keep using the event engine.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .events import LookaheadError
+from .execution import Executor
+from .portfolio import NS_PER_DAY, TRADING_DAYS_PER_YEAR, Portfolio
+from .timing import EQUITY_REFRESH, MARK, MATERIALIZE, PLANNING, STRATEGY, EngineTiming
+
+__all__ = [
+    "PricePanel",
+    "VectorizedEngine",
+    "VectorizedResult",
+    "target_weights_from_strategy",
+]
+
+
+@dataclass(frozen=True)
+class PricePanel:
+    """T×N prices on a union timeline.
+
+    ``prices`` holds the value the data handler would return from
+    ``get_latest_price`` (forward-filled in ``ffill`` mode, ``NaN`` where no
+    price is available) and ``observed`` marks the cells where the symbol
+    actually printed, which are the only cells orders can fill on.
+    """
+
+    timestamps: np.ndarray
+    symbols: Tuple[str, ...]
+    prices: np.ndarray
+    observed: np.ndarray
+
+    @classmethod
+    def from_handler(cls, data_handler) -> "PricePanel":
+        """Build a panel from the active window of a ``MultiCsvDataHandler``."""
+        dense_panel = getattr(data_handler, "dense_panel", None)
+        if not callable(dense_panel):
+            raise ValueError("Vectorized backtests require a MultiCsvDataHandler")
+        dense = dense_panel()
+        if dense is None:
+            return cls(
+                np.empty(0, dtype=np.int64),
+                (),
+                np.empty((0, 0), dtype=float),
+                np.empty((0, 0), dtype=bool),
+            )
+        return cls(dense.timestamps, tuple(dense.symbols), dense.prices, dense.observed)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, mode: str = "ffill") -> "PricePanel":
+        """Build a panel from a wide frame of prints (``NaN`` = no print)."""
+        observed = frame.notna().to_numpy()
+        prices = frame.ffill() if mode == "ffill" else frame
+        timestamps = pd.DatetimeIndex(frame.index).to_numpy(dtype="datetime64[ns]")
+        return cls(
+            timestamps.astype(np.int64),
+            tuple(str(col) for col in frame.columns),
+            prices.to_numpy(dtype=float),
+            observed,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.prices.shape
+
+
+def target_weights_from_strategy(
+    data_handler,
+    strategy,
+    panel: PricePanel,
+    *,
+    timing: EngineTiming | None = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Replay ``stream_bars`` through ``strategy.on_bar`` into signal panels.
+
+    Returns ``(weights, exits)``: ``weights`` is ``NaN`` except where the
+    strategy asked for a ``target_weight`` and ``exits`` flags plain ``EXIT``
+    signals. Any other signal kind cannot be expressed as a target and raises
+    ``ValueError``.
+    """
+    if not callable(getattr(strategy, "on_bar", None)):
+        raise ValueError("Vectorized backtests require a strategy implementing on_bar")
+    columns = {symbol: col for col, symbol in enumerate(panel.symbols)}
+    weights = np.full(panel.shape, np.nan, dtype=float)
+    exits = np.zeros(panel.shape, dtype=bool)
+    bars = 0
+    for bar in data_handler.stream_bars():
+        start = perf_counter_ns()
+        signals = list(
+            strategy.on_bar(bar.timestamp, bar.symbols, bar.prices, bar.volumes)
+        )
+        if timing is not None:
+            timing.ns[STRATEGY] += perf_counter_ns() - start
+        bars += 1
+        if not signals:
+            continue
+        row = int(np.searchsorted(panel.timestamps, bar.timestamp))
+        for signal in signals:
+            if signal.timestamp != bar.timestamp:
+                raise LookaheadError("signal time differs from bar time")
+            col = columns.get(signal.symbol)
+            if col is None:
+                raise ValueError(f"Signal for unknown symbol '{signal.symbol}'")
+            if exits[row, col] or not np.isnan(weights[row, col]):
+                raise ValueError(
+                    f"Multiple signals for '{signal.symbol}' at {signal.timestamp}"
+                )
+            meta = signal.meta or {}
+            if "target_weight" in meta and "qty" not in meta:
+                weights[row, col] = float(meta["target_weight"])
+            elif signal.side == "EXIT":
+                exits[row, col] = True
+            else:
+                raise ValueError(
+                    "Vectorized backtests support target_weight and EXIT signals "
+                    f"only; got {signal.side} for '{signal.symbol}'"
+                )
+    if timing is not None:
+        timing.calls[STRATEGY] += bars
+    return weights, exits
+
+
+@dataclass(frozen=True)
+class VectorizedResult:
+    """Per-bar book state and costs from a :class:`VectorizedEngine` run.
+
+    Every array has one entry per bar. ``positions`` and ``cash`` are taken
+    after that bar's fills. ``turnover``, ``commission``, ``slippage`` and
+    ``borrow_cost`` hold the amounts charged on that bar.
+    """
+
+    timestamps: np.ndarray
+    symbols: Tuple[str, ...]
+    positions: np.ndarray
+    cash: np.ndarray
+    equity: np.ndarray
+    exposure: np.ndarray
+    gross_exposure: np.ndarray
+    turnover: np.ndarray
+    commission: np.ndarray
+    slippage: np.ndarray
+    borrow_cost: np.ndarray
+    num_trades: int
+    rejected_orders: int
+
+    @property
+    def total_turnover(self) -> float:
+        return float(self.turnover.sum())
+
+    @property
+    def commission_total(self) -> float:
+        return float(self.commission.sum())
+
+    @property
+    def slippage_total(self) -> float:
+        return float(self.slippage.sum())
+
+    @property
+    def borrow_cost_total(self) -> float:
+        return float(self.borrow_cost.sum())
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if self.equity.size else float("nan")
+
+    def equity_curve(self) -> List[Dict[str, float | int]]:
+        """Records shaped like ``Portfolio.equity_curve``."""
+        return [
+            {
+                "timestamp": ts,
+                "equity": equity,
+                "exposure": exposure,
+                "gross_exposure": gross,
+            }
+            for ts, equity, exposure, gross in zip(
+                self.timestamps.tolist(),
+                self.equity.tolist(),
+                self.exposure.tolist(),
+                self.gross_exposure.tolist(),
+            )
+        ]
+
+
+def _next_observed_rows(observed: np.ndarray) -> np.ndarray:
+    """Row of each symbol's first print strictly after every row (-1 if none)."""
+    num_rows = observed.shape[0]
+    rows = np.where(observed, np.arange(num_rows)[:, None], num_rows)
+    at_or_after = np.minimum.accumulate(rows[::-1], axis=0)[::-1]
+    following = np.full(rows.shape, -1, dtype=np.int64)
+    following[:-1] = at_or_after[1:]
+    following[following >= num_rows] = -1
+    return following
+
+
+class VectorizedEngine:
+    """Array replay of ``Engine(bar_mode=True)`` for target-weight strategies.
+
+    ``portfolio`` and ``executor`` supply configuration only (cash, caps,
+    drawdown stop, borrow rates, slippage and commission) and are not
+    mutated. Only the plain :class:`~microalpha.execution.Executor` is
+    supported: sliced and limit-order executors need per-order state.
+    """
+
+    def __init__(self, portfolio: Portfolio, executor: Executor):
+        if type(executor) is not Executor:
+            raise ValueError(
+                "VectorizedEngine supports the instant/linear Executor only, "
+                f"not {type(executor).__name__}"
+            )
+        if executor.limit_mode is not None:
+            raise ValueError("VectorizedEngine does not support limit execution")
+        if portfolio.positions or portfolio.equity_curve:
+            raise ValueError("VectorizedEngine requires a fresh Portfolio")
+        self.portfolio = portfolio
+        self.executor = executor
+        self.timing = EngineTiming()
+
+    def _slippage(
+        self, qty: np.ndarray, price: np.ndarray, symbols: Sequence[str]
+    ) -> np.ndarray:
+        model = self.executor.slippage_model
+        if model is not None:
+            return np.asarray(
+                model.calculate_slippage_array(qty, price, symbols), dtype=float
+            )
+        return np.copysign(self.executor.price_impact * np.abs(qty), qty)
+
+    def run(
+        self,
+        panel: PricePanel,
+        weights: np.ndarray,
+        exits: np.ndarray | None = None,
+    ) -> VectorizedResult:
+        """Simulate ``weights`` (``NaN`` = no signal) and ``exits`` on ``panel``."""
+        started = perf_counter_ns()
+        result = self._simulate(panel, weights, exits)
+        self.timing.wall_ns += perf_counter_ns() - started
+        return result
+
+    def run_strategy(self, data_handler, strategy) -> VectorizedResult:
+        """Replay ``strategy`` over the handler's active window and simulate it."""
+        started = perf_counter_ns()
+        panel = PricePanel.from_handler(data_handler)
+        weights, exits = target_weights_from_strategy(
+            data_handler, strategy, panel, timing=self.timing
+        )
+        result = self._simulate(panel, weights, exits)
+        self.timing.wall_ns += perf_counter_ns() - started
+        return result
+
+    def _simulate(
+        self,
+        panel: PricePanel,
+        weights: np.ndarray,
+        exits: np.ndarray | None,
+    ) -> VectorizedResult:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != panel.shape:
+            raise ValueError(
+                f"weights shape {weights.shape} does not match panel {panel.shape}"
+            )
+        if exits is None:
+            exits = np.zeros(panel.shape, dtype=bool)
+        elif exits.shape != panel.shape:
+            raise ValueError(
+                f"exits shape {exits.shape} does not match panel {panel.shape}"
+            )
+
+        timing = self.timing
+        pf = self.portfolio
+        symbols = panel.symbols
+        # Work on bar rows only: the event engine never sees an empty row.
+        bar_rows = np.flatnonzero(np.isfinite(panel.prices).any(axis=1))
+        book = _Book(
+            pf,
+            panel.timestamps[bar_rows],
+            symbols,
+            panel.prices[bar_rows],
+            self.executor.commission,
+        )
+        next_obs = _next_observed_rows(panel.observed[bar_rows])
+        weights = weights[bar_rows]
+        exits = exits[bar_rows] & np.isnan(weights)
+        signal_rows = np.flatnonzero(
+            ((~np.isnan(weights) | exits) & book.priced).any(axis=1)
+        ).tolist()
+        signal_rows.append(book.num_rows)
+        # due row -> order batches (columns, signed qty) in scheduling order
+        pending: Dict[int, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        rejected = 0
+
+        row = 0
+        next_signal = 0
+        while row < book.num_rows:
+            stop = signal_rows[next_signal]
+            if pending:
+                stop = min(stop, min(pending))
+            if stop >= book.num_rows:
+                book.mark(row, book.num_rows)
+                break
+            # Positions only change at fills, so every row up to and including
+            # the stop row is marked as one block before that row's fills.
+            book.mark(row, stop + 1)
+            batches = pending.pop(stop, None)
+            if batches:
+                start = perf_counter_ns()
+                for cols, qty in batches:
+                    book.fill(stop, cols, qty, self._slippage)
+                start = timing.lap(MATERIALIZE, start)
+                book.refresh(stop)
+                timing.lap(EQUITY_REFRESH, start)
+            if stop == signal_rows[next_signal]:
+                next_signal += 1
+                start = perf_counter_ns()
+                cols, qty = book.orders(stop, weights[stop], exits[stop])
+                if cols.size:
+                    due = next_obs[stop, cols]
+                    rejected += int((due < 0).sum())
+                    for due_row in np.unique(due[due >= 0]).tolist():
+                        hit = due == due_row
+                        pending.setdefault(due_row, []).append((cols[hit], qty[hit]))
+                timing.lap(PLANNING, start)
+            row = stop + 1
+
+        timing.ns[MARK] += book.mark_ns
+        timing.calls[MARK] += book.num_rows
+        timing.events += book.num_rows
+        timing.runs += 1
+
+        return VectorizedResult(
+            timestamps=book.timestamps,
+            symbols=symbols,
+            positions=book.out_positions,
+            cash=book.out_cash,
+            equity=book.out_equity,
+            exposure=book.out_exposure,
+            gross_exposure=book.out_gross,
+            turnover=book.out_turnover,
+            commission=book.out_commission,
+            slippage=book.out_slippage,
+            borrow_cost=book.out_borrow,
+            num_trades=book.num_trades,
+            rejected_orders=rejected,
+        )
+
+
+class _Book:
+    """Mutable book state for :class:`VectorizedEngine`, one row per bar."""
+
+    def __init__(
+        self,
+        portfolio: Portfolio,
+        timestamps: np.ndarray,
+        symbols: Tuple[str, ...],
+        marks: np.ndarray,
+        commission: float,
+    ):
+        num_rows, num_cols = marks.shape
+        self.num_rows = num_rows
+        self.timestamps = timestamps
+        self.symbols = symbols
+        self.marks = marks
+        self.priced = np.isfinite(marks)
+        self.mark_values = np.where(self.priced, marks, 0.0)
+        self.days = timestamps // NS_PER_DAY
+
+        rates = [portfolio.borrow_rate_bps(symbol) for symbol in symbols]
+        self.borrows = np.array([rate is not None for rate in rates], dtype=bool)
+        self.daily_rate = np.array(
+            [
+                (rate / 10_000.0) / TRADING_DAYS_PER_YEAR if rate is not None else 0.0
+                for rate in rates
+            ]
+        )
+
+        self.initial_cash = float(portfolio.initial_cash)
+        self.cash = float(portfolio.cash)
+        self.high_water_mark = float(portfolio.high_water_mark)
+        self.halted = bool(portfolio.drawdown_halted)
+        self.last_equity = float(portfolio.last_equity)
+        self.total_turnover = 0.0
+        self.market_value = 0.0
+        self.gross_market_value = 0.0
+        self.max_exposure = portfolio.max_exposure
+        self.max_single = portfolio.max_single_name_weight
+        self.max_gross = portfolio.max_gross_leverage
+        self.turnover_cap = portfolio.turnover_cap
+        self.drawdown_stop = portfolio.max_drawdown_stop
+        self.commission_rate = float(commission)
+
+        self.positions = np.zeros(num_cols, dtype=np.int64)
+        self.avg_cost = np.full(num_cols, np.nan)
+        self.last_borrow_day = np.full(num_cols, -1, dtype=np.int64)
+        self.num_trades = 0
+        self.mark_ns = 0
+
+        self.out_positions = np.zeros((num_rows, num_cols), dtype=np.int64)
+        self.out_cash = np.zeros(num_rows)
+        self.out_equity = np.zeros(num_rows)
+        self.out_exposure = np.zeros(num_rows)
+        self.out_gross = np.zeros(num_rows)
+        self.out_turnover = np.zeros(num_rows)
+        self.out_commission = np.zeros(num_rows)
+        self.out_slippage = np.zeros(num_rows)
+        self.out_borrow = np.zeros(num_rows)
+
+    # -- marking ---------------------------------------------------------
+    def mark(self, lo: int, hi: int) -> None:
+        """Mark rows ``[lo, hi)`` with borrow accrual, as ``Portfolio.on_bar``."""
+        start = perf_counter_ns()
+        positions = self.positions
+        ok = self.priced[lo:hi]
+        prices = self.mark_values[lo:hi]
+        borrow = self._accrue_borrow(lo, hi, ok, prices)
+        cash = self.cash - np.cumsum(borrow) if borrow is not None else None
+        self.out_positions[lo:hi] = positions
+        if cash is None:
+            self.out_cash[lo:hi] = self.cash
+        else:
+            self.out_borrow[lo:hi] = borrow
+            self.out_cash[lo:hi] = cash
+            self.cash = float(cash[-1])
+        values = positions * prices
+        self._record(lo, hi, values.sum(axis=1), np.abs(values).sum(axis=1))
+        self.mark_ns += perf_counter_ns() - start
+
+    def refresh(self, row: int) -> None:
+        """Re-mark ``row`` after fills without borrow, as the engine does."""
+        values = self.positions * self.mark_values[row]
+        self.out_positions[row] = self.positions
+        self.out_cash[row] = self.cash
+        self._record(
+            row,
+            row + 1,
+            np.array([values.sum()]),
+            np.array([np.abs(values).sum()]),
+        )
+
+    def _record(
+        self, lo: int, hi: int, market_value: np.ndarray, gross: np.ndarray
+    ) -> None:
+        equity = self.out_cash[lo:hi] + market_value
+        safe = np.where(equity != 0.0, equity, 1.0)
+        self.out_equity[lo:hi] = equity
+        self.out_exposure[lo:hi] = np.where(equity != 0.0, market_value / safe, 0.0)
+        self.out_gross[lo:hi] = np.where(equity != 0.0, gross / safe, 0.0)
+        high_water = np.maximum.accumulate(np.maximum(equity, self.high_water_mark))
+        if self.drawdown_stop is not None and not self.halted:
+            drawdown = (high_water - equity) / high_water
+            self.halted = bool(
+                ((equity < high_water) & (drawdown >= self.drawdown_stop)).any()
+            )
+        self.high_water_mark = float(high_water[-1])
+        self.market_value = float(market_value[-1])
+        self.gross_market_value = float(gross[-1])
+        self.last_equity = float(equity[-1])
+
+    def _accrue_borrow(
+        self, lo: int, hi: int, ok: np.ndarray, prices: np.ndarray
+    ) -> np.ndarray | None:
+        """Per-row borrow charges for a block of constant positions."""
+        short = (self.positions < 0) & self.borrows
+        seen = ok.any(axis=0)
+        # Priced rows reset the accrual day for anything not currently short.
+        self.last_borrow_day[seen & ~short] = -1
+        cols = np.flatnonzero(short & seen)
+        if not cols.size:
+            return None
+        ok = ok[:, cols]
+        steps = np.arange(hi - lo)[:, None]
+        # day of the previous priced row for each cell, else the carried day
+        previous = np.where(ok, steps, -1)
+        np.maximum.accumulate(previous, axis=0, out=previous)
+        last_row = previous[-1].copy()
+        previous[1:] = previous[:-1].copy()
+        previous[0] = -1
+        days = self.days[lo:hi][:, None]
+        carried = self.last_borrow_day[cols][None, :]
+        prev_day = np.where(previous >= 0, days[np.maximum(previous, 0), 0], carried)
+        charge = ok & (days != prev_day)
+        elapsed = np.where(prev_day < 0, 1, np.maximum(days - prev_day, 1))
+        notional = np.abs(self.positions[cols]) * prices[:, cols]
+        cost = np.where(charge, notional * self.daily_rate[cols] * elapsed, 0.0)
+        self.last_borrow_day[cols] = np.where(
+            last_row >= 0, self.days[lo + np.maximum(last_row, 0)], carried[0]
+        )
+        return cost.sum(axis=1)
+
+    # -- fills -----------------------------------------------------------
+    def fill(self, row: int, cols: np.ndarray, qty: np.ndarray, slippage) -> None:
+        """Apply one batch of fills at ``row``, as ``Portfolio.on_fill``."""
+        market_price = self.marks[row, cols]
+        slip = slippage(qty, market_price, [self.symbols[c] for c in cols.tolist()])
+        fill_price = market_price + slip
+        effective_slip = fill_price - market_price
+        commission = self.commission_rate * np.abs(qty)
+        trade_value = fill_price * qty
+        self.cash -= float(trade_value.sum())
+        self.cash -= float(commission.sum())
+        traded = float(np.abs(trade_value).sum())
+        self.total_turnover += traded
+        self.out_turnover[row] += traded
+        self.out_commission[row] += float(commission.sum())
+        self.out_slippage[row] += float((np.abs(effective_slip) * np.abs(qty)).sum())
+        self.num_trades += int(cols.shape[0])
+
+        prev = self.positions[cols]
+        new = prev + qty
+        cost = self.avg_cost[cols]
+        cost = np.where(np.isnan(cost), fill_price, cost)
+        crossed = ((prev > 0) & (new < 0)) | ((prev < 0) & (new > 0))
+        adds = ((prev >= 0) & (qty > 0)) | ((prev <= 0) & (qty < 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blended = (cost * prev + fill_price * qty) / new
+        self.avg_cost[cols] = np.where(
+            new == 0,
+            np.nan,
+            np.where(crossed, fill_price, np.where(adds, blended, cost)),
+        )
+        self.positions[cols] = new
+
+    # -- sizing ----------------------------------------------------------
+    def orders(
+        self, row: int, weight_row: np.ndarray, exit_row: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Signed orders for one signal row, as sequential ``on_signal`` calls.
+
+        Every order is checked against the same snapshot because fills only
+        land on a later print.
+        """
+        ok = self.priced[row]
+        price_row = self.marks[row]
+        targets = np.flatnonzero(~np.isnan(weight_row) & ok)
+        exiting = np.flatnonzero(exit_row & ok)
+        exiting = exiting[self.positions[exiting] != 0]
+        cols, qty = self._size_targets(
+            row, targets, weight_row[targets], price_row[targets]
+        )
+        return (
+            np.concatenate([cols, exiting]),
+            np.concatenate([qty, -self.positions[exiting]]),
+        )
+
+    def _size_targets(
+        self, row: int, cols: np.ndarray, weight: np.ndarray, price: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        equity = self.last_equity if self.last_equity else self.initial_cash
+        market_value = self.market_value
+        if equity > 0:
+            desired = np.trunc(weight * equity / price).astype(np.int64)
+        else:
+            desired = np.zeros(cols.shape[0], dtype=np.int64)
+        current = self.positions[cols]
+        delta = desired - current
+        keep = delta != 0
+        if self.halted:
+            keep &= ~(np.abs(desired) > np.abs(current))
+        sign = np.sign(delta)
+        qty = np.abs(delta).astype(float)
+
+        if self.turnover_cap is not None:
+            keep &= ~(self.total_turnover + price * qty > self.turnover_cap)
+
+        max_exposure = self.max_exposure
+        if max_exposure is not None:
+            anticipated = market_value + sign * qty * price
+            exposure = np.abs(anticipated) / equity if equity else np.zeros_like(qty)
+            breach = keep & (exposure > max_exposure)
+            if breach.any():
+                if equity:
+                    max_abs_mv = float(max_exposure) * equity
+                    room = np.where(
+                        sign > 0, max_abs_mv - market_value, max_abs_mv + market_value
+                    )
+                    room_qty = np.where(room > 0, np.trunc(room / price), 0.0)
+                    keep &= ~(breach & (room_qty <= 0))
+                    qty = np.where(breach & (room_qty < qty), room_qty, qty)
+                    anticipated = market_value + sign * qty * price
+                    exposure = np.abs(anticipated) / equity
+                    keep &= ~(breach & (exposure > max_exposure))
+                else:
+                    keep &= ~breach
+
+        max_single = self.max_single
+        if max_single is not None and equity:
+            new_qty = current + sign * qty
+            weight_after = np.abs(new_qty * price) / equity
+            breach = keep & (weight_after > max_single)
+            if breach.any():
+                max_abs_qty = np.trunc((float(max_single) * equity) / price)
+                keep &= ~(breach & (max_abs_qty <= 0))
+                clipped = np.abs(sign * max_abs_qty - current)
+                keep &= ~(breach & (clipped <= 0))
+                qty = np.where(breach & (clipped < qty), clipped, qty)
+                new_qty = current + sign * qty
+                weight_after = np.abs(new_qty * price) / equity
+                keep &= ~(breach & (weight_after > max_single))
+
+        if self.max_gross is not None and equity:
+            current_gross = self.gross_market_value
+            if current_gross <= 0.0:
+                # Portfolio falls back to average cost for unpriced holdings.
+                held = self.positions != 0
+                marks = np.where(self.priced[row], self.marks[row], self.avg_cost)
+                current_gross = float(
+                    np.nansum(np.abs(self.positions[held]) * marks[held])
+                )
+            new_qty = current + sign * qty
+            projected = np.maximum(
+                current_gross - np.abs(current * price) + np.abs(new_qty * price), 0.0
+            )
+            keep &= ~(projected / equity > self.max_gross)
+
+        return cols[keep], (sign * qty)[keep].astype(np.int64)
@@ -15,10 +15,17 @@ import pandas as pd
 import yaml
 
 from .broker import SimulatedBroker
+from .checkpoint import (
+    CHECKPOINT_FILENAME,
+    discard_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
 from .config import BacktestCfg, ExecModelCfg
 from .config_wfv import NonDegenerateCfg, RealityCheckCfg, WFVCfg
 from .data import CsvDataHandler, DataHandler, MultiCsvDataHandler
-from .engine import Engine
+from .engine import Engine, FanOutEngine
+from .equity import equity_rows
 from .execution import (
     TWAP,
     VWAP,
@@ -30,7 +37,7 @@ from .execution import (
 )
 from .execution_safety import evaluate_execution_safety
 from .integrity import evaluate_portfolio_integrity
-from .logging import JsonlWriter
+from .logging import JsonlWriter, write_columnar
 from .manifest import (
     build as build_manifest,
     extract_config_summary,
@@ -50,12 +57,16 @@ from .runner import (
     resolve_capital_policy,
     resolve_path,
     resolve_slippage_model,
+    resume_artifacts_dir,
 )
 from .strategies.breakout import BreakoutStrategy
 from .strategies.cs_momentum import CrossSectionalMomentum
 from .strategies.flagship_mom import FlagshipMomentumStrategy
 from .strategies.meanrev import MeanReversionStrategy
 from .strategies.mm import NaiveMarketMakingStrategy
+from .timing import EngineTiming, slowest_entry
+from .trace import TRACE_FILENAME, TraceRecorder
+from .vectorized import VectorizedEngine
 
 STRATEGY_MAPPING = {
     "MeanReversionStrategy": MeanReversionStrategy,
@@ -83,13 +94,11 @@ def _non_degenerate_active(cfg: NonDegenerateCfg | None) -> bool:
 
 
 def _non_degenerate_reasons(
-    portfolio: Portfolio, cfg: NonDegenerateCfg | None
+    num_trades: int, turnover: float, cfg: NonDegenerateCfg | None
 ) -> list[str]:
     if not _non_degenerate_active(cfg):
         return []
     reasons: list[str] = []
-    num_trades = len(getattr(portfolio, "trades", None) or [])
-    turnover = float(getattr(portfolio, "total_turnover", 0.0) or 0.0)
     if cfg is None:
         return reasons
     if cfg.min_trades is not None and num_trades < cfg.min_trades:
@@ -163,6 +172,11 @@ def load_wfv_cfg(path: str) -> WFVCfg:
             max_gross_leverage=portfolio_cfg.get("max_gross_leverage"),
             max_single_name_weight=portfolio_cfg.get("max_single_name_weight"),
             borrow=portfolio_cfg.get("borrow"),
+            data_cache_dir=data_cfg.get("cache_dir"),
+            data_lazy_load=bool(data_cfg.get("lazy_load", False)),
+            data_memory_budget_mb=data_cfg.get("memory_budget_mb"),
+            data_load_workers=int(data_cfg.get("load_workers", 1)),
+            data_csv_engine=data_cfg.get("csv_engine", "c"),
         )
 
         reality_payload = raw.get("reality_check") or {}
@@ -174,6 +188,9 @@ def load_wfv_cfg(path: str) -> WFVCfg:
             artifacts_dir=raw.get("artifacts_dir"),
             reality_check=reality_payload,
             non_degenerate=raw.get("non_degenerate"),
+            insample_engine=raw.get("insample_engine", "event"),
+            insample_fanout=raw.get("insample_fanout", 1),
+            checkpoint_folds=bool(raw.get("checkpoint_folds", False)),
         )
 
     raise ValueError("Invalid walk-forward configuration schema.")
@@ -184,7 +201,15 @@ def run_walk_forward(
     override_artifacts_dir: str | None = None,
     reality_check_method: str | None = None,
     reality_check_block_len: int | None = None,
+    data_load_workers: int | None = None,
+    resume: str | None = None,
 ) -> Dict[str, Any]:
+    """Run walk-forward validation described by ``config_path``.
+
+    ``resume`` names the artifacts directory of an interrupted run of the same
+    config; completed folds are restored from its fold-boundary checkpoint.
+    """
+
     cfg_path = Path(config_path).expanduser().resolve()
     raw_config = yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {}
     cfg = load_wfv_cfg(str(cfg_path))
@@ -197,6 +222,13 @@ def run_walk_forward(
         if rc_update:
             rc_cfg = cfg.reality_check.model_copy(update=rc_update)
             cfg = cfg.model_copy(update={"reality_check": rc_cfg})
+    if data_load_workers is not None:
+        if data_load_workers < 1:
+            raise ValueError("data_load_workers must be at least 1")
+        template = cfg.template.model_copy(
+            update={"data_load_workers": int(data_load_workers)}
+        )
+        cfg = cfg.model_copy(update={"template": template})
     config_hash = hashlib.sha256(yaml.safe_dump(raw_config).encode("utf-8")).hexdigest()
     unsafe_execution, unsafe_reasons, exec_alignment = evaluate_execution_safety(
         cfg.template.exec
@@ -214,7 +246,12 @@ def run_walk_forward(
     if override_artifacts_dir is not None:
         effective_cfg["artifacts_dir"] = override_artifacts_dir
 
-    run_id, artifacts_dir = prepare_artifacts_dir(cfg_path, effective_cfg, base_run_id)
+    if resume is not None:
+        run_id, artifacts_dir = resume_artifacts_dir(resume, config_hash)
+    else:
+        run_id, artifacts_dir = prepare_artifacts_dir(
+            cfg_path, effective_cfg, base_run_id
+        )
     manifest = build_manifest(
         cfg.template.seed,
         str(cfg_path),
@@ -226,13 +263,38 @@ def run_walk_forward(
         unsafe_reasons=unsafe_reasons,
         execution_alignment=exec_alignment,
     )
-    write_manifest(manifest, str(artifacts_dir))
-    persist_config(cfg_path, artifacts_dir)
-
-    trade_logger = JsonlWriter(str(artifacts_dir / "trades.jsonl"))
+    if resume is None:
+        write_manifest(manifest, str(artifacts_dir))
+        persist_config(cfg_path, artifacts_dir)
+    checkpoint_path = artifacts_dir / CHECKPOINT_FILENAME
+    resuming = resume is not None and checkpoint_path.exists()
+
+    trade_log_cfg = cfg.template.trade_log
+    trade_logger = JsonlWriter(
+        str(artifacts_dir / "trades.jsonl"),
+        append=resuming,
+        batch_size=trade_log_cfg.batch_size,
+        background=trade_log_cfg.background,
+    )
+    # Out-of-sample folds share one trace; in-sample grid runs are not traced.
+    trace_cfg = cfg.template.trace
+    tracer: TraceRecorder | None = None
+    if trace_cfg is not None:
+        tracer = TraceRecorder(
+            artifacts_dir / TRACE_FILENAME,
+            sample_rate=trace_cfg.sample_rate,
+            symbols=trace_cfg.symbols,
+            capacity=trace_cfg.buffer_events,
+            append=resuming,
+        )
     run_mode = getattr(cfg.template, "run_mode", "headline")
 
     data_dir = resolve_path(cfg.template.data_path, cfg_path)
+    cache_dir = (
+        resolve_path(cfg.template.data_cache_dir, cfg_path)
+        if cfg.template.data_cache_dir
+        else None
+    )
     symbol = cfg.template.symbol
     base_params = _strategy_params(cfg.template.strategy)
     param_grid: Dict[str, Sequence[Any]] = {
@@ -287,9 +349,23 @@ def run_walk_forward(
                 raise ValueError("Flagship universe file must contain 'symbol' column")
             cs_symbols = sorted(universe_df["symbol"].astype(str).str.upper().unique())
             base_params["symbols"] = cs_symbols
-        data_handler = MultiCsvDataHandler(csv_dir=data_dir, symbols=cs_symbols)
+        data_handler = MultiCsvDataHandler(
+            csv_dir=data_dir,
+            symbols=cs_symbols,
+            cache_dir=cache_dir,
+            stream_mode=cfg.template.data_stream_mode,
+            lazy=cfg.template.data_lazy_load,
+            memory_budget_mb=cfg.template.data_memory_budget_mb,
+            load_workers=cfg.template.data_load_workers,
+            csv_engine=cfg.template.data_csv_engine,
+        )
     else:
-        data_handler = CsvDataHandler(csv_dir=data_dir, symbol=symbol)
+        data_handler = CsvDataHandler(
+            csv_dir=data_dir,
+            symbol=symbol,
+            cache_dir=cache_dir,
+            csv_engine=cfg.template.data_csv_engine,
+        )
     if data_handler.data is None:
         raise FileNotFoundError(
             f"Unable to load data for symbol '{symbol}' from {data_dir}"
@@ -320,6 +396,8 @@ def run_walk_forward(
     total_loss_trades = 0
     integrity_checks: list[dict[str, Any]] = []
     integrity_ok = True
+    engine_timings: List[EngineTiming] = []
+    fold_timings: List[Dict[str, Any]] = []
 
     current_date = start_date
     master_rng = np.random.default_rng(cfg.template.seed)
@@ -327,11 +405,73 @@ def run_walk_forward(
     if strategy_class is None:
         raise ValueError(f"Unknown strategy '{strategy_name}'")
 
+    if resuming:
+        progress = load_checkpoint(checkpoint_path)
+        trade_logger.truncate(progress["trade_log_offset"])
+        if tracer is not None and progress.get("trace") is not None:
+            tracer.rewind(progress["trace"])
+        master_rng.bit_generator.state = progress["master_rng_state"]
+        current_date = progress["current_date"]
+        equity_records = progress["equity_records"]
+        folds = progress["folds"]
+        grid_rows = progress["grid_rows"]
+        selection_grid_summaries = progress["selection_grid_summaries"]
+        bootstrap_samples = progress["bootstrap_samples"]
+        reality_metadata = progress["reality_metadata"]
+        reality_pvalues = progress["reality_pvalues"]
+        fold_exposure_paths = progress["fold_exposure_paths"]
+        fold_factor_paths = progress["fold_factor_paths"]
+        total_turnover = progress["total_turnover"]
+        total_commission = progress["total_commission"]
+        total_slippage = progress["total_slippage"]
+        total_borrow_cost = progress["total_borrow_cost"]
+        total_num_trades = progress["total_num_trades"]
+        total_trade_notional = progress["total_trade_notional"]
+        total_realized_pnl = progress["total_realized_pnl"]
+        total_win_trades = progress["total_win_trades"]
+        total_loss_trades = progress["total_loss_trades"]
+        integrity_checks = progress["integrity_checks"]
+        integrity_ok = progress["integrity_ok"]
+        engine_timings = progress["engine_timings"]
+        fold_timings = progress["fold_timings"]
+
     try:
         while (
             current_date + pd.Timedelta(days=training_days + testing_days + 1)
             <= selection_end
         ):
+            if cfg.checkpoint_folds:
+                save_checkpoint(
+                    checkpoint_path,
+                    {
+                        "trade_log_offset": trade_logger.tell(),
+                        "trace": tracer.state() if tracer is not None else None,
+                        "master_rng_state": master_rng.bit_generator.state,
+                        "current_date": current_date,
+                        "equity_records": equity_records,
+                        "folds": folds,
+                        "grid_rows": grid_rows,
+                        "selection_grid_summaries": selection_grid_summaries,
+                        "bootstrap_samples": bootstrap_samples,
+                        "reality_metadata": reality_metadata,
+                        "reality_pvalues": reality_pvalues,
+                        "fold_exposure_paths": fold_exposure_paths,
+                        "fold_factor_paths": fold_factor_paths,
+                        "total_turnover": total_turnover,
+                        "total_commission": total_commission,
+                        "total_slippage": total_slippage,
+                        "total_borrow_cost": total_borrow_cost,
+                        "total_num_trades": total_num_trades,
+                        "total_trade_notional": total_trade_notional,
+                        "total_realized_pnl": total_realized_pnl,
+                        "total_win_trades": total_win_trades,
+                        "total_loss_trades": total_loss_trades,
+                        "integrity_checks": integrity_checks,
+                        "integrity_ok": integrity_ok,
+                        "engine_timings": engine_timings,
+                        "fold_timings": fold_timings,
+                    },
+                )
             train_start = current_date
             train_end = train_start + pd.Timedelta(days=training_days)
             test_start = train_end + pd.Timedelta(days=1)
@@ -339,6 +479,7 @@ def run_walk_forward(
 
             fold_rng = _spawn_rng(master_rng)
             train_rng = _spawn_rng(fold_rng)
+            grid_timings: List[Tuple[Dict[str, Any], EngineTiming]] = []
 
             (
                 best_params,
@@ -359,9 +500,19 @@ def run_walk_forward(
                 cfg.reality_check,
                 non_degenerate=cfg.non_degenerate,
                 symbol_meta=symbol_meta,
+                timings=grid_timings,
+                insample_engine=cfg.insample_engine,
+                fanout=cfg.insample_fanout,
             )
+            train_timing = EngineTiming.combined(t for _, t in grid_timings)
+            engine_timings.append(train_timing)
 
             if not best_params or not train_metrics:
+                fold_timings.append(
+                    _fold_timing_entry(
+                        len(folds), train_start, test_start, grid_timings, None
+                    )
+                )
                 folds.append(
                     {
                         "train_start": str(train_start.date()),
@@ -442,8 +593,16 @@ def run_walk_forward(
                 portfolio,
                 broker,
                 rng=_spawn_rng(test_rng),
+                bar_mode=cfg.template.bar_mode,
+                trace=tracer,
             )
             engine.run()
+            engine_timings.append(engine.timing)
+            fold_timings.append(
+                _fold_timing_entry(
+                    len(folds), train_start, test_start, grid_timings, engine.timing
+                )
+            )
 
             filter_diagnostics: Dict[str, Any] | None = None
             if hasattr(strategy, "get_filter_diagnostics"):
@@ -457,8 +616,9 @@ def run_walk_forward(
                     }
             order_flow_payload = _finalize_order_flow(order_flow, filter_diagnostics)
 
-            if portfolio.equity_curve:
-                equity_records.extend(portfolio.equity_curve)
+            equity_records.extend(
+                dict(row) for row in equity_rows(portfolio.equity_curve, "Walk-forward")
+            )
             total_turnover += float(portfolio.total_turnover)
             total_borrow_cost += float(getattr(portfolio, "borrow_cost_total", 0.0))
             trades_list = getattr(portfolio, "trades", None) or []
@@ -601,6 +761,11 @@ def run_walk_forward(
             current_date += pd.Timedelta(days=testing_days)
     finally:
         trade_logger.close()
+        if tracer is not None:
+            tracer.close()
+    trades_columnar_path: str | None = None
+    if trade_log_cfg.columnar is not None:
+        trades_columnar_path = write_columnar(trade_logger.path, trade_log_cfg.columnar)
 
     selection_summary = _aggregate_selection_summary(selection_grid_summaries)
     selection_summary_path: str | None = None
@@ -665,6 +830,7 @@ def run_walk_forward(
     holdout_order_flow_payload: Dict[str, Any] | None = None
     holdout_order_flow_path: str | None = None
     holdout_filter_diagnostics_path: str | None = None
+    holdout_timing: EngineTiming | None = None
     if holdout_start is not None and holdout_end is not None:
         if selected_params_full is None:
             if not selection_failure_reason:
@@ -704,7 +870,9 @@ def run_walk_forward(
                 )
 
             holdout_trade_logger = JsonlWriter(
-                str(artifacts_dir / "holdout_trades.jsonl")
+                str(artifacts_dir / "holdout_trades.jsonl"),
+                batch_size=trade_log_cfg.batch_size,
+                background=trade_log_cfg.background,
             )
             holdout_order_flow = (
                 OrderFlowDiagnostics() if cfg.template.order_flow_diagnostics else None
@@ -738,8 +906,11 @@ def run_walk_forward(
                 holdout_portfolio,
                 holdout_broker,
                 rng=_spawn_rng(holdout_rng),
+                bar_mode=cfg.template.bar_mode,
             )
             holdout_engine.run()
+            holdout_timing = holdout_engine.timing
+            engine_timings.append(holdout_timing)
             holdout_trade_logger.close()
             holdout_trades_path = holdout_trade_logger.path
 
@@ -1038,9 +1209,14 @@ def run_walk_forward(
         run_invalid=not integrity_ok,
     )
 
+    engine_timing_path = _persist_engine_timing(
+        artifacts_dir, engine_timings, fold_timings, holdout_timing
+    )
+
     manifest_payload = asdict(manifest)
     manifest_payload["integrity_path"] = integrity_path
     manifest_payload["run_invalid"] = bool(not integrity_ok)
+    manifest_payload["engine_timing_path"] = engine_timing_path
     manifest_payload["walkforward"] = {
         "selection_window_start": str(start_date.date()),
         "selection_window_end": str(selection_end.date()),
@@ -1062,6 +1238,7 @@ def run_walk_forward(
     with manifest_path.open("w", encoding="utf-8") as handle:
         json.dump(manifest_payload, handle, indent=2)
 
+    discard_checkpoint(checkpoint_path)
     if selection_failure_reason:
         raise ValueError(selection_failure_reason)
 
@@ -1086,6 +1263,8 @@ def run_walk_forward(
             "holdout_metrics": holdout_metrics,
             "folds": folds,
             "trades_path": str(artifacts_dir / "trades.jsonl"),
+            "trades_columnar_path": trades_columnar_path,
+            "trace_path": str(tracer.path) if tracer is not None else None,
             "integrity_path": integrity_path,
         }
     )
@@ -1105,6 +1284,9 @@ def _optimise_parameters(
     *,
     non_degenerate: NonDegenerateCfg | None = None,
     symbol_meta: Mapping[str, Any] | None = None,
+    timings: List[Tuple[Dict[str, Any], EngineTiming]] | None = None,
+    insample_engine: str = "event",
+    fanout: int = 1,
 ) -> Tuple[
     Dict[str, Any],
     Dict[str, Any] | None,
@@ -1118,104 +1300,160 @@ def _optimise_parameters(
     exclusions: List[Dict[str, Any]] = []
 
     keys = list(param_grid.keys())
+    combinations = list(product(*(param_grid[key] for key in keys)))
+    chunk_size = max(int(fanout), 1)
 
-    for combination in product(*(param_grid[key] for key in keys)):
-        params = dict(zip(keys, combination))
+    # Candidates are built (keeping the RNG spawn order), run and scored
+    # ``fanout`` at a time; event-engine candidates in a chunk share one pass
+    # over the training window.
+    data_handler.set_date_range(train_start, train_end)
+    for offset in range(0, len(combinations), chunk_size):
+        chunk = combinations[offset : offset + chunk_size]
+        candidates: List[Dict[str, Any]] = []
+        for combination in chunk:
+            params = dict(zip(keys, combination))
+
+            sim_rng = _spawn_rng(rng)
+
+            combined = dict(base_params)
+            combined.update(params)
+            if strategy_class in (CrossSectionalMomentum, FlagshipMomentumStrategy):
+                strategy = strategy_class(**_strategy_kwargs(combined))
+            else:
+                strategy = strategy_class(
+                    symbol=cfg.symbol, **_strategy_kwargs(combined)
+                )
+            # The vectorized engine has no per-order hooks to diagnose.
+            order_flow = (
+                OrderFlowDiagnostics()
+                if cfg.order_flow_diagnostics and insample_engine == "event"
+                else None
+            )
+            portfolio = _build_portfolio(
+                data_handler,
+                cfg,
+                symbol_meta=symbol_meta,
+                order_flow=order_flow,
+            )
+            if hasattr(strategy, "sector_map") and strategy.sector_map:
+                portfolio.sector_of.update(strategy.sector_map)
+            exec_rng = _spawn_rng(sim_rng)
+            executor = _build_executor(
+                data_handler,
+                cfg.exec,
+                exec_rng,
+                symbol_meta=symbol_meta,
+            )
+            run_rng = _spawn_rng(sim_rng)
+            candidate: Dict[str, Any] = {
+                "params": params,
+                "strategy": strategy,
+                "portfolio": portfolio,
+                "order_flow": order_flow,
+            }
+            if insample_engine == "vectorized":
+                vector_engine = VectorizedEngine(portfolio, executor)
+                vector_result = vector_engine.run_strategy(data_handler, strategy)
+                candidate["timing"] = vector_engine.timing
+                candidate["equity_curve"] = vector_result.equity_curve()
+                candidate["turnover"] = vector_result.total_turnover
+                candidate["num_trades"] = vector_result.num_trades
+            else:
+                candidate["engine"] = Engine(
+                    data_handler,
+                    strategy,
+                    portfolio,
+                    SimulatedBroker(executor),
+                    rng=run_rng,
+                    bar_mode=cfg.bar_mode,
+                )
+            candidates.append(candidate)
+
+        engines = [item["engine"] for item in candidates if "engine" in item]
+        if len(engines) == 1:
+            engines[0].run()
+        elif engines:
+            FanOutEngine(engines).run()
+
+        for candidate in candidates:
+            params = candidate["params"]
+            strategy = candidate["strategy"]
+            order_flow = candidate["order_flow"]
+            engine = candidate.get("engine")
+            if engine is not None:
+                portfolio = candidate["portfolio"]
+                run_timing = engine.timing
+                equity_curve = portfolio.equity_curve
+                total_turnover = float(portfolio.total_turnover or 0.0)
+                num_trades = len(portfolio.trades)
+            else:
+                run_timing = candidate["timing"]
+                equity_curve = candidate["equity_curve"]
+                total_turnover = candidate["turnover"]
+                num_trades = candidate["num_trades"]
+            if timings is not None:
+                timings.append((dict(params), run_timing))
 
-        sim_rng = _spawn_rng(rng)
+            filter_diagnostics: Dict[str, Any] | None = None
+            if hasattr(strategy, "get_filter_diagnostics"):
+                try:
+                    filter_diagnostics = strategy.get_filter_diagnostics()
+                except (
+                    Exception
+                ) as exc:  # pragma: no cover - diagnostics should not fail tuning
+                    filter_diagnostics = {
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+            order_flow_payload = _finalize_order_flow(order_flow, filter_diagnostics)
 
-        data_handler.set_date_range(train_start, train_end)
-        combined = dict(base_params)
-        combined.update(params)
-        if strategy_class in (CrossSectionalMomentum, FlagshipMomentumStrategy):
-            strategy = strategy_class(**_strategy_kwargs(combined))
-        else:
-            strategy = strategy_class(symbol=cfg.symbol, **_strategy_kwargs(combined))
-        order_flow = OrderFlowDiagnostics() if cfg.order_flow_diagnostics else None
-        portfolio = _build_portfolio(
-            data_handler,
-            cfg,
-            symbol_meta=symbol_meta,
-            order_flow=order_flow,
-        )
-        if hasattr(strategy, "sector_map") and strategy.sector_map:
-            portfolio.sector_of.update(strategy.sector_map)
-        exec_rng = _spawn_rng(sim_rng)
-        executor = _build_executor(
-            data_handler,
-            cfg.exec,
-            exec_rng,
-            symbol_meta=symbol_meta,
-        )
-        broker = SimulatedBroker(executor)
-
-        engine = Engine(
-            data_handler,
-            strategy,
-            portfolio,
-            broker,
-            rng=_spawn_rng(sim_rng),
-        )
-        engine.run()
-
-        filter_diagnostics: Dict[str, Any] | None = None
-        if hasattr(strategy, "get_filter_diagnostics"):
-            try:
-                filter_diagnostics = strategy.get_filter_diagnostics()
-            except (
-                Exception
-            ) as exc:  # pragma: no cover - diagnostics should not fail tuning
-                filter_diagnostics = {
-                    "error": f"{type(exc).__name__}: {exc}",
-                }
-        order_flow_payload = _finalize_order_flow(order_flow, filter_diagnostics)
+            if not equity_curve:
+                exclusions.append(
+                    {
+                        "model": _format_param_label(params),
+                        "params": dict(params),
+                        "num_trades": num_trades,
+                        "turnover": total_turnover,
+                        "reasons": ["empty_equity_curve"],
+                        "filter_diagnostics": filter_diagnostics,
+                        "order_flow_diagnostics": order_flow_payload,
+                    }
+                )
+                continue
 
-        if not portfolio.equity_curve:
-            exclusions.append(
-                {
-                    "model": _format_param_label(params),
-                    "params": dict(params),
-                    "num_trades": len(getattr(portfolio, "trades", None) or []),
-                    "turnover": float(getattr(portfolio, "total_turnover", 0.0) or 0.0),
-                    "reasons": ["empty_equity_curve"],
-                    "filter_diagnostics": filter_diagnostics,
-                    "order_flow_diagnostics": order_flow_payload,
-                }
+            metrics = compute_metrics(
+                equity_curve,
+                total_turnover,
+                hac_lags=cfg.metrics_hac_lags,
             )
-            continue
 
-        metrics = compute_metrics(
-            portfolio.equity_curve,
-            portfolio.total_turnover,
-            hac_lags=cfg.metrics_hac_lags,
-        )
+            exclusion_reasons = _non_degenerate_reasons(
+                num_trades, total_turnover, non_degenerate
+            )
+            if exclusion_reasons:
+                diagnostic_reason = infer_non_degenerate_reason(order_flow_payload)
+                exclusions.append(
+                    {
+                        "model": _format_param_label(params),
+                        "params": dict(params),
+                        "num_trades": num_trades,
+                        "turnover": total_turnover,
+                        "reasons": exclusion_reasons,
+                        "filter_diagnostics": filter_diagnostics,
+                        "order_flow_diagnostics": order_flow_payload,
+                        "diagnostic_reason": diagnostic_reason,
+                    }
+                )
+                continue
 
-        exclusion_reasons = _non_degenerate_reasons(portfolio, non_degenerate)
-        if exclusion_reasons:
-            diagnostic_reason = infer_non_degenerate_reason(order_flow_payload)
-            exclusions.append(
+            results.append(
                 {
-                    "model": _format_param_label(params),
                     "params": dict(params),
-                    "num_trades": len(getattr(portfolio, "trades", None) or []),
-                    "turnover": float(getattr(portfolio, "total_turnover", 0.0) or 0.0),
-                    "reasons": exclusion_reasons,
-                    "filter_diagnostics": filter_diagnostics,
-                    "order_flow_diagnostics": order_flow_payload,
-                    "diagnostic_reason": diagnostic_reason,
+                    "metrics": metrics,
+                    "returns": metrics.get("equity_df", pd.DataFrame())[
+                        "returns"
+                    ].to_numpy(),
                 }
             )
-            continue
-
-        results.append(
-            {
-                "params": dict(params),
-                "metrics": metrics,
-                "returns": metrics.get("equity_df", pd.DataFrame())[
-                    "returns"
-                ].to_numpy(),
-            }
-        )
 
     if not results:
         return {}, None, None, [], [], exclusions
@@ -1249,6 +1487,63 @@ def _optimise_parameters(
     )
 
 
+def _fold_timing_entry(
+    fold_index: int,
+    train_start: pd.Timestamp,
+    test_start: pd.Timestamp,
+    grid_timings: Sequence[Tuple[Dict[str, Any], EngineTiming]],
+    test_timing: EngineTiming | None,
+) -> Dict[str, Any]:
+    train = EngineTiming.combined(timing for _, timing in grid_timings)
+    wall_ns = train.wall_ns + (test_timing.wall_ns if test_timing else 0)
+    return {
+        "fold": fold_index,
+        "train_start": str(train_start.date()),
+        "test_start": str(test_start.date()),
+        "wall_seconds": round(wall_ns / 1e9, 6),
+        "train": train.to_dict(),
+        "grid": [
+            {
+                "params": params,
+                "wall_seconds": round(timing.wall_ns / 1e9, 6),
+                "events": timing.events,
+            }
+            for params, timing in grid_timings
+        ],
+        "test": None if test_timing is None else test_timing.to_dict(),
+    }
+
+
+def _persist_engine_timing(
+    artifacts_dir: Path,
+    timings: Sequence[EngineTiming],
+    fold_timings: List[Dict[str, Any]],
+    holdout_timing: EngineTiming | None,
+) -> str:
+    total = EngineTiming.combined(timings)
+    summary = total.summary()
+    slowest = slowest_entry(fold_timings)
+    summary["slowest_fold"] = (
+        None
+        if slowest is None
+        else {"fold": slowest["fold"], "wall_seconds": slowest["wall_seconds"]}
+    )
+    summary["holdout_wall_seconds"] = (
+        None if holdout_timing is None else round(holdout_timing.wall_ns / 1e9, 6)
+    )
+    # Timings are wall-clock, so they live here rather than in manifest.json.
+    payload = {
+        "summary": summary,
+        "total": total.to_dict(),
+        "folds": fold_timings,
+        "holdout": None if holdout_timing is None else holdout_timing.to_dict(),
+    }
+    path = artifacts_dir / "engine_timing.json"
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+    return str(path)
+
+
 def _build_portfolio(
     data_handler,
     cfg: BacktestCfg,
@@ -1275,6 +1570,11 @@ def _build_portfolio(
         symbol_meta=symbol_meta,
         borrow_cfg=cfg.borrow,
         order_flow=order_flow,
+        book=cfg.portfolio_book,
+        incremental_marks=cfg.portfolio_incremental_marks,
+        revalue_every=cfg.portfolio_revalue_every,
+        equity_store=cfg.portfolio_equity_store,
+        batch_rebalance=cfg.portfolio_batch_rebalance,
     )
 
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler, bars_from_events
+from microalpha.engine import Engine
+from microalpha.events import BarEvent, LookaheadError, SignalEvent
+from microalpha.execution import Executor
+from microalpha.portfolio import Portfolio
+
+
+def _write_panel(data_dir: Path) -> None:
+    data_dir.mkdir()
+    a_idx = pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-06"])
+    b_idx = pd.to_datetime(["2025-01-02", "2025-01-03", "2025-01-06"])
+    pd.DataFrame(
+        {"close": [100.0, 101.0, 102.0, 103.0], "volume": [1.0] * 4}, index=a_idx
+    ).to_csv(data_dir / "A.csv")
+    pd.DataFrame(
+        {"close": [50.0, 49.0, 48.0], "volume": [1.0] * 3}, index=b_idx
+    ).to_csv(data_dir / "B.csv")
+
+
+class BarRecorder:
+    def __init__(self, trade_on: int | None = None):
+        self.calls: list[tuple[int, tuple[str, ...], list[float]]] = []
+        self.trade_on = trade_on
+
+    def on_market(self, event):  # pragma: no cover - bar mode only
+        raise AssertionError("on_market must not be called in bar mode")
+
+    def on_bar(self, timestamp, symbols, prices, volumes):
+        assert not prices.flags.writeable
+        self.calls.append((timestamp, tuple(symbols), prices.tolist()))
+        if len(self.calls) == self.trade_on:
+            return [SignalEvent(timestamp, sym, "LONG") for sym in symbols]
+        return []
+
+
+@pytest.mark.parametrize("mode", ["ffill", "exact"])
+def test_stream_bars_matches_grouped_events(tmp_path: Path, mode: str) -> None:
+    _write_panel(tmp_path / "data")
+    handler = MultiCsvDataHandler(tmp_path / "data", ["A", "B"], mode=mode)
+
+    bars = list(handler.stream_bars())
+    grouped = list(bars_from_events(handler.stream()))
+
+    assert [bar.timestamp for bar in bars] == [bar.timestamp for bar in grouped]
+    for bar, expected in zip(bars, grouped):
+        assert bar.symbols == expected.symbols
+        np.testing.assert_array_equal(bar.prices, expected.prices)
+        assert [event.symbol for event in bar.market_events()] == list(bar.symbols)
+    assert len(bars) == 4
+
+
+def test_engine_bar_mode_drives_strategy_and_marking_once_per_bar(
+    tmp_path: Path,
+) -> None:
+    _write_panel(tmp_path / "data")
+    handler = MultiCsvDataHandler(tmp_path / "data", ["A", "B"])
+    strategy = BarRecorder(trade_on=2)
+    portfolio = Portfolio(handler, 100_000.0)
+    broker = SimulatedBroker(Executor(handler))
+
+    engine = Engine(
+        handler,
+        strategy,
+        portfolio,
+        broker,
+        rng=np.random.default_rng(3),
+        bar_mode=True,
+    )
+    engine.run()
+
+    timestamps = [call[0] for call in strategy.calls]
+    assert timestamps == sorted(set(timestamps))
+    assert strategy.calls[1][1] == ("A", "B")
+    assert [row["timestamp"] for row in portfolio.equity_curve] == timestamps
+    assert set(portfolio.positions) == {"A", "B"}
+    assert all(pos.qty != 0 for pos in portfolio.positions.values())
+
+
+def test_bar_mode_requires_on_bar_strategy(tmp_path: Path) -> None:
+    _write_panel(tmp_path / "data")
+    handler = MultiCsvDataHandler(tmp_path / "data", ["A", "B"])
+
+    class MarketOnly:
+        def on_market(self, event):
+            return []
+
+    with pytest.raises(ValueError):
+        Engine(handler, MarketOnly(), Portfolio(handler, 1.0), None, bar_mode=True)
+
+
+def test_out_of_order_bars_raise() -> None:
+    def _bar(ts: int) -> BarEvent:
+        prices = np.array([1.0])
+        prices.setflags(write=False)
+        return BarEvent(ts, ("A",), prices, np.zeros(1))
+
+    class BarData:
+        def stream_bars(self):
+            yield _bar(2)
+            yield _bar(1)
+
+    engine = Engine(
+        BarData(), BarRecorder(), Portfolio(BarData(), 1.0), None, bar_mode=True
+    )
+    with pytest.raises(LookaheadError):
+        engine.run()
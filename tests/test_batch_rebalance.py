@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.events import FillEvent, SignalEvent
+from microalpha.execution import Executor
+from microalpha.order_flow import OrderFlowDiagnostics
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+
+SAMPLE = Path("data/sample/prices")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+PRICES = {"AAA": 10.0, "BBB": 20.0, "CCC": 50.0, "DDD": 25.0, "EEE": 40.0}
+
+
+class _StubData:
+    def get_latest_price(self, symbol: str, timestamp: int) -> float | None:
+        return PRICES.get(symbol)
+
+
+def _portfolio(**caps) -> Portfolio:
+    portfolio = Portfolio(_StubData(), initial_cash=100_000.0, **caps)
+    portfolio.on_fill(FillEvent(1, "AAA", 1_000, 10.0, 0.0, 0.0))
+    portfolio.refresh_equity_after_fills(1)
+    return portfolio
+
+
+def _targets(weights: dict) -> list:
+    return [
+        SignalEvent(1, sym, "LONG" if w >= 0 else "SHORT", {"target_weight": w})
+        for sym, w in weights.items()
+    ]
+
+
+def _book(portfolio: Portfolio, orders) -> dict:
+    book = {sym: pos.qty for sym, pos in portfolio.positions.items()}
+    for order in orders:
+        sign = 1 if order.side == "BUY" else -1
+        book[order.symbol] = book.get(order.symbol, 0) + sign * order.qty
+    return book
+
+
+WEIGHTS = {"AAA": 0.4, "BBB": 0.5, "CCC": -0.3, "DDD": 0.2, "EEE": 0.3, "FFF": 0.1}
+
+
+def test_batch_orders_do_not_depend_on_signal_order() -> None:
+    caps = dict(
+        max_exposure=0.6,
+        max_gross_leverage=1.2,
+        max_single_name_weight=0.35,
+        sectors={"BBB": "TECH", "DDD": "TECH", "EEE": "TECH"},
+        max_positions_per_sector=2,
+    )
+    signals = _targets(WEIGHTS)
+    expected = sorted(
+        (o.symbol, o.side, o.qty) for o in _portfolio(**caps).on_rebalance(signals)
+    )
+    rng = random.Random(3)
+    for _ in range(5):
+        rng.shuffle(signals)
+        orders = _portfolio(**caps).on_rebalance(signals)
+        assert [o.symbol for o in orders] == [
+            s.symbol for s in signals if s.symbol in {o.symbol for o in orders}
+        ]
+        assert sorted((o.symbol, o.side, o.qty) for o in orders) == expected
+
+
+def test_caps_apply_jointly_and_pro_rata() -> None:
+    flow = OrderFlowDiagnostics()
+    portfolio = _portfolio(
+        max_gross_leverage=1.0,
+        max_single_name_weight=0.35,
+        sectors={"BBB": "TECH", "DDD": "TECH", "EEE": "TECH"},
+        max_positions_per_sector=2,
+        order_flow=flow,
+    )
+    equity = portfolio.last_equity
+    book = _book(portfolio, portfolio.on_rebalance(_targets(WEIGHTS)))
+    value = {sym: qty * PRICES[sym] for sym, qty in book.items()}
+
+    # DDD is the smallest new TECH name, so it loses the sector's last slot.
+    assert value.get("DDD", 0.0) == 0.0
+    assert sum(abs(v) for v in value.values()) <= equity
+    assert max(abs(v) for v in value.values()) <= 0.35 * equity
+    # Every target was scaled by the same gross factor (up to share rounding).
+    ratios = [value["CCC"] / -0.3, value["EEE"] / 0.3]
+    assert ratios[0] == pytest.approx(ratios[1], rel=1e-3)
+
+    summary = flow.summary()
+    assert summary["orders_created"] == 4
+    assert summary["orders_dropped_reason_counts"] == {
+        "missing_price": 1,
+        "max_positions_per_sector": 1,
+    }
+    # Clips are attributed to the first cap that bound each name.
+    assert summary["orders_clipped_reason_counts"] == {
+        "max_single_name_weight": 2,
+        "max_gross_leverage": 2,
+    }
+
+
+def test_turnover_cap_and_other_signals() -> None:
+    portfolio = _portfolio(turnover_cap=10_000.0 + 9_000.0)
+    exit_signal = SignalEvent(1, "AAA", "EXIT")
+    orders = portfolio.on_rebalance(
+        [SignalEvent(1, "BBB", "LONG", {"qty": 5})]
+        + _targets({"CCC": 0.1, "DDD": 0.2})
+        + [exit_signal]
+    )
+    assert [o.symbol for o in orders] == ["BBB", "CCC", "DDD", "AAA"]
+    traded = sum(o.qty * PRICES[o.symbol] for o in orders[1:3])
+    assert 8_900.0 < traded <= 9_000.0
+    assert orders[3].qty == 1_000
+
+
+class _SameBarBroker:
+    """Fills whole orders at the signal bar's price, without costs."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def execute(self, order, market_timestamp):
+        price = self.handler.get_latest_price(order.symbol, market_timestamp)
+        qty = order.qty if order.side == "BUY" else -order.qty
+        return FillEvent(market_timestamp, order.symbol, qty, price, 0.0, 0.0)
+
+
+def _run_momentum(batch: bool, same_bar: bool = False, **caps) -> Portfolio:
+    handler = MultiCsvDataHandler(SAMPLE, SYMBOLS)
+    broker = SimulatedBroker(Executor(handler, commission=0.0005))
+    portfolio = Portfolio(
+        handler,
+        initial_cash=1_000_000.0,
+        batch_rebalance=batch,
+        order_flow=OrderFlowDiagnostics(),
+        **caps,
+    )
+    Engine(
+        handler,
+        CrossSectionalMomentum(
+            SYMBOLS, lookback_months=3, skip_months=1, target_gross=1.0
+        ),
+        portfolio,
+        _SameBarBroker(handler) if same_bar else broker,
+        rng=np.random.default_rng(0),
+        bar_mode=True,
+    ).run()
+    return portfolio
+
+
+def test_engine_batch_matches_sequential_without_caps() -> None:
+    expected = _run_momentum(False)
+    batched = _run_momentum(True)
+    assert expected.trades
+    assert batched.trades == expected.trades
+    assert batched.equity_curve == expected.equity_curve
+    assert batched.order_flow.summary() == expected.order_flow.summary()
+
+
+def test_engine_batch_respects_gross_cap() -> None:
+    portfolio = _run_momentum(True, same_bar=True, max_gross_leverage=0.8)
+    summary = portfolio.order_flow.summary()
+    assert summary["orders_created"] == summary["fills"] > 0
+    assert summary["orders_clipped_reason_counts"]["max_gross_leverage"] > 0
+    # Fills land at the signal bar's price, so the post-trade book is capped.
+    rebalanced = {trade["timestamp"] for trade in portfolio.trades}
+    for record in portfolio.equity_curve:
+        if record["timestamp"] in rebalanced:
+            assert record["gross_exposure"] <= 0.8
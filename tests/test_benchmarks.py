@@ -1,3 +1,7 @@
+import importlib.util
+import json
+import sys
+
 import numpy as np
 
 from microalpha.engine import Engine
@@ -43,3 +47,52 @@ def test_engine_benchmark_smoke():
 
     engine = Engine(data, strategy, portfolio, broker, rng=np.random.default_rng(7))
     engine.run()
+
+
+def _load_suite():
+    spec = importlib.util.spec_from_file_location("bench_suite", "benchmarks/suite.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their module through sys.modules.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_suite_compare_flags_regressions():
+    suite = _load_suite()
+    base = {"events": 100, "events_per_sec": 1000.0, "wall_seconds": 1.0}
+    baseline = {
+        "profile": "quick",
+        "scenarios": {"a": {**base, "peak_rss_mb": 100.0}, "b": base, "c": base},
+    }
+    results = {
+        "profile": "quick",
+        "scenarios": {
+            "a": {**base, "events_per_sec": 700.0, "peak_rss_mb": 140.0},
+            "b": {**base, "events": 90, "peak_rss_mb": None},
+            "c": {**base, "events_per_sec": 800.0, "peak_rss_mb": None},
+            "new": {**base, "peak_rss_mb": None},
+        },
+    }
+    failures = suite.compare(results, baseline, threshold=0.25, rss_threshold=0.25)
+    assert len(failures) == 3
+    assert failures[0].startswith("a: events/sec")
+    assert failures[1].startswith("a: peak RSS")
+    assert failures[2].startswith("b: events changed")
+    assert suite.compare({**results, "profile": "full"}, baseline, 0.25, 0.25)
+
+
+def test_suite_gates_against_baseline(tmp_path):
+    suite = _load_suite()
+    baseline = tmp_path / "baseline.json"
+    args = ["--profile", "smoke", "--scenarios", "multi_10_event", "--in-process"]
+    assert suite.main([*args, "--baseline", str(baseline), "--update-baseline"]) == 0
+    recorded = json.loads(baseline.read_text())
+    entry = recorded["scenarios"]["multi_10_event"]
+    assert entry["events"] > 0 and entry["events_per_sec"] > 0
+
+    assert suite.main([*args, "--baseline", str(baseline), "--threshold", "10"]) == 0
+    entry["events_per_sec"] *= 100
+    baseline.write_text(json.dumps(recorded))
+    assert suite.main([*args, "--baseline", str(baseline)]) == 1
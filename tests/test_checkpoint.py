@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from microalpha.checkpoint import (
+    CHECKPOINT_FILENAME,
+    CheckpointError,
+    load_checkpoint,
+    save_checkpoint,
+)
+from microalpha.engine import Engine
+from microalpha.runner import run_from_config
+from microalpha.walkforward import run_walk_forward
+
+ROOT = Path(__file__).resolve().parents[1]
+# Timing artifacts record wall-clock time and differ between any two runs.
+NONDETERMINISTIC = {"engine_timing.json", "manifest.json", "profile.pstats"}
+
+
+class _Preempted(RuntimeError):
+    pass
+
+
+def _preempt_after(monkeypatch, method: str, events: int) -> None:
+    original = getattr(Engine, method)
+    seen = {"n": 0}
+
+    def handler(self, event):
+        if seen["n"] == events:
+            raise _Preempted
+        seen["n"] += 1
+        return original(self, event)
+
+    monkeypatch.setattr(Engine, method, handler)
+
+
+def _artifact_bytes(artifacts_dir: Path) -> dict[str, bytes]:
+    # Fold artifacts embed absolute paths, which differ only by run directory.
+    prefix = str(artifacts_dir).encode()
+    return {
+        path.name: path.read_bytes().replace(prefix, b"<run>")
+        for path in sorted(artifacts_dir.iterdir())
+        if path.is_file() and path.name not in NONDETERMINISTIC
+    }
+
+
+def _flagship_config(tmp_path: Path, **overrides) -> Path:
+    raw = yaml.safe_load((ROOT / "configs/flagship_sample.yaml").read_text())
+    raw["data_path"] = str(ROOT / "data/sample/prices")
+    raw["meta_path"] = str(ROOT / "data/sample/meta_sample.csv")
+    raw["strategy"]["params"]["universe_path"] = str(
+        ROOT / "data/sample/universe_sample.csv"
+    )
+    raw.update(overrides)
+    cfg_path = tmp_path / "flagship.yaml"
+    cfg_path.write_text(yaml.safe_dump(raw))
+    return cfg_path
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_resumed_run_matches_uninterrupted(tmp_path, monkeypatch, bar_mode) -> None:
+    cfg_path = _flagship_config(tmp_path, checkpoint_every=40, bar_mode=bar_mode)
+    baseline = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    baseline_dir = Path(baseline["artifacts_dir"])
+    assert not (baseline_dir / CHECKPOINT_FILENAME).exists()
+
+    method = "_on_bar" if bar_mode else "_on_market"
+    with monkeypatch.context() as patch:
+        _preempt_after(patch, method, 130)
+        with pytest.raises(_Preempted):
+            run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    crashed = [p for p in tmp_path.iterdir() if p.is_dir() and p != baseline_dir]
+    assert len(crashed) == 1
+    state = load_checkpoint(
+        crashed[0] / CHECKPOINT_FILENAME, {"data": object(), "trade_logger": object()}
+    )
+    assert state["stream_position"] == 120
+
+    resumed = run_from_config(str(cfg_path), resume=str(crashed[0]))
+    resumed_dir = Path(resumed["artifacts_dir"])
+    assert resumed_dir == crashed[0]
+    assert not (resumed_dir / CHECKPOINT_FILENAME).exists()
+    baseline_files = _artifact_bytes(baseline_dir)
+    assert "trades.jsonl" in baseline_files and baseline_files["trades.jsonl"]
+    assert _artifact_bytes(resumed_dir) == baseline_files
+
+
+def test_resume_rejects_changed_config(tmp_path) -> None:
+    cfg_path = _flagship_config(tmp_path)
+    result = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    _flagship_config(tmp_path, seed=7)
+    with pytest.raises(ValueError, match="different config"):
+        run_from_config(str(cfg_path), resume=result["artifacts_dir"])
+    with pytest.raises(FileNotFoundError, match="no manifest"):
+        run_from_config(str(cfg_path), resume=str(tmp_path / "missing"))
+
+
+def test_checkpoint_rejects_unknown_version(tmp_path) -> None:
+    path = save_checkpoint(tmp_path / "state.pkl", {"value": 1})
+    assert load_checkpoint(path)["value"] == 1
+    save_checkpoint(path, {"version": 99})
+    with pytest.raises(CheckpointError, match="version"):
+        load_checkpoint(path)
+    with pytest.raises(CheckpointError, match="not found"):
+        load_checkpoint(tmp_path / "missing.pkl")
+
+
+def test_walkforward_resumes_from_fold_boundary(tmp_path, monkeypatch) -> None:
+    raw = yaml.safe_load((ROOT / "configs/wfv_cs_mom_sample.yaml").read_text())
+    raw["template"]["data_path"] = str(ROOT / "data/sample/prices")
+    raw["template"]["meta_path"] = str(ROOT / "data/sample/meta_sample.csv")
+    raw["walkforward"]["end"] = "2020-09-30"
+    raw["reality_check"]["samples"] = 20
+    raw["checkpoint_folds"] = True
+    cfg_path = tmp_path / "wfv.yaml"
+    cfg_path.write_text(yaml.safe_dump(raw))
+
+    baseline = run_walk_forward(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    baseline_dir = Path(baseline["artifacts_dir"])
+    assert len(baseline["folds"]) >= 3
+
+    runs = {"n": 0}
+    original_run = Engine.run
+
+    def preempt_third_fold(self):
+        original_run(self)
+        # Only out-of-sample engines log trades; fail after the third one has
+        # appended its trades so the resume must drop them again.
+        if self.portfolio.trade_logger is not None:
+            runs["n"] += 1
+            if runs["n"] == 3:
+                raise _Preempted
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Engine, "run", preempt_third_fold)
+        with pytest.raises(_Preempted):
+            run_walk_forward(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    crashed = next(p for p in tmp_path.iterdir() if p.is_dir() and p != baseline_dir)
+    assert (crashed / CHECKPOINT_FILENAME).exists()
+
+    resumed = run_walk_forward(str(cfg_path), resume=str(crashed))
+    assert len(resumed["folds"]) == len(baseline["folds"])
+    assert not (crashed / CHECKPOINT_FILENAME).exists()
+    assert _artifact_bytes(crashed) == _artifact_bytes(baseline_dir)
+    timing = json.loads((crashed / "engine_timing.json").read_text())
+    assert len(timing["folds"]) == len(baseline["folds"])
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_incremental_extend_matches_full_rerun(tmp_path, bar_mode) -> None:
+    cfg_path = _flagship_config(tmp_path, incremental=True, bar_mode=bar_mode)
+    full = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    full_dir = Path(full["artifacts_dir"])
+
+    # The June rebalance signals on 2021-06-01 but its TWAP slices run past
+    # 2021-06-02, so the saved state must predate them.
+    _flagship_config(
+        tmp_path, incremental=True, bar_mode=bar_mode, end_date="2021-06-02"
+    )
+    first = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    run_dir = Path(first["artifacts_dir"])
+    assert (run_dir / "engine_state.pkl").exists()
+
+    _flagship_config(tmp_path, incremental=True, bar_mode=bar_mode)
+    extended = run_from_config(str(cfg_path), extend=str(run_dir))
+    assert Path(extended["artifacts_dir"]) == run_dir
+    timing = json.loads((run_dir / "engine_timing.json").read_text())
+    full_timing = json.loads((full_dir / "engine_timing.json").read_text())
+    assert 0 < timing["events"] < full_timing["events"] / 2
+
+    files = _artifact_bytes(run_dir)
+    assert files.pop("engine_state.pkl")
+    full_files = _artifact_bytes(full_dir)
+    full_files.pop("engine_state.pkl")
+    assert files == full_files
+
+
+def test_extend_requires_incremental_state(tmp_path) -> None:
+    cfg_path = _flagship_config(tmp_path)
+    result = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="incremental"):
+        run_from_config(str(cfg_path), extend=result["artifacts_dir"])
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from microalpha import cli
+from microalpha.config import parse_config
+from microalpha.data import CsvDataHandler, MultiCsvDataHandler
+
+
+def _write_panel(data_dir: Path, symbols: list[str]) -> None:
+    data_dir.mkdir()
+    rng = np.random.default_rng(9)
+    idx = pd.date_range("2024-01-01", periods=80, freq="D", name="timestamp")
+    for sym in symbols:
+        closes = 100.0 + rng.normal(0, 0.37, size=len(idx)).cumsum()
+        volume = rng.integers(1_000, 90_000, size=len(idx))
+        pd.DataFrame({"close": closes, "volume": volume}, index=idx).to_csv(
+            data_dir / f"{sym}.csv"
+        )
+
+
+def test_parallel_loading_matches_serial(tmp_path: Path) -> None:
+    symbols = [f"S{i:02d}" for i in range(16)]
+    _write_panel(tmp_path / "data", symbols)
+
+    serial = MultiCsvDataHandler(tmp_path / "data", symbols)
+    parallel = MultiCsvDataHandler(tmp_path / "data", symbols, load_workers=4)
+    cached = MultiCsvDataHandler(
+        tmp_path / "data", symbols, load_workers=4, cache_dir=str(tmp_path / "c")
+    )
+
+    assert list(parallel.full_frames) == symbols
+    for sym in symbols:
+        pd.testing.assert_frame_equal(
+            parallel.full_frames[sym], serial.full_frames[sym]
+        )
+        pd.testing.assert_frame_equal(cached.full_frames[sym], serial.full_frames[sym])
+    assert cached.cache is not None and cached.cache.misses == len(symbols)
+    assert list(parallel.stream()) == list(serial.stream())
+
+    with pytest.raises(ValueError):
+        MultiCsvDataHandler(tmp_path / "data", symbols, load_workers=0)
+    with pytest.raises(FileNotFoundError):
+        MultiCsvDataHandler(tmp_path / "data", symbols + ["MISSING"], load_workers=4)
+
+
+def test_pyarrow_engine_matches_round_trip_parse(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    _write_panel(tmp_path / "data", ["AAA"])
+    path = tmp_path / "data" / "AAA.csv"
+
+    handler = CsvDataHandler(tmp_path / "data", "AAA", csv_engine="pyarrow")
+    expected = pd.read_csv(
+        path, index_col=0, parse_dates=True, float_precision="round_trip"
+    )
+
+    assert handler.full_data is not None
+    pd.testing.assert_index_equal(handler.full_data.index, expected.index)
+    np.testing.assert_array_equal(
+        handler.full_data["close"].to_numpy(), expected["close"].to_numpy()
+    )
+    assert handler.full_data["volume"].dtype == expected["volume"].dtype
+
+    with pytest.raises(ValueError):
+        CsvDataHandler(tmp_path / "data", "AAA", csv_engine="fastest")
+
+
+def test_data_workers_from_config_and_cli(monkeypatch, capsys) -> None:
+    base = {"data_path": "data", "symbol": "SPY", "strategy": {"name": "x"}}
+    assert parse_config({**base, "data_load_workers": 8}).data_load_workers == 8
+    with pytest.raises(ValueError):
+        parse_config({**base, "data_load_workers": 0})
+
+    calls = {}
+
+    def fake_run(cfg, **kwargs):
+        calls.update(kwargs)
+        return {"config": cfg}
+
+    monkeypatch.setattr(cli, "run_from_config", fake_run)
+    monkeypatch.setattr(
+        sys, "argv", ["microalpha", "run", "-c", "cfg.yml", "--data-workers", "6"]
+    )
+    cli.main()
+    assert json.loads(capsys.readouterr().out)["config"] == "cfg.yml"
+    assert calls == {"data_load_workers": 6}
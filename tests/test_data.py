@@ -37,3 +37,7 @@ def test_csv_data_handler_streams_events(tmp_path: Path):
 
     assert events_list[1].price == 101.5
     assert events_list[1].volume == 20
+
+    after = list(handler.stream_after(pd.Timestamp("2025-09-23").value))
+    assert after == events_list[1:]
+    assert handler.last_timestamps(1) == [pd.Timestamp("2025-09-24").value]
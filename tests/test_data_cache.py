@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from microalpha.data import CsvDataHandler, MultiCsvDataHandler
+from microalpha.data_cache import CACHE_ENV_VAR, PanelCache
+
+
+def _write_csv(path: Path, closes: list[float]) -> None:
+    idx = pd.date_range("2025-01-01", periods=len(closes), freq="D", name="date")
+    df = pd.DataFrame(
+        {"close": closes, "volume": [1_000 + i for i in range(len(closes))]},
+        index=idx,
+    )
+    df.to_csv(path)
+
+
+def test_cache_round_trip_matches_read_csv(tmp_path: Path) -> None:
+    csv_path = tmp_path / "AAA.csv"
+    _write_csv(csv_path, [100.0, 101.5, 99.25])
+    cache = PanelCache(tmp_path / "cache")
+
+    cold = cache.read_csv(csv_path)
+    warm = cache.read_csv(csv_path)
+    expected = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    pd.testing.assert_frame_equal(cold, expected)
+    pd.testing.assert_frame_equal(warm, expected)
+    assert (cache.entry_dir(csv_path) / "meta.json").exists()
+
+    # Warm frames are views over the memory-mapped files, not copies.
+    for values in (warm.index.to_numpy(), warm["close"].to_numpy()):
+        base = values
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+
+
+def test_cache_rebuilds_when_csv_changes(tmp_path: Path) -> None:
+    csv_path = tmp_path / "AAA.csv"
+    _write_csv(csv_path, [100.0, 101.0])
+    cache = PanelCache(tmp_path / "cache")
+    cache.read_csv(csv_path)
+
+    _write_csv(csv_path, [100.0, 101.0, 250.0])
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    refreshed = cache.read_csv(csv_path)
+
+    assert cache.misses == 2
+    assert refreshed["close"].tolist() == [100.0, 101.0, 250.0]
+
+    # Touching the file without changing content keeps the entry valid.
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cache.read_csv(csv_path)
+    assert (cache.misses, cache.hits) == (2, 1)
+
+
+def test_handlers_load_transparently_from_env_cache(
+    tmp_path: Path, monkeypatch
+) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_csv(data_dir / "AAA.csv", [100.0, 101.0, 102.0])
+    _write_csv(data_dir / "BBB.csv", [50.0, 49.0, 48.0])
+    cache_root = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_ENV_VAR, str(cache_root))
+
+    uncached = MultiCsvDataHandler(data_dir, ["AAA", "BBB"], cache_dir="")
+    first = MultiCsvDataHandler(data_dir, ["AAA", "BBB"])
+    second = MultiCsvDataHandler(data_dir, ["AAA", "BBB"])
+
+    assert uncached.cache is None
+    assert first.cache is not None and first.cache.misses == 2
+    assert second.cache is not None and second.cache.hits == 2
+    assert list(second.stream()) == list(uncached.stream())
+
+    single = CsvDataHandler(data_dir, "AAA")
+    assert single.cache is not None and single.cache.hits == 1
+    assert [e.price for e in single.stream()] == [100.0, 101.0, 102.0]
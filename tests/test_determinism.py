@@ -54,3 +54,10 @@ def test_repeated_runs_are_deterministic(tmp_path):
     trades_one = _read_bytes(art_one / "trades.jsonl")
     trades_two = _read_bytes(art_two / "trades.jsonl")
     assert trades_one == trades_two
+
+    # Only the run id (and the artifact paths derived from it) may differ.
+    manifest_one = _read_bytes(art_one / "manifest.json")
+    manifest_two = _read_bytes(art_two / "manifest.json")
+    assert manifest_one.replace(result_one["run_id"].encode(), b"<run>") == (
+        manifest_two.replace(result_two["run_id"].encode(), b"<run>")
+    )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from microalpha.engine import Engine
+from microalpha.events import FillEvent, MarketEvent, OrderEvent, SignalEvent
+from microalpha.order_flow import OrderFlowDiagnostics
+from microalpha.runner import run_from_config
+from microalpha.timing import PHASES, EngineTiming
+from microalpha.walkforward import run_walk_forward
+
+from .test_manifest_written import _make_run_config, _make_wfv_config
+
+
+class ListData:
+    def __init__(self, events):
+        self.events = events
+
+    def stream(self):
+        return iter(self.events)
+
+
+class EveryOther:
+    def on_market(self, event):
+        if event.timestamp % 2:
+            return [SignalEvent(event.timestamp, event.symbol, "LONG")]
+        return []
+
+
+class NextTickBroker:
+    def execute(self, order, market_timestamp):
+        return FillEvent(market_timestamp + 1, order.symbol, order.qty, 1.0, 0.0, 0.0)
+
+
+class RecordingPortfolio:
+    def __init__(self):
+        self.order_flow = OrderFlowDiagnostics()
+        self.fills = 0
+
+    def on_market(self, event):
+        return None
+
+    def on_signal(self, signal):
+        return [OrderEvent(signal.timestamp, signal.symbol, 1, "BUY")]
+
+    def on_fill(self, fill):
+        self.fills += 1
+
+    def refresh_equity_after_fills(self, timestamp):
+        return None
+
+
+def test_engine_times_each_phase() -> None:
+    events = [MarketEvent(ts, "A", 1.0, 1.0) for ts in range(1, 11)]
+    portfolio = RecordingPortfolio()
+    engine = Engine(ListData(events), EveryOther(), portfolio, NextTickBroker())
+    engine.run()
+
+    report = engine.timing.to_dict()
+    phases = report["phases"]
+    assert set(phases) == set(PHASES)
+    assert report["events"] == 10 and report["runs"] == 1
+    assert phases["mark"]["calls"] == 10
+    assert phases["strategy"]["calls"] == 10
+    # One on_signal call plus one broker plan per signal.
+    assert phases["planning"]["calls"] == 2 * 5
+    assert portfolio.fills == 5
+    assert phases["equity_refresh"]["calls"] == 5
+    assert phases["order_flow"]["calls"] > 0
+    attributed = sum(stats["seconds"] for stats in phases.values())
+    assert attributed <= report["wall_seconds"] + 1e-6
+
+    merged = EngineTiming.combined([engine.timing, engine.timing])
+    assert merged.to_dict()["phases"]["mark"]["calls"] == 20
+    assert engine.timing.summary()["slowest_phase"] in PHASES
+
+
+def test_run_and_wfv_write_engine_timing(tmp_path: Path) -> None:
+    result = run_from_config(str(_make_run_config(tmp_path)))
+    artifacts = Path(result["artifacts_dir"])
+    timing = json.loads((artifacts / "engine_timing.json").read_text())
+    manifest = json.loads((artifacts / "manifest.json").read_text())
+
+    assert result["engine_timing_path"] == str(artifacts / "engine_timing.json")
+    assert timing["events"] == 6
+    assert timing["summary"]["events"] == 6
+    assert set(timing["summary"]["phase_seconds"]) == set(PHASES)
+    assert manifest["engine_timing_path"] == result["engine_timing_path"]
+    assert "engine_timing_summary" not in manifest
+
+    wfv = run_walk_forward(str(_make_wfv_config(tmp_path)))
+    wfv_artifacts = Path(wfv["artifacts_dir"])
+    wfv_timing = json.loads((wfv_artifacts / "engine_timing.json").read_text())
+    wfv_manifest = json.loads((wfv_artifacts / "manifest.json").read_text())
+
+    assert len(wfv_timing["folds"]) == len(wfv["folds"])
+    first = wfv_timing["folds"][0]
+    assert len(first["grid"]) == 4
+    assert first["train"]["runs"] == 4 and first["test"]["runs"] == 1
+    assert wfv_timing["total"]["runs"] == 5 * len(wfv["folds"])
+    summary = wfv_timing["summary"]
+    assert "engine_timing_summary" not in wfv_manifest
+    assert summary["slowest_fold"]["fold"] in range(len(wfv["folds"]))
+    assert wfv["engine_timing_path"] == str(wfv_artifacts / "engine_timing.json")
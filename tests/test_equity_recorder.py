@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import functools
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import microalpha.runner as runner
+import microalpha.walkforward as walkforward
+from microalpha.broker import SimulatedBroker
+from microalpha.data import CsvDataHandler
+from microalpha.engine import Engine
+from microalpha.equity import EquityRecorder, OnlineEquityStats
+from microalpha.execution import TWAP
+from microalpha.integrity import evaluate_portfolio_integrity
+from microalpha.metrics import compute_metrics
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.meanrev import MeanReversionStrategy
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("config", ["flagship_sample.yaml", "wfv_cs_mom_sample.yaml"])
+def test_columnar_store_matches_records(tmp_path, monkeypatch, config):
+    if config.startswith("wfv"):
+        run = walkforward.run_walk_forward
+    else:
+        run = runner.run_from_config
+    outputs = {}
+    for store in ("records", "columnar"):
+        portfolio = functools.partial(Portfolio, equity_store=store)
+        monkeypatch.setattr(runner, "Portfolio", portfolio)
+        monkeypatch.setattr(walkforward, "Portfolio", portfolio)
+        result = run(
+            str(ROOT / "configs" / config), override_artifacts_dir=str(tmp_path / store)
+        )
+        root = Path(result["artifacts_dir"])
+        outputs[store] = {
+            name: (root / name).read_bytes()
+            for name in ("trades.jsonl", "equity_curve.csv")
+        }
+    assert outputs["columnar"]["trades.jsonl"]
+    assert outputs["columnar"] == outputs["records"]
+
+
+def _run_meanrev(store: str) -> Portfolio:
+    handler = CsvDataHandler(Path("data/sample/prices"), "ALFA")
+    portfolio = Portfolio(
+        handler,
+        initial_cash=100_000.0,
+        vol_target_annualized=0.15,
+        vol_lookback=10,
+        equity_store=store,
+    )
+    Engine(
+        handler,
+        MeanReversionStrategy("ALFA", lookback=5, z_threshold=0.5),
+        portfolio,
+        SimulatedBroker(TWAP(handler, commission=0.01, slices=2)),
+    ).run()
+    return portfolio
+
+
+def test_stores_agree_on_trades_and_metrics() -> None:
+    records = _run_meanrev("records")
+    columnar = _run_meanrev("columnar")
+    online = _run_meanrev("online")
+    assert records.trades
+    assert columnar.trades == records.trades == online.trades
+    assert columnar.equity_curve == records.equity_curve
+    assert len(online.equity_curve) == len(records.equity_curve)
+
+    expected = compute_metrics(records.equity_curve, records.total_turnover)
+    fast = compute_metrics(columnar.equity_curve, columnar.total_turnover)
+    pd.testing.assert_frame_equal(fast.pop("equity_df"), expected.pop("equity_df"))
+    assert fast == expected
+
+    streamed = compute_metrics(online.equity_curve, online.total_turnover)
+    assert streamed.pop("equity_df")["equity"].tolist() == [records.last_equity]
+    assert streamed.keys() <= expected.keys()
+    for key, value in streamed.items():
+        assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-12), key
+    with pytest.raises(ValueError, match="online"):
+        compute_metrics(online.equity_curve, 0.0, hac_lags=2)
+    # Per-row consumers reject the online store instead of seeing no rows.
+    assert evaluate_portfolio_integrity(columnar).ok
+    with pytest.raises(ValueError, match="online equity store"):
+        evaluate_portfolio_integrity(online)
+
+
+def test_recorder_overwrites_last_and_grows() -> None:
+    recorder = EquityRecorder(capacity=2)
+    expected = []
+    for ts in range(1, 6):
+        for step in range(2):
+            recorder.record(ts, 100.0 + ts + step, 0.1 * step, 0.2)
+        expected.append(
+            {
+                "timestamp": ts,
+                "equity": 100.0 + ts + 1,
+                "exposure": 0.1,
+                "gross_exposure": 0.2,
+            }
+        )
+    recorder.record(5, 1.0, 0.0, 0.0, overwrite_last=False)
+    expected.append(
+        {"timestamp": 5, "equity": 1.0, "exposure": 0.0, "gross_exposure": 0.0}
+    )
+    assert recorder == expected and len(recorder) == 6
+    assert recorder[-1] == expected[-1] and recorder[1:3] == expected[1:3]
+    assert recorder.tail_equity(2).tolist() == [106.0, 1.0]
+    # The last point can still be replaced after it was read into the columns.
+    recorder.record(5, 2.0, 0.0, 0.0)
+    expected[-1]["equity"] = 2.0
+    assert recorder[-1] == expected[-1] and len(recorder) == 6
+    with pytest.raises(ValueError):
+        recorder.columns()["equity"][0] = 0.0
+
+    restored = pickle.loads(pickle.dumps(recorder))
+    assert restored == recorder
+    # Duplicated timestamps keep their first point, as with dict records.
+    fast = compute_metrics(recorder, 0.0)["equity_df"]
+    pd.testing.assert_frame_equal(fast, compute_metrics(expected, 0.0)["equity_df"])
+
+
+def test_online_stats_fold_points_lazily() -> None:
+    rng = np.random.default_rng(7)
+    # Long enough to fold several chunks of committed points.
+    equity = 1_000.0 * np.exp(rng.normal(0, 0.01, size=10_000).cumsum())
+    stats = OnlineEquityStats(tail=5)
+    records = []
+    for ts, value in enumerate(equity):
+        stats.record(ts, value * 1.5, 0.3, 0.6)
+        stats.record(ts, value, 0.3, 0.6)
+        records.append(
+            {"timestamp": ts, "equity": value, "exposure": 0.3, "gross_exposure": 0.6}
+        )
+    assert len(stats) == len(records)
+    assert stats.tail_equity(3).tolist() == equity[-3:].tolist()
+
+    expected = compute_metrics(records, 0.0)
+    summary = stats.summary()
+    assert summary.pop("points") == len(records)
+    for key, value in summary.items():
+        assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-12), key
+    with pytest.raises(ValueError, match="equity store"):
+        Portfolio(None, equity_store="parquet")
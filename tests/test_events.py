@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import inspect
+import pickle
+from dataclasses import MISSING, FrozenInstanceError, asdict, fields, replace
+
+import pytest
+
+from microalpha.events import FillEvent, MarketEvent, OrderEvent, SignalEvent
+
+
+def test_events_are_slotted_and_immutable() -> None:
+    event = MarketEvent(1, "A", 100.0, 5.0)
+
+    assert not hasattr(event, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        event.price = 101.0  # type: ignore[misc]
+    # Python < 3.12 reports unknown names on slotted frozen dataclasses as TypeError.
+    with pytest.raises((AttributeError, TypeError)):
+        event.extra = 1  # type: ignore[attr-defined]
+    with pytest.raises(FrozenInstanceError):
+        del event.symbol
+
+
+def test_events_keep_dataclass_semantics() -> None:
+    order = OrderEvent(timestamp=2, symbol="A", qty=10, side="BUY")
+    assert order.order_type == "MARKET" and order.price is None
+    assert order == OrderEvent(2, "A", 10, "BUY")
+    assert hash(order) == hash(OrderEvent(2, "A", 10, "BUY"))
+    assert replace(order, qty=5).qty == 5
+    assert pickle.loads(pickle.dumps(order)) == order
+
+    fill = FillEvent(3, "A", 10, 100.0, 0.1, 0.01)
+    assert asdict(fill)["latency_fill"] == 0.0
+    assert repr(SignalEvent(1, "A", "LONG")) == (
+        "SignalEvent(timestamp=1, symbol='A', side='LONG', meta=None)"
+    )
+    with pytest.raises(TypeError):
+        MarketEvent(1, "A", 100.0)  # type: ignore[call-arg]
+
+    class TaggedOrder(OrderEvent):
+        def __init__(self, timestamp: int) -> None:
+            super().__init__(timestamp=timestamp, symbol="SPY", qty=1, side="BUY")
+
+    tagged = TaggedOrder(4)
+    assert tagged.symbol == "SPY" and tagged.qty == 1
+
+
+@pytest.mark.parametrize("cls", [MarketEvent, SignalEvent, OrderEvent, FillEvent])
+def test_hand_written_init_matches_fields(cls) -> None:
+    params = list(inspect.signature(cls).parameters.values())
+    assert [(p.name, p.default) for p in params] == [
+        (f.name, inspect.Parameter.empty if f.default is MISSING else f.default)
+        for f in fields(cls)
+    ]
+    args = range(len(params))
+    event = cls(*args)
+    assert [getattr(event, f.name) for f in fields(cls)] == list(args)
+    assert cls(**asdict(event)) == event
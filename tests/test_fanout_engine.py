@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine, FanOutEngine
+from microalpha.execution import TWAP, Executor
+from microalpha.market_metadata import load_symbol_meta
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.walkforward import run_walk_forward
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE = Path("data/sample")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+GRID = [
+    {"lookback_months": 3, "top_frac": 0.34},
+    {"lookback_months": 6, "top_frac": 0.34},
+    {"lookback_months": 3, "top_frac": 0.5},
+]
+
+
+def _engines(handler, bar_mode: bool) -> list[Engine]:
+    meta = load_symbol_meta(str(SAMPLE / "meta_sample.csv"))
+    engines = []
+    for seed, params in enumerate(GRID):
+        strategy = CrossSectionalMomentum(SYMBOLS, skip_months=1, **params)
+        portfolio = Portfolio(handler, initial_cash=1_000_000.0, symbol_meta=meta)
+        # Alternate executors so the engines hold different pending queues and
+        # draw from their own queue-fill RNGs.
+        if seed % 2:
+            executor: Executor = TWAP(handler, commission=0.005, slices=3)
+        else:
+            executor = Executor(
+                handler,
+                commission=0.005,
+                symbol_meta=meta,
+                limit_mode="IOC",
+                queue_seed=seed,
+            )
+        engines.append(
+            Engine(
+                handler,
+                strategy,
+                portfolio,
+                SimulatedBroker(executor),
+                rng=np.random.default_rng(seed),
+                bar_mode=bar_mode,
+            )
+        )
+    return engines
+
+
+def _results(engine: Engine):
+    portfolio = engine.portfolio
+    return (
+        portfolio.equity_curve,
+        [(t["timestamp"], t["symbol"], t["qty"], t["price"]) for t in portfolio.trades],
+        engine.rng.bit_generator.state,
+        engine.clock,
+    )
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_fanout_matches_separate_runs(bar_mode) -> None:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    separate = _engines(handler, bar_mode)
+    for engine in separate:
+        engine.run()
+
+    fanned = _engines(handler, bar_mode)
+    FanOutEngine(fanned).run()
+
+    for solo, shared in zip(separate, fanned):
+        assert solo.portfolio.trades
+        assert _results(shared) == _results(solo)
+        assert shared.timing.events == solo.timing.events
+        assert shared.timing.runs == 1
+        assert shared.timing.wall_ns > 0
+    assert _results(fanned[0]) != _results(fanned[1])
+
+
+def test_fanout_rejects_mismatched_engines() -> None:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    with pytest.raises(ValueError, match="at least one"):
+        FanOutEngine([])
+    other = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    engines = _engines(handler, False)
+    with pytest.raises(ValueError, match="data handler"):
+        FanOutEngine([engines[0], _engines(other, False)[0]])
+    with pytest.raises(ValueError, match="bar_mode"):
+        FanOutEngine([engines[0], _engines(handler, True)[0]])
+    engines[1].run()
+    with pytest.raises(ValueError, match="fresh"):
+        FanOutEngine(engines)
+
+
+def test_walkforward_grid_chunks_match_single_runs(tmp_path) -> None:
+    raw = yaml.safe_load((ROOT / "configs/wfv_cs_mom_sample.yaml").read_text())
+    raw["template"]["data_path"] = str(ROOT / "data/sample/prices")
+    raw["template"]["meta_path"] = str(ROOT / "data/sample/meta_sample.csv")
+    raw["walkforward"]["end"] = "2020-09-30"
+    raw["reality_check"]["samples"] = 20
+    raw["grid"]["skip_months"] = [1]
+    raw["insample_engine"] = "event"
+
+    outputs = []
+    # Four candidates: one fanned-out chunk of three, then a single run.
+    for fanout in (1, 3):
+        raw["insample_fanout"] = fanout
+        cfg_path = tmp_path / f"wfv_{fanout}.yaml"
+        cfg_path.write_text(yaml.safe_dump(raw))
+        result = run_walk_forward(
+            str(cfg_path), override_artifacts_dir=str(tmp_path / str(fanout))
+        )
+        root = Path(result["artifacts_dir"])
+        outputs.append(
+            (
+                [fold["best_params"] for fold in result["folds"]],
+                (root / "trades.jsonl").read_bytes(),
+                (root / "equity_curve.csv").read_bytes(),
+            )
+        )
+    assert outputs[0][1]
+    assert outputs[1] == outputs[0]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+
+import pytest
+
+import microalpha.runner as runner
+import microalpha.walkforward as walkforward
+from microalpha.events import FillEvent, MarketEvent
+from microalpha.portfolio import MarkDriftError, Portfolio, PortfolioPosition
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _outputs(result) -> dict:
+    root = Path(result["artifacts_dir"])
+    return {
+        name: (root / name).read_bytes()
+        for name in ("trades.jsonl", "equity_curve.csv")
+    }
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        "flagship_sample.yaml",
+        "meanrev.yaml",
+        "mm_lob_tplus1.yaml",
+        "wfv_cs_mom_sample.yaml",
+        "wfv_flagship_sample.yaml",
+    ],
+)
+def test_incremental_marks_match_full_revaluation(tmp_path, monkeypatch, config):
+    if config.startswith("wfv"):
+        run = walkforward.run_walk_forward
+    else:
+        run = runner.run_from_config
+    cfg_path = str(ROOT / "configs" / config)
+    outputs = {}
+    for incremental in (False, True):
+        portfolio = functools.partial(Portfolio, incremental_marks=incremental)
+        monkeypatch.setattr(runner, "Portfolio", portfolio)
+        monkeypatch.setattr(walkforward, "Portfolio", portfolio)
+        result = run(cfg_path, override_artifacts_dir=str(tmp_path / str(incremental)))
+        outputs[incremental] = _outputs(result)
+    assert outputs[True]["trades.jsonl"]
+    assert outputs[True] == outputs[False]
+
+
+class _StubData:
+    def __init__(self) -> None:
+        self.lookups = 0
+
+    def get_latest_price(self, symbol: str, timestamp: int) -> float:
+        self.lookups += 1
+        return 10.0 + timestamp
+
+
+@pytest.mark.parametrize("book", ["dict", "array"])
+def test_marks_reused_within_a_timestamp(book) -> None:
+    data = _StubData()
+    assert not Portfolio(data, book=book).incremental_marks
+    portfolio = Portfolio(
+        data, initial_cash=1_000.0, book=book, incremental_marks=True, revalue_every=1
+    )
+    portfolio.on_fill(FillEvent(1, "AAA", 10, 11.0, 0.0, 0.0))
+    portfolio.on_fill(FillEvent(1, "BBB", -5, 11.0, 0.0, 0.0))
+    portfolio.on_market(MarketEvent(1, "AAA", 11.0, 1.0))
+    assert portfolio.market_value == 5 * 11.0
+
+    # Every reuse is cross-checked, so the book is still priced...
+    portfolio.on_market(MarketEvent(1, "BBB", 11.0, 1.0))
+    assert portfolio.reused_marks == 1
+    # ...but without the check a repeated timestamp does no lookups.
+    portfolio.revalue_every = None
+    lookups = data.lookups
+    portfolio.on_market(MarketEvent(1, "CCC", 11.0, 1.0))
+    assert data.lookups == lookups and portfolio.reused_marks == 2
+
+    portfolio.on_fill(FillEvent(1, "AAA", -10, 11.0, 0.0, 0.0))
+    portfolio.refresh_equity_after_fills(1)
+    assert portfolio.market_value == -5 * 11.0
+    portfolio.on_market(MarketEvent(2, "AAA", 12.0, 1.0))
+    assert portfolio.market_value == -5 * 12.0
+    assert data.lookups > lookups
+
+
+def test_revalue_every_detects_out_of_band_edits() -> None:
+    portfolio = Portfolio(
+        _StubData(), initial_cash=1_000.0, incremental_marks=True, revalue_every=1
+    )
+    portfolio.on_fill(FillEvent(1, "AAA", 10, 11.0, 0.0, 0.0))
+    portfolio.on_market(MarketEvent(1, "AAA", 11.0, 1.0))
+    portfolio.positions["BBB"] = PortfolioPosition(qty=3)
+    with pytest.raises(MarkDriftError):
+        portfolio.on_market(MarketEvent(1, "BBB", 11.0, 1.0))
+
+    portfolio.invalidate_marks()
+    portfolio.on_market(MarketEvent(1, "BBB", 11.0, 1.0))
+    assert portfolio.market_value == 13 * 11.0
+    with pytest.raises(ValueError, match="revalue_every"):
+        Portfolio(_StubData(), revalue_every=0)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import gc
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from microalpha.logging import JsonlWriter, write_columnar
+from microalpha.runner import run_from_config
+
+from .test_checkpoint import _flagship_config, _preempt_after, _Preempted
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _lines(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("background", [False, True], ids=["inline", "thread"])
+def test_buffered_writer_batches_and_rewinds(tmp_path, background) -> None:
+    path = tmp_path / "log" / "trades.jsonl"
+    writer = JsonlWriter(str(path), batch_size=4, background=background)
+    for idx in range(10):
+        writer.write({"idx": idx})
+    offset = writer.tell()
+    assert _lines(path) == [{"idx": idx} for idx in range(10)]
+
+    for idx in range(10, 13):
+        writer.write({"idx": idx})
+    writer.truncate(offset)
+    writer.write({"idx": 99})
+    writer.close()
+    writer.close()
+    assert [rec["idx"] for rec in _lines(path)] == list(range(10)) + [99]
+    with pytest.raises(ValueError, match="batch_size"):
+        JsonlWriter(str(path), batch_size=0)
+
+
+def test_unclosed_writer_still_flushes(tmp_path) -> None:
+    path = tmp_path / "trades.jsonl"
+    writer = JsonlWriter(str(path), batch_size=100, background=True)
+    writer.write({"idx": 1})
+    del writer
+    gc.collect()
+    assert _lines(path) == [{"idx": 1}]
+
+    # Interpreter exit flushes writers that were never closed.
+    script = (
+        "import sys\n"
+        "from microalpha.logging import JsonlWriter\n"
+        "writer = JsonlWriter(sys.argv[1], batch_size=1000, background=True)\n"
+        "for idx in range(250):\n"
+        "    writer.write({'idx': idx})\n"
+    )
+    subprocess.run([sys.executable, "-c", script, str(path)], check=True)
+    assert [rec["idx"] for rec in _lines(path)] == list(range(250))
+
+
+def test_background_errors_surface(tmp_path) -> None:
+    writer = JsonlWriter(str(tmp_path / "bad.jsonl"), background=True)
+    writer.write({"value": object()})
+    with pytest.raises(RuntimeError, match="trade log write failed"):
+        writer.flush()
+    writer.close()
+
+
+@pytest.mark.parametrize("fmt", ["auto", "arrow", "csv"])
+def test_write_columnar_round_trips(tmp_path, fmt) -> None:
+    path = tmp_path / "trades.jsonl"
+    records = [
+        {"timestamp": 1, "order_id": None, "symbol": "AAA", "qty": 5.0},
+        {"timestamp": 2, "order_id": "x1", "symbol": "BBB", "qty": -2.5},
+    ]
+    with JsonlWriter(str(path)) as writer:
+        for record in records:
+            writer.write(record)
+    target = Path(write_columnar(path, fmt))
+    suffix = {"auto": ".parquet", "arrow": ".arrow", "csv": ".csv"}[fmt]
+    assert target == path.with_suffix(suffix)
+    reader = {".parquet": pd.read_parquet, ".arrow": pd.read_feather}
+    frame = reader.get(suffix, pd.read_csv)(target)
+    assert frame["symbol"].tolist() == ["AAA", "BBB"]
+    assert frame["qty"].tolist() == [5.0, -2.5]
+    with pytest.raises(ValueError, match="columnar format"):
+        write_columnar(path, "orc")
+
+
+@pytest.mark.parametrize("fmt", ["auto", "csv"])
+def test_write_columnar_streams_large_logs(tmp_path, fmt) -> None:
+    path = tmp_path / "trades.jsonl"
+    # order_id only turns up deep into the log, past the first parse block.
+    records = [
+        {"timestamp": idx, "order_id": None if idx < 30_000 else f"o{idx}", "qty": 1.5}
+        for idx in range(40_000)
+    ]
+    with JsonlWriter(str(path), batch_size=1_000) as writer:
+        for record in records:
+            writer.write(record)
+        writer.write({"timestamp": 0, "qty": 2.0})
+    expected = pd.DataFrame.from_records(records + [{"timestamp": 0, "qty": 2.0}])
+
+    target = write_columnar(path, fmt, chunk_rows=7_000)
+    frame = (pd.read_parquet if fmt == "auto" else pd.read_csv)(target)
+    pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+
+    with JsonlWriter(str(path), append=True) as writer:
+        writer.write({"timestamp": 1, "qty": 1.0, "venue": "X"})
+    if fmt == "csv":
+        with pytest.raises(ValueError, match="venue"):
+            write_columnar(path, fmt, chunk_rows=7_000)
+
+
+def test_buffered_trade_log_in_runs_and_resume(tmp_path, monkeypatch) -> None:
+    runs = tmp_path / "runs"
+    expected = run_from_config(
+        str(_flagship_config(tmp_path)), override_artifacts_dir=str(tmp_path)
+    )
+    trade_log = {"batch_size": 16, "background": True, "columnar": "auto"}
+    cfg_path = _flagship_config(tmp_path, trade_log=trade_log, checkpoint_every=40)
+    baseline = run_from_config(str(cfg_path), override_artifacts_dir=str(runs))
+
+    def trades(result) -> bytes:
+        return (Path(result["artifacts_dir"]) / "trades.jsonl").read_bytes()
+
+    assert trades(baseline) == trades(expected)
+    assert expected["trades_columnar_path"] is None
+    columnar = pd.read_parquet(baseline["trades_columnar_path"])
+    assert columnar.to_dict("records") == _lines(Path(baseline["trades_path"]))
+
+    with monkeypatch.context() as patch:
+        _preempt_after(patch, "_on_market", 130)
+        with pytest.raises(_Preempted):
+            run_from_config(str(cfg_path), override_artifacts_dir=str(runs))
+    crashed = next(
+        p for p in runs.iterdir() if p.is_dir() and str(p) != baseline["artifacts_dir"]
+    )
+    resumed = run_from_config(str(cfg_path), resume=str(crashed))
+    assert trades(resumed) == trades(baseline)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.events import MarketEvent
+from microalpha.execution import TWAP
+from microalpha.live import (
+    AsyncEngine,
+    AsyncReplayDataHandler,
+    AsyncSocketDataHandler,
+    decode_event,
+    encode_event,
+)
+from microalpha.portfolio import Portfolio
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.trace import TraceRecorder
+
+SAMPLE = Path("data/sample")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+
+
+def _engine(cls, data, handler, bar_mode: bool, trace=None) -> Engine:
+    strategy = CrossSectionalMomentum(SYMBOLS, lookback_months=3, skip_months=1)
+    portfolio = Portfolio(handler, initial_cash=1_000_000.0)
+    broker = SimulatedBroker(TWAP(handler, commission=0.005, slices=3))
+    return cls(
+        data,
+        strategy,
+        portfolio,
+        broker,
+        rng=np.random.default_rng(0),
+        bar_mode=bar_mode,
+        trace=trace,
+    )
+
+
+def _baseline(bar_mode: bool) -> tuple[Engine, int]:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    trace = TraceRecorder()
+    engine = _engine(Engine, handler, handler, bar_mode, trace)
+    engine.run()
+    orders = int((trace.to_frame()["kind"] == "order").sum())
+    return engine, orders
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_async_replay_matches_engine_and_records_latency(bar_mode) -> None:
+    expected, orders = _baseline(bar_mode)
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    engine = _engine(AsyncEngine, AsyncReplayDataHandler(handler), handler, bar_mode)
+    latency = asyncio.run(engine.run_async())
+
+    assert engine.portfolio.trades == expected.portfolio.trades
+    assert engine.portfolio.equity_curve == expected.portfolio.equity_curve
+    summary = latency.to_dict()
+    events = expected.timing.events
+    assert summary["events"]["count"] == events == engine.timing.events
+    assert summary["decisions"]["count"] == orders > 0
+    assert 0 < summary["decisions"]["p50_us"] <= summary["decisions"]["max_us"]
+
+
+def test_replay_paces_by_bar_timestamps() -> None:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    bars = list(handler.stream_bars())[:11]
+    span = (bars[-1].timestamp - bars[0].timestamp) / 1e9
+    feed = AsyncReplayDataHandler(handler, speed=span / 0.25)
+
+    async def consume() -> list[int]:
+        arrivals = []
+        async for _, arrival in feed.events(bar_mode=True):
+            arrivals.append(arrival)
+            if len(arrivals) == len(bars):
+                break
+        return arrivals
+
+    arrivals = asyncio.run(consume())
+    assert (arrivals[-1] - arrivals[0]) / 1e9 == pytest.approx(0.25, abs=0.05)
+    with pytest.raises(ValueError, match="speed"):
+        AsyncReplayDataHandler(handler, speed=0)
+
+
+def test_event_wire_format_round_trips() -> None:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    bar = next(iter(handler.stream_bars()))
+    decoded = decode_event(encode_event(bar))
+    assert decoded.timestamp == bar.timestamp and decoded.symbols == bar.symbols
+    assert decoded.prices.tolist() == bar.prices.tolist()
+    event = MarketEvent(1, "ALFA", 101.25, 300.0)
+    assert decode_event(encode_event(event)) == event
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_socket_feed_from_standin_process(bar_mode) -> None:
+    expected, orders = _baseline(bar_mode)
+    command = [
+        sys.executable,
+        "-m",
+        "microalpha.cli",
+        "feed",
+        "--data-path",
+        str(SAMPLE / "prices"),
+        "--symbols",
+        *SYMBOLS,
+    ]
+    if bar_mode:
+        command.append("--bar-mode")
+    feed = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        address = json.loads(feed.stdout.readline())
+        handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+        data = AsyncSocketDataHandler(address["host"], address["port"], handler)
+        engine = _engine(AsyncEngine, data, handler, bar_mode)
+        started = time.perf_counter()
+        latency = asyncio.run(engine.run_async())
+        assert time.perf_counter() - started < 60
+        assert feed.wait(timeout=30) == 0
+    finally:
+        feed.kill()
+        feed.stdout.close()
+
+    assert engine.portfolio.trades == expected.portfolio.trades
+    assert engine.portfolio.equity_curve == expected.portfolio.equity_curve
+    assert latency.to_dict()["decisions"]["count"] == orders
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 import yaml
 
 from microalpha.runner import run_from_config
@@ -12,7 +13,8 @@ def _write_symbol(df: pd.DataFrame, root: Path, symbol: str) -> None:
     (root / f"{symbol}.csv").write_text(df.to_csv(index=True))
 
 
-def test_cs_momentum_smoke(tmp_path: Path) -> None:
+@pytest.mark.parametrize("bar_mode", [False, True])
+def test_cs_momentum_smoke(tmp_path: Path, bar_mode: bool) -> None:
     data_dir = tmp_path / "data"
     data_dir.mkdir()
 
@@ -41,6 +43,7 @@ def test_cs_momentum_smoke(tmp_path: Path) -> None:
             },
         },
         "artifacts_dir": str(tmp_path / "artifacts"),
+        "bar_mode": bar_mode,
     }
     cfg_path = tmp_path / "cfg.yaml"
     cfg_path.write_text(yaml.safe_dump(cfg))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from microalpha.data import MultiCsvDataHandler
@@ -128,3 +129,265 @@ def test_stream_matches_baseline_logic(tmp_path: Path) -> None:
         assert aligned_vol is not None and aligned_vol > 0
         bridge_vol = handler.get_volume_at("AAA", bridge_ts)
         assert bridge_vol is None
+
+
+def test_dense_stream_mode_matches_merge(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+
+    rng = np.random.default_rng(11)
+    idx = pd.date_range("2025-01-01", periods=40, freq="D")
+    symbols = [f"S{i:02d}" for i in range(12)]
+    for sym in symbols:
+        dates = idx[rng.random(len(idx)) > 0.3]
+        closes = (100.0 + rng.normal(size=len(dates)).cumsum()).tolist()
+        _write_csv(data_dir / f"{sym}.csv", list(dates), closes)
+
+    for mode in ("ffill", "exact"):
+        merge = MultiCsvDataHandler(data_dir, symbols, mode=mode)
+        dense = MultiCsvDataHandler(data_dir, symbols, mode=mode, stream_mode="dense")
+        for handler in (merge, dense):
+            handler.set_date_range(idx[5], idx[30])
+        expected = list(merge.stream())
+        assert list(dense.stream()) == expected
+        # second pass reuses the cached panel
+        panel = dense.dense_panel()
+        assert list(dense.stream()) == expected
+        assert dense.dense_panel() is panel
+        dense.set_date_range(idx[0], idx[-1])
+        assert dense.dense_panel() is not panel
+
+
+def test_lazy_loading_materialises_only_overlapping_symbols(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    early = pd.date_range("2010-01-01", periods=30, freq="D")
+    late = pd.date_range("2020-01-01", periods=30, freq="D")
+    _write_csv(data_dir / "OLD.csv", list(early), [10.0 + i for i in range(30)])
+    _write_csv(data_dir / "NEW.csv", list(late), [20.0 + i for i in range(30)])
+    both = early.append(late)
+    _write_csv(data_dir / "ALL.csv", list(both), [30.0 + i for i in range(60)])
+    symbols = ["OLD", "NEW", "ALL"]
+
+    eager = MultiCsvDataHandler(data_dir, symbols)
+    lazy = MultiCsvDataHandler(data_dir, symbols, lazy=True, memory_budget_mb=0)
+    assert not lazy.full_frames
+
+    for start, end, resident in (
+        ("2020-01-05", "2020-01-20", {"NEW", "ALL"}),
+        ("2010-01-05", "2010-01-20", {"OLD", "ALL"}),
+        # Partial-string bounds cover the whole month, as with df.loc.
+        ("2019-12", "2020-01", {"NEW", "ALL"}),
+    ):
+        eager.set_date_range(start, end)
+        lazy.set_date_range(start, end)
+        assert set(lazy.full_frames) == resident
+        assert _collect_events(lazy) == _collect_events(eager)
+
+    unbounded = MultiCsvDataHandler(data_dir, symbols, lazy=True)
+    unbounded.set_date_range("2020-01-05", "2020-01-20")
+    unbounded.set_date_range("2010-01-05", "2010-01-20")
+    assert set(unbounded.full_frames) == set(symbols)
+    # no explicit window: first access loads the full history
+    assert _collect_events(MultiCsvDataHandler(data_dir, symbols, lazy=True)) == (
+        _collect_events(MultiCsvDataHandler(data_dir, symbols))
+    )
+
+
+def test_lazy_construction_reads_only_file_boundaries(
+    tmp_path: Path, monkeypatch
+) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    dates = list(pd.date_range("2020-01-01", periods=400, freq="D"))
+    _write_csv(data_dir / "ASC.csv", dates, [float(i) for i in range(400)])
+    # Newest-first exports need the index column to find their bounds.
+    _write_csv(data_dir / "DESC.csv", dates[::-1], [float(i) for i in range(400)])
+
+    calls: list[dict] = []
+    read_csv = pd.read_csv
+
+    def recording_read_csv(path, *args, **kwargs):
+        calls.append({"path": Path(path).name, **kwargs})
+        return read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", recording_read_csv)
+    lazy = MultiCsvDataHandler(data_dir, ["ASC", "DESC"], lazy=True)
+    assert calls == [{"path": "DESC.csv", "usecols": [0]}]
+    assert lazy._spans["ASC"] == lazy._spans["DESC"]
+    assert not lazy.full_frames
+
+    calls.clear()
+    lazy.set_date_range("2019-01-01", "2019-12-31")
+    assert calls == [] and not lazy.full_frames
+
+
+def test_lazy_loading_handles_unsorted_csvs(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    dates = list(pd.date_range("2020-01-01", periods=10, freq="D"))
+    # First and last rows are the newest; the 2010 row sits in the middle.
+    dates[0], dates[5] = pd.Timestamp("2020-02-01"), pd.Timestamp("2010-01-05")
+    dates.append(pd.Timestamp("2020-02-02"))
+    _write_csv(data_dir / "MIX.csv", dates, [float(i) for i in range(len(dates))])
+    _write_csv(data_dir / "REV.csv", dates[::-1], [1.0] * len(dates))
+    symbols = ["MIX", "REV"]
+
+    # Interior rows are only visible to the panel cache, which records the
+    # exact span of every parsed file.
+    cache = tmp_path / "cache"
+    eager = MultiCsvDataHandler(data_dir, symbols, cache_dir=cache)
+    lazy = MultiCsvDataHandler(
+        data_dir, symbols, lazy=True, memory_budget_mb=0, cache_dir=cache
+    )
+    uncached = MultiCsvDataHandler(data_dir, ["REV"], lazy=True, memory_budget_mb=0)
+    for start, end, resident in (
+        ("2010-01-01", "2010-01-31", {"MIX", "REV"}),
+        ("2021-01-01", "2021-12-31", set()),
+    ):
+        eager.set_date_range(start, end)
+        lazy.set_date_range(start, end)
+        uncached.set_date_range(start, end)
+        assert set(lazy.full_frames) == resident
+        assert set(uncached.full_frames) == resident - {"MIX"}
+        assert _collect_events(lazy) == _collect_events(eager)
+
+
+def test_fold_windows_are_cached_views(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    idx = pd.date_range("2025-01-01", periods=30, freq="D")
+    for offset, sym in enumerate(["AAA", "BBB"]):
+        dates = list(idx[offset::2])
+        _write_csv(
+            data_dir / f"{sym}.csv", dates, [100.0 + i for i in range(len(dates))]
+        )
+
+    handler = MultiCsvDataHandler(data_dir, ["AAA", "BBB"], stream_mode="dense")
+    handler.set_date_range(idx[3], idx[20])
+    train_frames = handler.frames
+    train_events = _collect_events(handler)
+    panel = handler.dense_panel()
+    states = handler._build_states()
+    full_ts = handler._symbol_arrays("AAA")[0]
+    assert np.shares_memory(states["AAA"].timestamps, full_ts)
+    assert not states["AAA"].timestamps.flags.writeable
+
+    handler.set_date_range(idx[21], idx[-1])
+    assert handler.frames is not train_frames
+    handler.set_date_range(idx[3], idx[20])
+    assert handler.frames is train_frames
+    assert handler.dense_panel() is panel
+    assert _collect_events(handler) == train_events
+    assert train_events == _baseline_events(handler)
+
+
+def test_stream_after_matches_filtered_stream(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    rng = np.random.default_rng(17)
+    idx = pd.date_range("2025-01-01", periods=30, freq="D")
+    symbols = [f"S{i:02d}" for i in range(5)]
+    for sym in symbols:
+        dates = idx[rng.random(len(idx)) > 0.35]
+        closes = (50.0 + rng.normal(size=len(dates)).cumsum()).tolist()
+        _write_csv(data_dir / f"{sym}.csv", list(dates), closes)
+
+    for stream_mode in ("merge", "dense"):
+        for mode in ("ffill", "exact"):
+            handler = MultiCsvDataHandler(
+                data_dir, symbols, mode=mode, stream_mode=stream_mode
+            )
+            events = list(handler.stream())
+            bars = list(handler.stream_bars())
+            for cut in (idx[0] - pd.Timedelta(days=1), idx[11], idx[-1]):
+                after = int(cut.value)
+                assert list(handler.stream_after(after)) == [
+                    event for event in events if event.timestamp > after
+                ]
+                assert [
+                    (bar.timestamp, bar.symbols, bar.prices.tolist())
+                    for bar in handler.stream_bars_after(after)
+                ] == [
+                    (bar.timestamp, bar.symbols, bar.prices.tolist())
+                    for bar in bars
+                    if bar.timestamp > after
+                ]
+
+    handler = MultiCsvDataHandler(data_dir, symbols)
+    union = handler.union_timestamps()
+    assert handler.last_timestamps(3) == union[-3:].tolist()
+    own = handler.frames["S01"].index.astype("datetime64[ns]").view("i8")
+    assert handler.last_timestamps(2, symbol="S01") == own[-2:].tolist()
+    assert handler.last_timestamps(2, symbol="ZZZ") == []
+
+
+def test_future_timestamps_use_cached_timelines(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    rng = np.random.default_rng(5)
+    idx = pd.date_range("2025-01-01", periods=60, freq="D")
+    symbols = ["AAA", "BBB", "CCC"]
+    for sym in symbols:
+        dates = idx[rng.random(len(idx)) > 0.4]
+        _write_csv(data_dir / f"{sym}.csv", list(dates), [1.0] * len(dates))
+
+    handler = MultiCsvDataHandler(data_dir, symbols)
+    handler.set_date_range(idx[5], idx[50])
+    union = handler.union_timestamps()
+    assert handler.union_timestamps() is union
+
+    frames = handler.frames
+    expected_union = pd.DatetimeIndex(
+        sorted(set().union(*(set(df.index) for df in frames.values())))
+    )
+    queries = rng.integers(int(idx[0].value), int(idx[-1].value), size=50)
+    for query in queries.tolist():
+        ts = pd.Timestamp(query)
+        assert handler.get_future_timestamps(query, 3) == [
+            int(t.value) for t in expected_union[expected_union > ts][:3]
+        ]
+        for sym in symbols:
+            index = frames[sym].index
+            assert handler.get_future_timestamps(query, 4, symbol=sym) == [
+                int(t.value) for t in index[index > ts][:4]
+            ]
+    assert handler.get_future_timestamps(int(idx[0].value), 2, symbol="ZZZ") == []
+
+    handler.set_date_range(idx[0], idx[20])
+    assert handler.union_timestamps() is not union
+    assert handler.union_timestamps()[-1] <= int(idx[20].value)
+
+
+def test_stream_and_volume_lookup_carry_csv_volume(tmp_path: Path) -> None:
+    data_dir = tmp_path / "panel"
+    data_dir.mkdir()
+    idx = pd.date_range("2025-01-01", periods=6, freq="D")
+    _write_csv(data_dir / "AAA.csv", [idx[0], idx[2], idx[5]], [1.0, 2.0, 3.0])
+    _write_csv(data_dir / "BBB.csv", [idx[1], idx[2]], [4.0, 5.0])
+    pd.DataFrame({"close": [7.0]}, index=pd.DatetimeIndex([idx[3]])).to_csv(
+        data_dir / "CCC.csv"
+    )
+
+    for stream_mode in MultiCsvDataHandler.STREAM_MODES:
+        handler = MultiCsvDataHandler(
+            data_dir, ["AAA", "BBB", "CCC"], stream_mode=stream_mode
+        )
+        events = list(handler.stream())
+        for event in events:
+            frame = handler.frames[event.symbol]
+            ts = pd.Timestamp(event.timestamp)
+            if "volume" in frame.columns and ts in frame.index:
+                assert event.volume == float(frame.loc[ts, "volume"])
+            else:
+                assert event.volume == 0.0  # forward-filled or no volume column
+        assert any(event.volume > 0 for event in events)
+        bar_volumes = [v for bar in handler.stream_bars() for v in bar.volumes]
+        assert bar_volumes == [event.volume for event in events]
+
+    handler = MultiCsvDataHandler(data_dir, ["AAA", "BBB", "CCC"])
+    assert handler.get_volume_at("AAA", int(idx[2].value)) == 1_010_000.0
+    assert handler.get_volume_at("AAA", int(idx[1].value)) is None
+    assert handler.get_volume_at("AAA", int(idx[0].value) - 1) is None
+    assert handler.get_volume_at("CCC", int(idx[3].value)) is None
+    assert handler.get_volume_at("ZZZ", int(idx[3].value)) is None
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from microalpha.engine import Engine
+from microalpha.events import (
+    FillEvent,
+    LookaheadError,
+    MarketEvent,
+    OrderEvent,
+    SignalEvent,
+)
+from microalpha.execution import ExecutionPlan
+
+
+class ListData:
+    def __init__(self, events):
+        self.events = events
+
+    def stream(self):
+        yield from self.events
+
+
+class RandomSignals:
+    def __init__(self, seed: int):
+        self.rng = np.random.default_rng(seed)
+
+    def on_market(self, event):
+        if self.rng.random() < 0.3:
+            return [SignalEvent(event.timestamp, event.symbol, "LONG")]
+        return []
+
+
+class RecordingPortfolio:
+    def __init__(self):
+        self.fills: list[tuple[int, str, int]] = []
+
+    def on_market(self, event):
+        return None
+
+    def on_signal(self, signal):
+        return [OrderEvent(signal.timestamp, signal.symbol, 10, "BUY")]
+
+    def on_fill(self, fill):
+        self.fills.append((fill.timestamp, fill.symbol, fill.qty))
+
+    def refresh_equity_after_fills(self, timestamp):
+        return None
+
+
+class SlicingBroker:
+    """Splits each order into slices on the symbol's next observed timestamps."""
+
+    def __init__(self, future: dict[str, list[int]], slices: int = 3):
+        self.future = future
+        self.slices = slices
+        self.counter = 0
+
+    def plan(self, order, market_timestamp):
+        stamps = [ts for ts in self.future[order.symbol] if ts > market_timestamp]
+        plans = []
+        for ts in stamps[: self.slices]:
+            self.counter += 1
+            plans.append(ExecutionPlan(ts, order, self.counter))
+        return plans
+
+    def materialize(self, plan):
+        return FillEvent(plan.timestamp, plan.order.symbol, plan.qty, 1.0, 0.0, 0.0)
+
+
+class ListQueueEngine(Engine):
+    """Reference implementation: linear scans over a flat pending list."""
+
+    def _schedule(self, plan):
+        self._pending_list = getattr(self, "_pending_list", [])
+        self._pending_list.append(plan)
+
+    def _materialize_due_symbols(self, timestamp, symbols):
+        pending = getattr(self, "_pending_list", [])
+        observed = set(symbols)
+        if any(p.timestamp < timestamp and p.order.symbol in observed for p in pending):
+            raise LookaheadError("scheduled execution timestamp was not observed")
+        due = [
+            p
+            for p in pending
+            if p.timestamp == timestamp and p.order.symbol in observed
+        ]
+        self._pending_list = [p for p in pending if p not in due]
+        for plan in due:
+            self.portfolio.on_fill(self._materialize(plan))
+
+
+def _panel(num_symbols: int, num_steps: int, seed: int):
+    rng = np.random.default_rng(seed)
+    events = []
+    future: dict[str, list[int]] = {}
+    for ts in range(1, num_steps + 1):
+        for idx in range(num_symbols):
+            sym = f"S{idx}"
+            if rng.random() < 0.7:
+                events.append(MarketEvent(ts, sym, 1.0, 1.0))
+                future.setdefault(sym, []).append(ts)
+    return events, future
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_heap_queue_matches_linear_reference(seed: int) -> None:
+    events, future = _panel(num_symbols=12, num_steps=40, seed=seed)
+    results = []
+    for engine_cls in (Engine, ListQueueEngine):
+        portfolio = RecordingPortfolio()
+        engine = engine_cls(
+            ListData(events), RandomSignals(seed), portfolio, SlicingBroker(future)
+        )
+        engine.run()
+        results.append(portfolio.fills)
+    assert results[0] == results[1]
+    assert results[0]
+
+
+def test_unobserved_schedule_still_raises() -> None:
+    events = [
+        MarketEvent(1, "A", 1.0, 1.0),
+        MarketEvent(3, "A", 1.0, 1.0),
+    ]
+    # Plan a slice for t=2, which "A" never prints.
+    broker = SlicingBroker({"A": [2, 3]}, slices=1)
+
+    class Once:
+        fired = False
+
+        def on_market(self, event):
+            if self.fired:
+                return []
+            self.fired = True
+            return [SignalEvent(event.timestamp, event.symbol, "LONG")]
+
+    engine = Engine(ListData(events), Once(), RecordingPortfolio(), broker)
+    with pytest.raises(LookaheadError, match="not observed"):
+        engine.run()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import CsvDataHandler, MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.events import FillEvent, MarketEvent
+from microalpha.execution import TWAP
+from microalpha.portfolio import Portfolio, PortfolioPosition
+from microalpha.runner import run_from_config
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.strategies.meanrev import MeanReversionStrategy
+
+from .test_checkpoint import _flagship_config, _preempt_after, _Preempted
+
+SAMPLE = Path("data/sample")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+
+
+def _run_momentum(book: str, bar_mode: bool) -> Portfolio:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    portfolio = Portfolio(
+        handler,
+        initial_cash=1_000_000.0,
+        borrow_cfg={"annual_fee_bps": 75.0},
+        max_portfolio_heat=5.0,
+        book=book,
+    )
+    Engine(
+        handler,
+        CrossSectionalMomentum(SYMBOLS, lookback_months=3, skip_months=1),
+        portfolio,
+        SimulatedBroker(TWAP(handler, commission=0.005, slices=3)),
+        rng=np.random.default_rng(0),
+        bar_mode=bar_mode,
+    ).run()
+    return portfolio
+
+
+def _book_state(portfolio: Portfolio) -> tuple:
+    return (
+        {sym: pos.qty for sym, pos in portfolio.positions.items()},
+        dict(portfolio.avg_cost),
+        portfolio.valuation_snapshot(),
+        portfolio._estimate_gross_market_value(),
+    )
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_array_book_matches_dict_book(bar_mode) -> None:
+    expected = _run_momentum("dict", bar_mode)
+    portfolio = _run_momentum("array", bar_mode)
+
+    assert expected.borrow_cost_total > 0
+    assert portfolio.trades == expected.trades
+    assert portfolio.equity_curve == expected.equity_curve
+    assert portfolio.borrow_cost_total == expected.borrow_cost_total
+    assert _book_state(portfolio) == _book_state(expected)
+
+
+def test_array_book_without_price_panel(tmp_path) -> None:
+    def run(book: str) -> Portfolio:
+        handler = CsvDataHandler(SAMPLE / "prices", "ALFA")
+        portfolio = Portfolio(handler, initial_cash=100_000.0, book=book)
+        Engine(
+            handler,
+            MeanReversionStrategy("ALFA", lookback=5, z_threshold=0.5),
+            portfolio,
+            SimulatedBroker(TWAP(handler, commission=0.01, slices=2)),
+        ).run()
+        return portfolio
+
+    expected = run("dict")
+    portfolio = run("array")
+    assert expected.trades
+    assert portfolio.trades == expected.trades
+    assert portfolio.equity_curve == expected.equity_curve
+
+
+class _StubData:
+    def get_latest_price(self, symbol: str, timestamp: int) -> float:
+        return 50.0
+
+
+def test_positions_and_avg_cost_are_live_views() -> None:
+    portfolio = Portfolio(_StubData(), initial_cash=10_000.0, book="array")
+    portfolio.on_fill(FillEvent(1, "AAA", 10, 40.0, 1.0, 0.0))
+    portfolio.on_fill(FillEvent(1, "BBB", -5, 60.0, 1.0, 0.0))
+    assert dict(portfolio.avg_cost) == {"AAA": 40.0, "BBB": 60.0}
+    assert {sym: pos.qty for sym, pos in portfolio.positions.items()} == {
+        "AAA": 10,
+        "BBB": -5,
+    }
+
+    portfolio.positions["AAA"].qty += 5
+    portfolio.positions["CCC"] = PortfolioPosition(qty=2)
+    portfolio.on_fill(FillEvent(2, "BBB", 5, 55.0, 1.0, 0.0))
+    assert "BBB" not in portfolio.avg_cost
+    assert portfolio.positions["BBB"].qty == 0
+    assert portfolio.positions.get("DDD") is None
+    assert len(portfolio.positions) == 3
+
+    portfolio.on_market(MarketEvent(2, "AAA", 50.0, 100.0))
+    assert portfolio.market_value == (15 + 2) * 50.0
+    assert portfolio.last_equity == portfolio.cash + 850.0
+
+    restored = pickle.loads(pickle.dumps(portfolio))
+    assert _book_state(restored) == _book_state(portfolio)
+    with pytest.raises(ValueError, match="book mode"):
+        Portfolio(_StubData(), book="sparse")
+
+
+def test_array_book_config_and_resume(tmp_path, monkeypatch) -> None:
+    runs = tmp_path / "runs"
+    expected = run_from_config(
+        str(_flagship_config(tmp_path)), override_artifacts_dir=str(tmp_path)
+    )
+    cfg_path = _flagship_config(tmp_path, portfolio_book="array", checkpoint_every=40)
+    baseline = run_from_config(str(cfg_path), override_artifacts_dir=str(runs))
+
+    def outputs(result) -> dict:
+        root = Path(result["artifacts_dir"])
+        return {
+            name: (root / name).read_bytes()
+            for name in ("trades.jsonl", "equity_curve.csv")
+        }
+
+    assert outputs(baseline) == outputs(expected)
+
+    with monkeypatch.context() as patch:
+        _preempt_after(patch, "_on_market", 130)
+        with pytest.raises(_Preempted):
+            run_from_config(str(cfg_path), override_artifacts_dir=str(runs))
+    crashed = next(
+        p for p in runs.iterdir() if p.is_dir() and str(p) != baseline["artifacts_dir"]
+    )
+    resumed = run_from_config(str(cfg_path), resume=str(crashed))
+    assert outputs(resumed) == outputs(baseline)
+
+
+def _nan_close_handler(tmp_path) -> MultiCsvDataHandler:
+    for symbol, closes in {"AAA": [10.0, "", 12.0], "BBB": [20.0, 21.0, 22.0]}.items():
+        rows = [f"2024-01-0{day},{close}" for day, close in zip((2, 3, 4), closes)]
+        (tmp_path / f"{symbol}.csv").write_text("date,close\n" + "\n".join(rows))
+    return MultiCsvDataHandler(tmp_path, ["AAA", "BBB"])
+
+
+@pytest.mark.parametrize("dense", [False, True], ids=["lookups", "panel"])
+def test_books_agree_on_nan_closes(tmp_path, dense) -> None:
+    def run(book: str) -> tuple:
+        handler = _nan_close_handler(tmp_path)
+        if dense:
+            handler.dense_panel()
+        portfolio = Portfolio(
+            handler, initial_cash=10_000.0, max_portfolio_heat=5.0, book=book
+        )
+        portfolio.on_fill(FillEvent(1, "AAA", 10, 10.0, 0.0, 0.0))
+        portfolio.on_fill(FillEvent(1, "BBB", -5, 20.0, 0.0, 0.0))
+        snapshots = []
+        for event in handler.stream():
+            portfolio.on_market(event)
+            snapshots.append(
+                (
+                    *portfolio.valuation_snapshot(),
+                    portfolio._estimate_gross_market_value(),
+                )
+            )
+        # Marking never builds the dense panel behind the handler's back.
+        assert (handler._active_window().dense is not None) == dense
+        equity = [record["equity"] for record in portfolio.equity_curve]
+        return np.array(equity), np.array(snapshots)
+
+    equity, snapshots = run("dict")
+    assert np.isnan(equity).any() and np.isnan(snapshots).any()
+    array_equity, array_snapshots = run("array")
+    np.testing.assert_array_equal(array_equity, equity)
+    np.testing.assert_array_equal(array_snapshots, snapshots)
@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 
-from microalpha.data import CsvDataHandler
+from microalpha.data import CsvDataHandler, MultiCsvDataHandler
 
 
 def _make_series(tmp_path):
@@ -32,3 +33,82 @@ def test_price_lookup_modes(tmp_path):
     assert ffill_handler.get_latest_price("TEST", after_last) == 102.0
 
     assert ffill_handler.get_latest_price("TEST", before_start) is None
+
+    # Lookups and scheduling share one index, rebuilt when the window moves.
+    index = ffill_handler._current_index()
+    assert ffill_handler._price_index is index
+    ffill_handler.set_date_range(idx[1], idx[-1])
+    assert ffill_handler.get_latest_price("TEST", mid_ts) is None
+    assert ffill_handler._price_index is not index
+    assert ffill_handler.get_latest_price("OTHER", after_last) is None
+
+
+def _reference_lookup(df, ts, mode):
+    if mode == "exact":
+        try:
+            return float(df.loc[ts, "close"])
+        except KeyError:
+            return None
+    idx = df.index.searchsorted(ts, side="right") - 1
+    return None if idx < 0 else float(df.iloc[idx]["close"])
+
+
+def test_multi_price_index_matches_pandas_for_any_query_order(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2025-01-01", periods=30, freq="D")
+    for sym in ("AAA", "BBB"):
+        dates = idx[rng.random(len(idx)) > 0.4]
+        pd.DataFrame({"close": rng.normal(100, 5, len(dates))}, index=dates).to_csv(
+            data_dir / f"{sym}.csv"
+        )
+
+    queries = [int(ts.value) for ts in idx] + [
+        int((ts + pd.Timedelta(hours=6)).value) for ts in idx
+    ]
+    forward = sorted(queries)
+    shuffled = rng.permutation(queries).tolist()
+    for mode in ("ffill", "exact"):
+        handler = MultiCsvDataHandler(data_dir, ["AAA", "BBB"], mode=mode)
+        handler.set_date_range(idx[2], idx[25])
+        for ts_int in forward + shuffled + forward[::-1]:
+            for sym in ("AAA", "BBB"):
+                expected = _reference_lookup(
+                    handler.frames[sym], pd.Timestamp(ts_int), mode
+                )
+                assert handler.get_latest_price(sym, ts_int) == expected
+
+
+def test_price_history_views_and_cached_volatility(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    rng = np.random.default_rng(21)
+    idx = pd.date_range("2025-01-01", periods=40, freq="D")
+    closes = 100.0 + rng.normal(size=len(idx)).cumsum()
+    pd.DataFrame({"close": closes}, index=idx).to_csv(data_dir / "AAA.csv")
+
+    single = CsvDataHandler(csv_dir=data_dir, symbol="AAA", mode="ffill")
+    multi = MultiCsvDataHandler(csv_dir=data_dir, symbols=["AAA"])
+    for handler in (single, multi):
+        for offset in (0, 1, 5, 39):
+            ts = int((idx[offset] + pd.Timedelta(hours=6)).value)
+            frame = handler.full_frames["AAA"] if handler is multi else single.data
+            expected = frame["close"].loc[: pd.Timestamp(ts)].iloc[-10:].to_numpy()
+            view = handler.price_history("AAA", ts, 10)
+            assert not view.flags.writeable
+            np.testing.assert_array_equal(view, expected)
+            assert handler.get_recent_prices("AAA", ts, 10) == expected.tolist()
+
+            vol = handler.recent_volatility("AAA", ts, 10)
+            if expected.size < 2:
+                assert vol is None
+            else:
+                returns = np.diff(expected) / expected[:-1]
+                assert vol == float(np.std(returns, ddof=0))
+                # same window end -> cached estimate
+                assert (
+                    handler.recent_volatility("AAA", int(idx[offset].value), 10) == vol
+                )
+        assert handler.price_history("BBB", int(idx[5].value), 10).size == 0
+        assert handler.price_history("AAA", int(idx[5].value), 0).size == 0
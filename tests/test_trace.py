@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.execution import TWAP
+from microalpha.portfolio import Portfolio
+from microalpha.runner import run_from_config
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.trace import TraceRecorder, read_trace
+
+from .test_checkpoint import _flagship_config, _preempt_after, _Preempted
+
+SAMPLE = Path("data/sample")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+
+
+def _engine(trace: TraceRecorder | None, bar_mode: bool = False) -> Engine:
+    handler = MultiCsvDataHandler(SAMPLE / "prices", SYMBOLS)
+    strategy = CrossSectionalMomentum(SYMBOLS, lookback_months=3, skip_months=1)
+    portfolio = Portfolio(handler, initial_cash=1_000_000.0)
+    broker = SimulatedBroker(TWAP(handler, commission=0.005, slices=3))
+    return Engine(
+        handler,
+        strategy,
+        portfolio,
+        broker,
+        rng=np.random.default_rng(0),
+        bar_mode=bar_mode,
+        trace=trace,
+    )
+
+
+@pytest.mark.parametrize("bar_mode", [False, True], ids=["event", "bar"])
+def test_trace_records_every_event_kind(tmp_path, bar_mode) -> None:
+    trace = TraceRecorder(tmp_path / "trace.bin", capacity=256)
+    engine = _engine(trace, bar_mode)
+    engine.run()
+    trace.close()
+
+    frame = read_trace(tmp_path / "trace.bin")
+    counts = frame["kind"].value_counts()
+    stream = list(engine.data.stream())
+    assert counts["market"] == len(stream)
+    assert counts["fill"] == len(engine.portfolio.trades)
+    assert counts["signal"] > 0 and counts["order"] > 0
+    assert frame["timestamp"].is_monotonic_increasing
+
+    if bar_mode:
+        expected = [
+            (bar.timestamp, symbol, price)
+            for bar in engine.data.stream_bars()
+            for symbol, price in zip(bar.symbols, bar.prices.tolist())
+        ]
+    else:
+        expected = [(event.timestamp, event.symbol, event.price) for event in stream]
+    markets = frame[frame["kind"] == "market"]
+    assert list(zip(markets["timestamp"], markets["symbol"], markets["price"])) == (
+        expected
+    )
+    fills = frame[frame["kind"] == "fill"]
+    assert fills["qty"].tolist() == [t["qty"] for t in engine.portfolio.trades]
+    assert fills["price"].tolist() == [t["price"] for t in engine.portfolio.trades]
+
+
+def test_trace_sampling_and_symbol_filter(tmp_path) -> None:
+    full = TraceRecorder()
+    _engine(full).run()
+    sampled = TraceRecorder(
+        tmp_path / "trace.bin", sample_rate=0.25, symbols=["ALFA", "BETA"]
+    )
+    _engine(sampled).run()
+
+    baseline = full.to_frame()
+    frame = sampled.to_frame()
+    assert set(frame["symbol"].unique()) <= {"ALFA", "BETA"}
+    kept = baseline[baseline["symbol"].isin(["ALFA", "BETA"])]
+    for kind in ("signal", "order", "fill"):
+        assert (frame["kind"] == kind).sum() == (kept["kind"] == kind).sum()
+    markets = (frame["kind"] == "market").sum()
+    all_markets = (baseline["kind"] == "market").sum()
+    assert 0 < markets < 0.35 * (kept["kind"] == "market").sum()
+    assert markets == pytest.approx(0.25 * all_markets / 3, rel=0.2)
+
+
+def test_ring_buffer_keeps_latest_events() -> None:
+    full = TraceRecorder()
+    _engine(full).run()
+    ring = TraceRecorder(capacity=100)
+    _engine(ring).run()
+
+    tail = ring.to_frame()
+    assert len(tail) == 100
+    assert ring.dropped == len(full.to_frame()) - 100
+    expected = full.to_frame().tail(100).reset_index(drop=True)
+    assert tail["timestamp"].tolist() == expected["timestamp"].tolist()
+    assert tail["kind"].tolist() == expected["kind"].tolist()
+
+
+def test_resumed_run_rewinds_trace(tmp_path, monkeypatch) -> None:
+    trace_cfg = {"sample_rate": 0.5, "buffer_events": 64}
+    cfg_path = _flagship_config(tmp_path, checkpoint_every=40, trace=trace_cfg)
+    baseline = run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    expected = read_trace(baseline["trace_path"])
+    assert (expected["kind"] == "fill").any()
+
+    with monkeypatch.context() as patch:
+        _preempt_after(patch, "_on_market", 130)
+        with pytest.raises(_Preempted):
+            run_from_config(str(cfg_path), override_artifacts_dir=str(tmp_path))
+    crashed = next(
+        p
+        for p in tmp_path.iterdir()
+        if p.is_dir() and str(p) != baseline["artifacts_dir"]
+    )
+    resumed = run_from_config(str(cfg_path), resume=str(crashed))
+    frame = read_trace(resumed["trace_path"])
+    assert frame.equals(expected)
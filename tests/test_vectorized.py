@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from microalpha.broker import SimulatedBroker
+from microalpha.data import MultiCsvDataHandler
+from microalpha.engine import Engine
+from microalpha.events import SignalEvent
+from microalpha.execution import TWAP, Executor
+from microalpha.market_metadata import SymbolMeta, load_symbol_meta
+from microalpha.portfolio import Portfolio
+from microalpha.slippage import (
+    LinearImpact,
+    LinearPlusSqrtImpact,
+    SquareRootImpact,
+    VolumeSlippageModel,
+)
+from microalpha.strategies.cs_momentum import CrossSectionalMomentum
+from microalpha.vectorized import (
+    PricePanel,
+    VectorizedEngine,
+    target_weights_from_strategy,
+)
+from microalpha.walkforward import run_walk_forward
+
+SAMPLE = Path("data/sample")
+SYMBOLS = ["ALFA", "BETA", "DELT", "EPSI", "GAMM", "ZETA"]
+BORROW = {"annual_fee_bps": 40.0, "floor_bps": 15.0, "multiplier": 1.5}
+CAPS = {
+    "max_exposure": 0.3,
+    "max_single_name_weight": 0.25,
+    "max_gross_leverage": 1.2,
+    "max_drawdown_stop": 0.12,
+}
+
+
+def _ragged_prices(tmp_path: Path) -> Path:
+    """Sample prices with per-symbol gaps so fills wait for the next print."""
+    out = tmp_path / "prices"
+    out.mkdir()
+    for idx, sym in enumerate(SYMBOLS):
+        frame = pd.read_csv(SAMPLE / "prices" / f"{sym}.csv")
+        if idx % 2:
+            frame = frame[frame.index % (idx + 4) != 0]
+        if sym == "DELT":
+            frame = frame.drop(frame.index[200:215])
+        frame.to_csv(out / f"{sym}.csv", index=False)
+    return out
+
+
+class _ScalarOnlyImpact(LinearImpact):
+    """Impact model without a closed-form array path."""
+
+    def _impact_bps(self, ratio: np.ndarray) -> None:
+        return None
+
+
+def _setup(prices: Path, mode: str, slippage, caps, symbols=SYMBOLS):
+    meta = load_symbol_meta(str(SAMPLE / "meta_sample.csv"))
+    handler = MultiCsvDataHandler(prices, symbols, mode=mode)
+    portfolio = Portfolio(
+        handler, initial_cash=1_000_000.0, symbol_meta=meta, borrow_cfg=BORROW, **caps
+    )
+    executor = Executor(
+        handler,
+        price_impact=0.0002,
+        commission=0.005,
+        slippage_model=slippage() if slippage else None,
+        symbol_meta=meta,
+    )
+    strategy = CrossSectionalMomentum(
+        symbols, lookback_months=3, skip_months=1, top_frac=0.34, target_gross=1.5
+    )
+    return handler, portfolio, executor, strategy
+
+
+@pytest.mark.parametrize("mode", ["ffill", "exact"])
+@pytest.mark.parametrize(
+    "slippage",
+    [None, lambda: VolumeSlippageModel(1e-7), lambda: LinearPlusSqrtImpact()],
+    ids=["price_impact", "volume", "linear_sqrt"],
+)
+@pytest.mark.parametrize("caps", [{}, CAPS], ids=["uncapped", "capped"])
+def test_vectorized_matches_bar_mode_engine(tmp_path: Path, mode, slippage, caps):
+    prices = _ragged_prices(tmp_path)
+    handler, portfolio, executor, strategy = _setup(prices, mode, slippage, caps)
+    Engine(handler, strategy, portfolio, SimulatedBroker(executor), bar_mode=True).run()
+
+    handler, fresh, executor, strategy = _setup(prices, mode, slippage, caps)
+    engine = VectorizedEngine(fresh, executor)
+    result = engine.run_strategy(handler, strategy)
+
+    curve = pd.DataFrame(portfolio.equity_curve)
+    assert result.timestamps.tolist() == curve["timestamp"].tolist()
+    np.testing.assert_allclose(result.equity, curve["equity"], rtol=1e-9)
+    np.testing.assert_allclose(result.exposure, curve["exposure"], atol=1e-9)
+    np.testing.assert_allclose(
+        result.gross_exposure, curve["gross_exposure"], atol=1e-9
+    )
+    final = dict(zip(result.symbols, result.positions[-1].tolist()))
+    assert {sym: pos.qty for sym, pos in portfolio.positions.items()} == {
+        sym: final[sym] for sym in portfolio.positions
+    }
+    assert result.num_trades == len(portfolio.trades) > 0
+    assert result.total_turnover == pytest.approx(portfolio.total_turnover)
+    assert result.commission_total == pytest.approx(portfolio.commission_total)
+    assert result.borrow_cost_total == pytest.approx(portfolio.borrow_cost_total)
+    assert result.borrow_cost_total > 0
+    assert result.slippage_total == pytest.approx(
+        sum(abs(t["slippage"]) * abs(t["qty"]) for t in portfolio.trades)
+    )
+    assert engine.timing.runs == 1 and engine.timing.events == len(curve)
+
+
+@pytest.mark.parametrize("caps", [{}, CAPS], ids=["uncapped", "capped"])
+def test_vectorized_matches_default_engine_on_one_symbol(caps) -> None:
+    # With a single symbol the per-event stream and the bar stream coincide,
+    # so the default engine is a valid reference too.
+    prices = SAMPLE / "prices"
+    setup = (prices, "ffill", LinearPlusSqrtImpact, caps, ["DELT"])
+    handler, portfolio, executor, strategy = _setup(*setup)
+    Engine(handler, strategy, portfolio, SimulatedBroker(executor)).run()
+
+    handler, fresh, executor, strategy = _setup(*setup)
+    result = VectorizedEngine(fresh, executor).run_strategy(handler, strategy)
+
+    curve = pd.DataFrame(portfolio.equity_curve)
+    assert result.timestamps.tolist() == curve["timestamp"].tolist()
+    np.testing.assert_allclose(result.equity, curve["equity"], rtol=1e-9)
+    assert result.num_trades == len(portfolio.trades) > 0
+    assert result.commission_total == pytest.approx(portfolio.commission_total)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        VolumeSlippageModel(0.001),
+        LinearImpact(k_lin=40.0),
+        SquareRootImpact(eta=80.0, spread_floor_multiplier=0.0),
+        LinearPlusSqrtImpact(default_spread_bps=0.0),
+        _ScalarOnlyImpact(k_lin=40.0),
+    ],
+)
+def test_slippage_arrays_match_scalar_calls(model) -> None:
+    model.update_metadata({"A": SymbolMeta(adv=5_000.0, spread_bps=12.0)})
+    qty = np.array([0, 1, -3, 250, -4_000, 12_000])
+    prices = np.array([10.0, 11.5, 99.0, 42.0, 7.25, 300.0])
+    symbols = ["A", "B", None, "A", "b", "A"]
+
+    expected = [
+        model.calculate_slippage(int(q), float(p), symbol=s)
+        for q, p, s in zip(qty, prices, symbols)
+    ]
+    np.testing.assert_allclose(
+        model.calculate_slippage_array(qty, prices, symbols), expected, rtol=1e-12
+    )
+
+
+def test_weight_panel_fills_on_next_print() -> None:
+    index = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"])
+    frame = pd.DataFrame(
+        {"A": [10.0, np.nan, 12.0, 13.0], "B": [20.0, 21.0, 22.0, np.nan]},
+        index=index,
+    )
+    panel = PricePanel.from_frame(frame)
+    weights = np.full(panel.shape, np.nan)
+    weights[0] = [0.5, -0.25]
+    weights[2, 1] = 0.0
+
+    portfolio = Portfolio(None, initial_cash=1_000.0)
+    result = VectorizedEngine(portfolio, Executor(None, commission=1.0)).run(
+        panel, weights
+    )
+
+    # A skips the missing print on day 2; the B exit on day 3 has no later print.
+    assert result.positions[:, 0].tolist() == [0, 0, 50, 50]
+    assert result.positions[:, 1].tolist() == [0, -12, -12, -12]
+    assert result.num_trades == 2 and result.rejected_orders == 1
+    assert result.commission_total == pytest.approx(62.0)
+    assert result.equity[-1] == pytest.approx(1_000.0 + 50 * 1.0 - 12 * 1.0 - 62.0)
+
+
+def test_vectorized_rejects_unsupported_setups() -> None:
+    handler, portfolio, _, _ = _setup(SAMPLE / "prices", "ffill", None, {})
+    with pytest.raises(ValueError, match="TWAP"):
+        VectorizedEngine(portfolio, TWAP(handler))
+
+    class QtySignals:
+        def on_bar(self, timestamp, symbols, prices, volumes):
+            return [SignalEvent(timestamp, symbols[0], "LONG", meta={"qty": 5})]
+
+    panel = PricePanel.from_handler(handler)
+    with pytest.raises(ValueError, match="target_weight"):
+        target_weights_from_strategy(handler, QtySignals(), panel)
+
+
+def test_walkforward_vectorized_insample_selects_like_event_engine(
+    tmp_path: Path,
+) -> None:
+    raw = yaml.safe_load(Path("configs/wfv_cs_mom_sample.yaml").read_text())
+    raw["walkforward"]["end"] = "2020-09-30"
+    raw["grid"] = {"lookback_months": [3, 6], "target_gross": [0.5, 1.0]}
+    raw["reality_check"]["samples"] = 20
+
+    folds = {}
+    for engine in ("vectorized", "event"):
+        raw["insample_engine"] = engine
+        cfg_path = tmp_path / f"wfv_{engine}.yaml"
+        cfg_path.write_text(yaml.safe_dump(raw))
+        result = run_walk_forward(
+            str(cfg_path), override_artifacts_dir=str(tmp_path / engine)
+        )
+        folds[engine] = result["folds"]
+
+    assert folds["vectorized"]
+    for vec, event in zip(folds["vectorized"], folds["event"]):
+        assert vec["best_params"] == event["best_params"]
+        assert vec["train_metrics"]["sharpe_ratio"] == pytest.approx(
+            event["train_metrics"]["sharpe_ratio"], rel=1e-9
+        )
+        assert vec["test_metrics"] == event["test_metrics"]